@@ -0,0 +1,278 @@
+# answer_parser.py - Precompiled per-question answer parsers (word level, with negation)
+
+import re
+
+# ============================================
+# VOCABULARY
+# ============================================
+
+# Words, plus clause punctuation (it ends a negation: "not soft, normal")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|[,.;!?]")
+
+AFFIRMATIVE = {"yes", "yeah", "yep", "yup", "ya", "yea", "sure", "definitely", "correct",
+               "absolutely", "true", "affirmative"}
+NEGATIVE = {"no", "nope", "nah", "never", "none", "nothing", "negative"}
+
+# Words that negate the value right after them ("not soft", "isn't grinding")
+NEGATORS = {"no", "not", "never", "isn't", "isnt", "aren't", "arent", "wasn't", "wasnt",
+            "doesn't", "doesnt", "don't", "dont", "didn't", "didnt", "can't", "cant",
+            "cannot", "won't", "wont", "haven't", "havent", "hasn't", "hasnt", "without"}
+NEGATION_WINDOW = 3             # Tokens a negator reaches forward
+SCOPE_BREAKS = {",", ".", ";", "!", "?", "but", "just", "only", "though"}
+
+# Hedges lower the confidence; "not sure" / "don't know" mean no answer
+# for the rest of their clause ("not sure if it's on" says nothing about "on")
+HEDGES = {"think", "guess", "probably", "possibly", "perhaps", "kinda", "sort", "kind"}
+UNSURE_PHRASES = (("not", "sure"), ("no", "idea"), ("don't", "know"), ("dont", "know"),
+                  ("do", "not", "know"), ("i", "dunno"), ("dunno",), ("unsure",), ("maybe",),
+                  ("not", "certain"), ("can't", "tell"), ("cant", "tell"), ("cannot", "tell"))
+
+# "No" that means all is well, not an answer ("nope it works fine, no problem")
+NO_TROUBLE_PHRASES = (("no", "problem"), ("no", "problems"), ("no", "issue"), ("no", "issues"),
+                      ("no", "worries"))
+
+# A negated value of a two-way choice means the other one ("not cold" -> warm)
+OPPOSITES = {"warm": "cold", "cold": "warm"}
+
+# For "Is the ... light ON?" questions
+LIGHT_AFFIRMATIVE = {"on", "lit", "red", "glowing", "flashing", "blinking"}
+LIGHT_NEGATIVE = {"off"}
+
+def tokenize(text: str) -> list:
+    """Lower-case word and punctuation tokens; curly apostrophes are straightened"""
+    return TOKEN_PATTERN.findall(text.lower().replace("’", "'"))
+
+def stem(word: str) -> str:
+    """Crude verb stem: "works", "working", "worked" -> "work"; "running" -> "run\""""
+    for suffix in ("ing", "ed", "es", "s", "e"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiou":
+        word = word[:-1]
+    return word
+
+def _by_first_token(phrases) -> dict:
+    """{first token: [phrase, ...]}, longest phrase first"""
+    index = {}
+    for phrase in sorted(phrases, key=len, reverse=True):
+        index.setdefault(phrase[0], []).append(phrase)
+    return index
+
+_UNSURE = _by_first_token(UNSURE_PHRASES)
+_NO_TROUBLE = _by_first_token(NO_TROUBLE_PHRASES)
+
+def _match(index: dict, tokens: list, i: int):
+    """Longest phrase of index starting at tokens[i], or None"""
+    for phrase in index.get(tokens[i], ()):
+        if tuple(tokens[i:i + len(phrase)]) == phrase:
+            return phrase
+    return None
+
+# ============================================
+# PARSER (one per question)
+# ============================================
+
+class AnswerParser:
+    """
+    Maps a free-text answer to the symptoms of one question's symptom_map
+
+    The map's "yes"/"no" keys are answered by the whole vocabulary of
+    affirmations and negations ("yep", "not really", "it isn't");
+    every other key is a value phrase matched on whole tokens
+    ("soft", "turned off", "slightly cold"), longest phrase first. A
+    value preceded by a negator is not taken, it counts as a "no" (or as
+    its opposite: "not cold" -> warm). Named values win over a bare
+    yes/no ("Yes, it stopped" -> stopped). A clause that starts with
+    "not sure" / "I do not know" / "maybe" answers nothing.
+
+    Usage:
+        parser = AnswerParser(question["symptom_map"], question["text"])
+        parser.parse("Not really, it's soft and spongy")
+    """
+
+    def __init__(self, symptom_map: dict, question_text: str = ""):
+        self.symptom_map = dict(symptom_map)
+        self.yes_symptom = symptom_map.get("yes")
+        self.no_symptom = symptom_map.get("no")
+
+        # First token -> [(phrase tokens, symptom)], longest phrase first
+        self._phrases = {}
+        for key, symptom in symptom_map.items():
+            if key in ("yes", "no"):
+                continue
+            phrase = tuple(tokenize(key))
+            if phrase:
+                self._phrases.setdefault(phrase[0], []).append((phrase, symptom))
+        for options in self._phrases.values():
+            options.sort(key=lambda option: len(option[0]), reverse=True)
+
+        # Symptom of a value -> symptom of its opposite, when both are offered
+        self._opposites = {symptom: symptom_map[OPPOSITES[key]] for key, symptom in symptom_map.items()
+                           if OPPOSITES.get(key) in symptom_map}
+
+        # "Do the brakes still work?" is answered yes by "it works"
+        question_tokens = tokenize(question_text)
+        self._echo = None
+        if "still" in question_tokens[:-1]:
+            self._echo = stem(question_tokens[question_tokens.index("still") + 1])
+
+        self.affirmative = set(AFFIRMATIVE)
+        self.negative = set(NEGATIVE)
+        if "light" in question_text.lower():
+            self.affirmative |= LIGHT_AFFIRMATIVE
+            self.negative |= LIGHT_NEGATIVE
+
+    def parse(self, answer: str) -> dict:
+        """
+        Symptoms of one answer, in a single pass over its tokens
+
+        Returns:
+            {"symptoms": ["soft_pedal", ...], "polarity": "yes"|"no"|None,
+             "confidence": 0.0-1.0}
+        """
+        tokens = tokenize(answer)
+        values = []                 # symptoms of named values, in order
+        opposites = []              # symptoms implied by negated values ("not cold" -> warm)
+        votes = []                  # ("yes"|"no", cast by a negator), in order
+        negated_until = -1          # last token index reached by a negator
+        hedged = unsure = in_unsure_clause = False
+
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            phrase = _match(_UNSURE, tokens, i)
+            if phrase is not None:
+                unsure = in_unsure_clause = True
+                i += len(phrase)
+                continue
+            if token in SCOPE_BREAKS:
+                negated_until = -1
+                in_unsure_clause = False
+                i += 1
+                continue
+            if in_unsure_clause:        # "not sure if it's leaking" names nothing
+                i += 1
+                continue
+            phrase = _match(_NO_TROUBLE, tokens, i)
+            if phrase is not None:
+                i += len(phrase)
+                continue
+
+            matched = None
+            for phrase, symptom in self._phrases.get(token, ()):
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    matched = phrase, symptom
+                    break
+
+            if matched is not None:
+                phrase, symptom = matched
+                if i <= negated_until:
+                    votes.append(("no", False))
+                    if symptom in self._opposites:
+                        opposites.append(self._opposites[symptom])
+                elif symptom not in values:
+                    values.append(symptom)
+                i += len(phrase)
+                continue
+
+            if token in NEGATORS:
+                negated_until = i + NEGATION_WINDOW
+                votes.append(("no", True))          # "not really", "it isn't"
+            elif token in self.negative:
+                votes.append(("no", False))
+            elif i > negated_until and (token in self.affirmative or
+                                        self._echo is not None and stem(token) == self._echo):
+                votes.append(("yes", False))        # "yep", or "it works" to "does it still work?"
+            elif token in HEDGES:
+                hedged = True
+            i += 1
+
+        if unsure:                  # "I do not know": the "not" is no answer
+            votes = [vote for vote in votes if not vote[1]]
+        votes = [vote for vote, _ in votes]
+
+        polarity = None
+        if votes:
+            yes, no = votes.count("yes"), votes.count("no")
+            polarity = "yes" if yes > no else "no" if no > yes else votes[-1]
+
+        symptoms = list(values) or list(dict.fromkeys(opposites))
+        if not symptoms and polarity is not None:
+            symptom = self.yes_symptom if polarity == "yes" else self.no_symptom
+            if symptom is not None:
+                symptoms.append(symptom)
+
+        if not symptoms:
+            return {"symptoms": [], "polarity": None if unsure else polarity, "confidence": 0.0}
+
+        confidence = 1.0
+        if len(set(votes)) > 1:         # both yes and no signals
+            confidence -= 0.4
+        if hedged or unsure:
+            confidence -= 0.3
+        return {"symptoms": symptoms, "polarity": polarity, "confidence": round(confidence, 2)}
+
+def compile_parsers(question_flows: dict) -> dict:
+    """{question id: AnswerParser} for every question of every category"""
+    parsers = {}
+    for questions in question_flows.values():
+        for question in questions:
+            parsers[question["id"]] = AnswerParser(question.get("symptom_map", {}), question.get("text", ""))
+    return parsers
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    print("="*70)
+    print("🧪 TESTING ANSWER PARSER")
+    print("="*70)
+
+    cases = [
+        ({"yes": "temp_warning_on", "no": "temp_warning_off"}, "Is the temperature warning light ON?",
+         ["Yes", "Nope", "not really", "it isn't", "I don't know", "it's on", "I think it's off"]),
+        ({"yes": "engine_running", "no": "engine_stopped", "stopped": "engine_stopped",
+          "turned off": "engine_stopped"}, "Is the engine still running right now?",
+         ["Yes, the engine stopped", "It turned off", "yeah it's running"]),
+        ({"soft": "soft_pedal", "spongy": "soft_pedal", "normal": "pedal_normal", "hard": "hard_pedal"},
+         "How does the brake pedal feel?", ["Soft and spongy", "it's not soft, feels normal", "know"]),
+        ({"squealing": "squealing_light", "grinding": "grinding_noise", "no": "no_noise"},
+         "Do you hear any noise when braking?", ["not grinding, just squealing", "no grinding", "now and then"]),
+        ({"door": "door_issue", "window": "window_stuck", "mirror": "mirror_broken", "lights": "light_issue"},
+         "Which part has the issue?", ["the door and the window"]),
+        ({"yes": "brake_works", "no": "brake_not_working"}, "Do the brakes still work (car stops)?",
+         ["nope it works fine no problem", "no, it doesn't stop", "it's working"]),
+        ({"warm": "blows_warm", "cold": "blows_cold", "slightly cold": "cooling_weak"},
+         "Is the air coming out warm or cold?", ["not cold", "slightly cold", "maybe cold"]),
+        ({"yes": "coolant_leak_large", "a little": "coolant_leak_small", "no": "no_leak"},
+         "Do you see coolant leaking under the car?",
+         ["I do not know", "not sure if it's leaking", "unsure", "no, I don't think so"]),
+    ]
+    for symptom_map, question, answers in cases:
+        parser = AnswerParser(symptom_map, question)
+        print(f"\n  {question}")
+        for answer in answers:
+            result = parser.parse(answer)
+            print(f"     {answer!r:<32} -> {result['symptoms']} ({result['confidence']:.1f})")
+
+    # Regressions: unsure answers and "no problem" must not read as a "no"
+    regressions = [
+        (cases[5], "nope it works fine no problem", ["brake_works"]),
+        (cases[5], "no, it doesn't stop", ["brake_not_working"]),
+        (cases[6], "not cold", ["blows_warm"]),
+        (cases[6], "maybe cold", []),
+        (cases[7], "I do not know", []),
+        (cases[7], "I dont know", []),
+        (cases[7], "not sure if it's leaking", []),
+        (cases[7], "unsure", []),
+        (cases[7], "maybe", []),
+        (cases[7], "no idea, maybe a little", []),
+        (cases[7], "nope", ["no_leak"]),
+        (cases[2], "it's not soft, feels normal", ["pedal_normal"]),
+        (cases[0], "I don't know", []),
+    ]
+    for (symptom_map, question, _), answer, expected in regressions:
+        assert AnswerParser(symptom_map, question).parse(answer)["symptoms"] == expected, answer
+    print(f"\n  ✅ {len(regressions)} regression answers parsed as expected")
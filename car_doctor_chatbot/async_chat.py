@@ -0,0 +1,334 @@
+# async_chat.py - asyncio chat front-end: Gemini calls awaited with a concurrency limit per upstream
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from gemini_prompts import (natural_prompt, clean_natural_reply, VISION_PROMPT, IMAGE_ERROR_MESSAGE,
+                            parse_vision_reply, warning_summary)
+from phrasing_cache import question_texts
+from session_manager import SessionManager, SessionState, flow_questions
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+TEXT_CONCURRENCY = 8          # Gemini text calls in flight per worker
+VISION_CONCURRENCY = 2        # Vision calls (large uploads) in flight per worker
+LLM_TIMEOUT_S = 20.0          # A slower reply falls back to the rule-based text
+
+# ============================================
+# UPSTREAM (one per Gemini model)
+# ============================================
+
+class LLMUpstream:
+    """
+    One Gemini model with its own concurrency limit
+
+    generate_content_async is used when the client has it; otherwise the
+    blocking generate_content runs on this upstream's own thread pool
+    (concurrency threads), so text and vision calls never queue behind
+    each other. Either way the event loop keeps serving other sessions
+    while the call is in flight.
+
+    A timed-out call fails at once for the caller, but its slot stays
+    taken until the thread really returns: a slow Gemini can never have
+    more than concurrency calls running.
+    """
+
+    def __init__(self, model, concurrency: int, timeout_s: float = LLM_TIMEOUT_S):
+        self.model = model
+        self.concurrency = concurrency
+        self.timeout_s = timeout_s
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._executor = None if hasattr(model, "generate_content_async") else \
+            ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="gemini")
+        self.stats = {"calls": 0, "errors": 0, "timeouts": 0, "in_flight": 0, "max_in_flight": 0}
+
+    def _release(self, future=None):
+        if future is not None and not future.cancelled():
+            future.exception()          # retrieved: no "never retrieved" warning after a timeout
+        self.stats["in_flight"] -= 1
+        self._semaphore.release()
+
+    async def generate(self, contents) -> str:
+        """Reply text; raises on errors and timeouts (callers fall back)"""
+        await self._semaphore.acquire()
+        self.stats["calls"] += 1
+        self.stats["in_flight"] += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+        try:
+            if self._executor is None:
+                try:
+                    response = await asyncio.wait_for(self.model.generate_content_async(contents), self.timeout_s)
+                finally:
+                    self._release()
+            else:
+                future = asyncio.get_running_loop().run_in_executor(
+                    self._executor, self.model.generate_content, contents)
+                future.add_done_callback(self._release)
+                # shield: a timeout stops the wait, not the thread (it keeps its slot)
+                response = await asyncio.wait_for(asyncio.shield(future), self.timeout_s)
+            return response.text
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            self.stats["errors"] += 1
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+# ============================================
+# CHAT FRONT-END
+# ============================================
+
+class AsyncChatFrontend:
+    """
+    Many conversations on one event loop
+
+    Every turn runs the rule-based chatbot first (no I/O) and saves the
+    session; only then is Gemini awaited, to phrase the next question
+    naturally or to read a dashboard photo. Turns that need no LLM
+    (clarifications, diagnoses) are answered straight away, whatever
+    other sessions are waiting on.
+
+    Usage:
+        frontend = AsyncChatFrontend(AccurateChatbot, QUESTION_FLOWS, text_model=model,
+                                     vision_model=vision_model)
+        await frontend.start("user-42", "Kavindu")
+        result = await frontend.process_message("user-42", "My car is overheating")
+    """
+
+    def __init__(self, bot_factory, flows, text_model=None, vision_model=None, sessions=None,
+                 naturalize: bool = True, phrasing_cache=None, light_info: dict = None,
+                 text_concurrency: int = TEXT_CONCURRENCY, vision_concurrency: int = VISION_CONCURRENCY):
+        self.bot_factory = bot_factory
+        self.flows = flows
+        self.sessions = sessions if sessions is not None else SessionManager(flows)
+        self.text = LLMUpstream(text_model, text_concurrency) if text_model is not None else None
+        self.vision = LLMUpstream(vision_model, vision_concurrency) if vision_model is not None else None
+        self.naturalize = naturalize
+        self.phrasing_cache = phrasing_cache
+        self._filling = set()       # question texts being phrased in the background
+        self._tasks = set()         # their tasks (referenced until done)
+        self.light_info = light_info or {}
+
+    def _load(self, session_id: str):
+        state = self.sessions.get(session_id)
+        if state is None:
+            self.sessions.start(session_id, self.bot_factory)
+            state = self.sessions.get(session_id)
+        return state.restore(self.bot_factory(), self.flows)
+
+    def _save(self, session_id: str, bot):
+        self.sessions.put(SessionState.capture(bot, session_id))
+
+    async def start(self, session_id: str, user_name: str = "there") -> str:
+        return self.sessions.start(session_id, self.bot_factory, user_name)
+
+    def close(self):
+        for upstream in (self.text, self.vision):
+            if upstream is not None:
+                upstream.close()
+
+    # ----------------------------------------
+    # LLM steps (each falls back to the rule-based text)
+    # ----------------------------------------
+
+    async def warm(self) -> int:
+        """
+        Phrase every flow question not cached yet (run at startup); returns LLM calls made
+
+        Only flows given as a dict can be listed; with a callable, questions
+        are phrased in the background the first time they are asked.
+        """
+        if self.phrasing_cache is None or self.text is None or callable(self.flows):
+            return 0
+        return await self.phrasing_cache.warm_async(self.text, question_texts(self.flows))
+
+    async def _fill(self, question_text: str):
+        try:
+            await self.phrasing_cache.warm_async(self.text, [question_text])
+        finally:
+            self._filling.discard(question_text)
+
+    async def natural_question(self, question_text: str) -> str:
+        """
+        Question phrased by Gemini, or unchanged if unavailable
+
+        With a phrasing cache no call is awaited: a miss keeps the
+        question as is and phrases it in the background for next time.
+        """
+        if self.text is None or not self.naturalize:
+            return question_text
+        if self.phrasing_cache is not None:
+            natural = self.phrasing_cache.get(question_text)
+            if natural is None and question_text not in self._filling:
+                self._filling.add(question_text)
+                task = asyncio.create_task(self._fill(question_text))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return natural or question_text
+        try:
+            return clean_natural_reply(await self.text.generate(natural_prompt(question_text))) or question_text
+        except Exception as e:
+            print(f"⚠️  Gemini error: {e}")
+            return question_text
+
+    async def _naturalize_result(self, bot, result: dict) -> dict:
+        """Swap the just-asked question in result for its natural phrasing"""
+        if result.get("stage") != "questioning" or bot.current_question_index == 0:
+            return result
+        question_text = bot.questions_to_ask[bot.current_question_index - 1]["text"]
+        natural = await self.natural_question(question_text)
+        if natural != question_text:
+            result = dict(result, bot_message=result["bot_message"].replace(question_text, natural))
+        return result
+
+    async def analyze_dashboard(self, image) -> dict:
+        """
+        Warning lights in a dashboard photo
+
+        Args:
+            image: file path, or an already opened PIL image
+        Returns:
+            {"success": True/False, "warning_lights": [...], "summary": "..."}
+        """
+        if self.vision is None:
+            return {"success": False, "error": "no vision model", "summary": IMAGE_ERROR_MESSAGE}
+        try:
+            if isinstance(image, str):
+                from PIL import Image
+                path = image
+                image = await asyncio.to_thread(lambda: Image.open(path).copy())
+            lights = parse_vision_reply(await self.vision.generate([VISION_PROMPT, image]))
+            return {"success": True, "warning_lights": lights,
+                    "summary": warning_summary(lights, self.light_info)}
+        except Exception as e:
+            print(f"❌ Image analysis error: {e}")
+            return {"success": False, "error": str(e), "summary": IMAGE_ERROR_MESSAGE}
+
+    # ----------------------------------------
+    # Turns
+    # ----------------------------------------
+
+    async def process_message(self, session_id: str, message: str) -> dict:
+        bot = self._load(session_id)
+        result = bot.process_message(message)
+        self._save(session_id, bot)
+        return await self._naturalize_result(bot, result)
+
+    async def process_with_image(self, session_id: str, message: str, image) -> dict:
+        """
+        A dashboard photo (with optional text)
+
+        The category comes from the detected lights when none is known
+        yet; otherwise the message is handled as a normal turn.
+        """
+        analysis = await self.analyze_dashboard(image)
+        bot = self._load(session_id)         # after the await: the session may have moved on
+        if not analysis["success"]:
+            return {"bot_message": analysis["summary"], "stage": "image_error",
+                    "detected_category": bot.detected_category, "diagnosis": None}
+
+        lights = analysis["warning_lights"]
+        if not bot.detected_category and lights:
+            category = bot._detect_category(" ".join(light["name"] for light in lights))
+            if category:
+                print(f"🎯 Category from dashboard: {category}")
+                bot.detected_category = category
+                bot.questions_to_ask = flow_questions(self.flows, category)
+
+        if bot.detected_category and bot.current_question_index == 0:
+            result = bot._ask_next_question()
+        elif message:
+            result = bot.process_message(message)
+        else:
+            result = {"bot_message": "", "stage": "questioning", "detected_category": bot.detected_category}
+        self._save(session_id, bot)
+
+        result = await self._naturalize_result(bot, result)
+        bot_message = analysis["summary"] + ("\n\n" + result["bot_message"] if result["bot_message"] else "")
+        return dict(result, bot_message=bot_message, warning_lights=lights)
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import time
+    from accurate_chatbot import AccurateChatbot, QUESTION_FLOWS
+    from phrasing_cache import PhrasingCache
+
+    print("="*70)
+    print("🧪 TESTING ASYNC CHAT FRONT-END")
+    print("="*70)
+
+    class _Reply:
+        def __init__(self, text):
+            self.text = text
+
+    class SlowModel:
+        """Blocking client with a fixed round-trip (like generate_content)"""
+        def __init__(self, seconds, reply):
+            self.seconds, self.reply = seconds, reply
+
+        def generate_content(self, contents):
+            time.sleep(self.seconds)
+            return _Reply(self.reply(contents))
+
+    text_model = SlowModel(0.5, lambda prompt: '"👉 Quick check for me - ' + prompt.split('"')[1].lstrip("👉 ") + '"')
+    vision_model = SlowModel(1.0, lambda contents: '```json\n{"warning_lights": [{"name": "Temperature Warning", "color": "Red"}]}\n```')
+
+    photo = object()        # stands in for an opened PIL image
+
+    async def main():
+        frontend = AsyncChatFrontend(AccurateChatbot, QUESTION_FLOWS, text_model=text_model,
+                                     vision_model=vision_model, text_concurrency=2)
+        for i in range(7):
+            await frontend.start(f"driver-{i}", f"Driver {i}")
+
+        async def timed(name, turn):
+            start = time.perf_counter()
+            result = await turn
+            return name, time.perf_counter() - start, result
+
+        t0 = time.perf_counter()
+        turns = [timed(f"driver-{i} (LLM question)", frontend.process_message(f"driver-{i}", "My car is overheating"))
+                 for i in range(4)]
+        turns.append(timed("driver-4 (rules only)", frontend.process_message("driver-4", "hello?")))
+        turns.append(timed("driver-5 (photo)", frontend.process_with_image("driver-5", "", photo)))
+        for name, seconds, result in await asyncio.gather(*turns):
+            print(f"\n  {name:<26} {seconds * 1000:6.0f} ms  {result['stage']}")
+            print("     " + result["bot_message"].replace("\n", " ")[:90])
+        print(f"\n  All {len(turns)} turns in {time.perf_counter() - t0:.2f}s "
+              f"(text in flight ≤ {frontend.text.stats['max_in_flight']}, "
+              f"vision calls {frontend.vision.stats['calls']})")
+
+        # Same turns with phrasings warmed at startup: no Gemini call per turn
+        cached = AsyncChatFrontend(AccurateChatbot, QUESTION_FLOWS, text_model=SlowModel(0.05, text_model.reply),
+                                   phrasing_cache=PhrasingCache("demo-model", path=None), text_concurrency=8)
+        start = time.perf_counter()
+        calls = await cached.warm()
+        print(f"\n  Warmed {len(cached.phrasing_cache)} questions ({calls} calls) in {time.perf_counter() - start:.1f}s")
+        start = time.perf_counter()
+        results = await asyncio.gather(*(cached.process_message(f"driver-{i}", "My car is overheating")
+                                         for i in range(4)))
+        print(f"  4 question turns from the cache in {(time.perf_counter() - start) * 1000:.1f} ms: "
+              f"{results[0]['bot_message'][:60]}...")
+
+        # Gemini slower than the timeout: callers give up, threads keep their slot
+        slow = LLMUpstream(SlowModel(0.3, lambda prompt: "late"), concurrency=2, timeout_s=0.05)
+        outcomes = await asyncio.gather(*(slow.generate("prompt") for _ in range(5)), return_exceptions=True)
+        await asyncio.sleep(0.4)
+        assert slow.stats["max_in_flight"] == 2
+        print(f"  Timeouts: {sum(isinstance(o, asyncio.TimeoutError) for o in outcomes)}/5, "
+              f"never more than {slow.stats['max_in_flight']} Gemini calls running")
+        frontend.close()
+        cached.close()
+        slow.close()
+
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+# gemini_prompts.py - Gemini prompts and reply parsing (shared by the sync and async chatbots)
+
+import json
+
+# ============================================
+# NATURAL PHRASING
+# ============================================
+
+NATURAL_PROMPT = """You are a friendly, empathetic car mechanic assistant.
+
+Take this technical question and make it sound natural and caring, like a friend helping.
+
+Technical question: "{question_text}"
+
+Rules:
+1. Keep it short (1-2 sentences max)
+2. Use 👉 emoji for the question
+3. Sound empathetic if it's a serious issue
+4. Don't add extra questions
+5. Keep the core question unchanged
+
+Respond with ONLY the improved question, nothing else."""
+
+def natural_prompt(question_text: str) -> str:
+    return NATURAL_PROMPT.format(question_text=question_text)
+
+def clean_natural_reply(text: str) -> str:
+    """Gemini's reply without surrounding whitespace or quotes"""
+    return text.strip().strip('"').strip("'")
+
+# ============================================
+# DASHBOARD VISION
+# ============================================
+
+VISION_PROMPT = """Analyze this Suzuki Alto dashboard image.
+
+IDENTIFY all warning lights that are ON (illuminated/lit).
+
+Common Suzuki Alto warning lights:
+- Temperature Warning (red thermometer symbol)
+- Check Engine Light (yellow/orange engine symbol)
+- Battery Warning (red battery symbol)
+- Brake Warning (red BRAKE text or circle with !)
+- Oil Pressure Warning (red oil can symbol)
+- ABS Warning (yellow ABS text)
+
+Respond in this JSON format:
+{
+  "warning_lights": [
+    {
+      "name": "Temperature Warning",
+      "color": "Red"
+    }
+  ]
+}
+
+Respond with ONLY JSON, nothing else."""
+
+IMAGE_ERROR_MESSAGE = "I had trouble reading the image. Could you describe which warning lights are ON?"
+
+def parse_vision_reply(text: str) -> list:
+    """
+    Warning lights from Gemini's JSON reply (a ```json fence is allowed)
+
+    Returns:
+        [{"name": "Temperature Warning", "color": "Red"}, ...]
+    Raises:
+        ValueError: the reply is not the expected JSON
+    """
+    text = text.strip()
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    return json.loads(text).get('warning_lights', [])
+
+def warning_summary(warning_lights: list, light_info: dict = None) -> str:
+    """
+    Human-readable summary of detected lights
+
+    Args:
+        light_info: {light name: {"meaning", "severity", ...}} (optional)
+    """
+    if not warning_lights:
+        return "✓ I can see your dashboard. No critical warning lights detected."
+
+    light_info = light_info or {}
+    summary = "📊 **Dashboard Analysis Complete**\n\n"
+    summary += "⚠️ **Warning Lights Detected:**\n\n"
+
+    for light in warning_lights:
+        name = light['name']
+        color = light.get('color', 'Unknown')
+
+        if name in light_info:
+            info = light_info[name]
+            icon = "🔴" if color == "Red" else "🟡"
+            summary += f"{icon} **{name}** ({color})\n"
+            summary += f"   Meaning: {info['meaning']}\n"
+            summary += f"   Severity: {info['severity']}\n\n"
+        else:
+            summary += f"• **{name}** ({color})\n\n"
+
+    summary += "Thanks for the photo 👍 This helps me understand better.\n"
+
+    return summary
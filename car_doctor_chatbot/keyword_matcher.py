@@ -0,0 +1,155 @@
+# keyword_matcher.py - One-pass multi-keyword matcher for fault category detection
+
+import re
+from collections import Counter
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+# Word endings accepted after a keyword ("brake" -> "brakes", "leak" -> "leaking")
+SUFFIXES = ("s", "es", "d", "ed", "ing")
+
+# ============================================
+# PATTERN BUILDING
+# ============================================
+
+def normalize_keyword(text: str) -> str:
+    """Lower-case, '_' as space, single spaces ("Check  Engine" -> "check engine")"""
+    return " ".join(text.lower().replace("_", " ").split())
+
+def _trie_pattern(words) -> str:
+    """
+    Regex alternation of many words, factored as a prefix tree
+
+    "brake", "braking", "battery" -> b(?:attery|rak(?:e|ing))
+    At every position the regex engine follows one branch of the tree
+    instead of trying each keyword in turn, so matching cost depends on
+    keyword length, not on how many keywords there are. A word that is
+    a prefix of a longer one is optional at its end node, so the longer
+    keyword is tried first.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        branches = [(r"\s+" if char == " " else re.escape(char)) + emit(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    return emit(trie)
+
+# ============================================
+# MATCHER
+# ============================================
+
+class KeywordMatcher:
+    """
+    Finds every keyword of every category in one scan of a message
+
+    Keywords match whole words (with SUFFIXES), case-insensitively; the
+    longest keyword wins where several overlap ("check engine" over
+    "engine"). A keyword listed under several categories counts for each.
+
+    Usage:
+        matcher = KeywordMatcher({"Brake": ["brake", "pedal"], "Engine": ["overheating"]})
+        matcher.match("brake light on and car overheating")
+    """
+
+    def __init__(self, keywords_by_category: dict):
+        self.categories = list(keywords_by_category)
+        self._categories_of = {}        # normalised keyword -> categories
+        for category, keywords in keywords_by_category.items():
+            for keyword in keywords:
+                self._categories_of.setdefault(normalize_keyword(keyword), []).append(category)
+
+        words = sorted(self._categories_of)
+        suffixes = "|".join(sorted(SUFFIXES, key=len, reverse=True))
+        # Messages are lower-cased before scanning (faster than re.IGNORECASE)
+        self._pattern = re.compile(rf"\b({_trie_pattern(words)})(?:{suffixes})?\b") if words else None
+
+    def __len__(self):
+        return len(self._categories_of)
+
+    def match(self, message: str) -> list:
+        """
+        Every matched category, best first
+
+        Categories are ordered by hit count; ties go to the category
+        mentioned first in the message.
+
+        Returns:
+            [{"category": "Engine", "hits": 2, "keywords": ["overheating", "steam"],
+              "confidence": 0.67}, ...] - confidence is the share of all hits
+        """
+        if self._pattern is None:
+            return []
+
+        hits = Counter()
+        first_seen = {}
+        keywords = {}
+        for position, found in enumerate(self._pattern.finditer(message.lower())):
+            keyword = " ".join(found.group(1).split())
+            for category in self._categories_of[keyword]:
+                hits[category] += 1
+                first_seen.setdefault(category, position)
+                keywords.setdefault(category, []).append(keyword)
+
+        total = sum(hits.values())
+        ranked = sorted(hits, key=lambda category: (-hits[category], first_seen[category]))
+        return [{"category": category, "hits": hits[category], "keywords": keywords[category],
+                 "confidence": round(hits[category] / total, 2)} for category in ranked]
+
+    def best(self, message: str):
+        """Best category or None"""
+        matches = self.match(message)
+        return matches[0]["category"] if matches else None
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import random
+    import string
+    import time
+    from accurate_knowledge_base import SUZUKI_ALTO_FAULTS
+
+    print("="*70)
+    print("🧪 TESTING KEYWORD MATCHER")
+    print("="*70)
+
+    matcher = KeywordMatcher({category: data["keywords"] for category, data in SUZUKI_ALTO_FAULTS.items()})
+
+    messages = [
+        "brake light on and car overheating",
+        "My check engine light is on and the car is shaking a bit",
+        "I'm driving back from work and there's a crack in the glass",
+        "Brakes squealing and grinding when braking",
+        "The car won't start, battery seems dead",
+    ]
+    for message in messages:
+        print(f"\n  \"{message}\"")
+        for m in matcher.match(message):
+            print(f"     {m['category']:<13} hits={m['hits']} confidence={m['confidence']:.2f} {m['keywords']}")
+
+    # Detection cost: 7 categories vs hundreds of keywords per model
+    random.seed(0)
+    big = {f"Category {i}": ["".join(random.choices(string.ascii_lowercase, k=random.randint(4, 12)))
+                             for _ in range(100)] for i in range(30)}
+    big_matcher = KeywordMatcher(big)
+    text = " ".join(messages) * 3
+    for name, m in (("7 categories", matcher), (f"{len(big_matcher):,} keywords", big_matcher)):
+        start = time.perf_counter()
+        for _ in range(2000):
+            m.match(text)
+        print(f"\n  ⏱️  {name:<16} {(time.perf_counter() - start) / 2000 * 1e6:6.1f} µs per message")
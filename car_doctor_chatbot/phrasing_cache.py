@@ -0,0 +1,195 @@
+# phrasing_cache.py - Natural question phrasings cached in memory and on disk, warmed at startup
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+
+from gemini_prompts import NATURAL_PROMPT, clean_natural_reply
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "phrasing_cache.json")
+VARIANTS_PER_QUESTION = 3     # Phrasings kept per question (picked at random per turn)
+
+# ============================================
+# KEYS
+# ============================================
+
+def cache_key(template: str, model_name: str, text: str) -> str:
+    """
+    SHA-256 of (prompt template, model, input text)
+
+    Editing the prompt or switching models gives new keys, so stale
+    phrasings are never served.
+    """
+    return hashlib.sha256("\x00".join((template, model_name, text)).encode("utf-8")).hexdigest()
+
+def question_texts(question_flows: dict) -> list:
+    """Every distinct question text of {category: [{"text": ...}, ...]}"""
+    return list(dict.fromkeys(q["text"] for questions in question_flows.values() for q in questions))
+
+# ============================================
+# CACHE
+# ============================================
+
+class PhrasingCache:
+    """
+    A few natural phrasings per question text
+
+    get() is a dict lookup, never an LLM call: a question that was not
+    warmed comes back as None and the caller keeps its own text. The
+    LLM is only called by warm() / warm_async(), for the questions that
+    were not warmed yet, and the results are saved to disk so a
+    restart does not pay for them again.
+
+    Usage:
+        cache = PhrasingCache(MODEL_NAME)
+        cache.warm(lambda prompt: model.generate_content(prompt).text, question_texts(QUESTION_FLOWS))
+        cache.get("👉 Is the engine still running right now?")
+    """
+
+    def __init__(self, model_name: str, path: str = CACHE_PATH, template: str = NATURAL_PROMPT,
+                 variants: int = VARIANTS_PER_QUESTION):
+        self.model_name = model_name
+        self.path = path
+        self.template = template
+        self.variants = variants
+        self._entries = {}          # key -> {"text": question, "variants": [...], "replies": n}
+        self.stats = {"hits": 0, "misses": 0, "llm_calls": 0}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, text: str) -> str:
+        return cache_key(self.template, self.model_name, text)
+
+    def get(self, text: str):
+        """A random cached phrasing of text, or None"""
+        entry = self._entries.get(self.key(text))
+        if not entry or not entry["variants"]:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return random.choice(entry["variants"])
+
+    def add(self, text: str, variant: str):
+        """
+        Record one LLM reply for text
+
+        Every reply counts, even an empty or repeated one: a model that
+        keeps answering the same way leaves fewer variants rather than
+        being asked again at every startup.
+        """
+        variant = clean_natural_reply(variant)
+        entry = self._entries.setdefault(self.key(text), {"text": text, "variants": [], "replies": 0})
+        entry["replies"] = entry.get("replies", len(entry["variants"])) + 1
+        if variant and variant not in entry["variants"] and len(entry["variants"]) < self.variants:
+            entry["variants"].append(variant)
+
+    def missing(self, text: str) -> int:
+        """LLM replies still to request for text (failed calls are not counted)"""
+        entry = self._entries.get(self.key(text))
+        if not entry:
+            return self.variants
+        return max(self.variants - entry.get("replies", len(entry["variants"])), 0)
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+    # ----------------------------------------
+    # Warming (startup only)
+    # ----------------------------------------
+
+    def warm(self, generate, texts) -> int:
+        """
+        Request missing replies with a blocking generate(prompt) -> reply text
+
+        Failed calls are skipped (retried at the next warm). Returns the
+        number of LLM calls made.
+        """
+        calls = 0
+        for text in texts:
+            for _ in range(self.missing(text)):
+                calls += 1
+                try:
+                    self.add(text, generate(self.template.format(question_text=text)))
+                except Exception as e:
+                    print(f"⚠️  Gemini error while warming: {e}")
+        self.stats["llm_calls"] += calls
+        self.save()
+        return calls
+
+    async def warm_async(self, upstream, texts) -> int:
+        """Same as warm(), concurrently through an LLMUpstream (its own limit applies)"""
+        prompts = [(text, self.template.format(question_text=text))
+                   for text in texts for _ in range(self.missing(text))]
+        replies = await asyncio.gather(*(upstream.generate(prompt) for _, prompt in prompts),
+                                       return_exceptions=True)
+        for (text, _), reply in zip(prompts, replies):
+            if isinstance(reply, Exception):
+                print(f"⚠️  Gemini error while warming: {reply}")
+            else:
+                self.add(text, reply)
+        self.stats["llm_calls"] += len(prompts)
+        self.save()
+        return len(prompts)
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    print("="*70)
+    print("🧪 TESTING PHRASING CACHE")
+    print("="*70)
+
+    flows = {
+        "Engine": [{"text": "👉 Is the temperature warning light ON on your dashboard?"},
+                   {"text": "👉 Is the engine still running right now?"}],
+        "Brake": [{"text": "👉 How does the brake pedal feel when you press it?"}],
+    }
+    texts = question_texts(flows)
+    openers = iter(["No worries", "Thanks for telling me", "Okay", "Stay calm", "Got it"] * 10)
+
+    def fake_generate(prompt):
+        time.sleep(0.05)        # LLM round-trip
+        return f'"{next(openers)} - {prompt.split(chr(34))[1]}"'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "phrasing_cache.json")
+        cache = PhrasingCache("gemini-1.5-flash", path)
+        start = time.perf_counter()
+        calls = cache.warm(fake_generate, texts)
+        print(f"\n  Startup warm: {calls} LLM calls in {time.perf_counter() - start:.2f}s")
+
+        restarted = PhrasingCache("gemini-1.5-flash", path)
+        print(f"  Restart: {len(restarted)} questions from disk, {restarted.warm(fake_generate, texts)} LLM calls")
+        print(f"  Other model: {PhrasingCache('gemini-flash-latest', path).get(texts[0])} (new keys)")
+
+        same = PhrasingCache("deterministic-model", path)
+        first = same.warm(lambda prompt: "👉 Same answer every time", texts)
+        again = PhrasingCache("deterministic-model", path).warm(lambda prompt: "👉 Same answer every time", texts)
+        print(f"  Repeating model: {first} calls, then {again} after a restart (1 variant kept)")
+
+        n = 100_000
+        start = time.perf_counter()
+        for i in range(n):
+            restarted.get(texts[i % len(texts)])
+        print(f"  ⏱️  {(time.perf_counter() - start) / n * 1e6:.2f} µs per lookup, stats {restarted.stats}")
+        for text in texts:
+            print(f"\n  {text}\n     -> {restarted.get(text)}")
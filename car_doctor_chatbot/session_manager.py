@@ -0,0 +1,353 @@
+# session_manager.py - Compact chatbot sessions: LRU + idle TTL, optional sqlite/json snapshots
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+MAX_SESSIONS = 100_000        # Sessions kept in memory (least recently used evicted)
+IDLE_TTL_S = 30 * 60          # Sessions idle this long are dropped
+HISTORY_TURNS = 4             # Messages kept per session (the flow is the real state)
+
+# ============================================
+# SESSION STATE
+# ============================================
+
+def flow_questions(flows, category: str) -> list:
+    """Questions of a category from {category: questions} or a callable category -> questions"""
+    return flows(category) if callable(flows) else flows.get(category, [])
+
+class SessionState:
+    """
+    Everything a conversation needs between two turns, and nothing more
+
+    The question flow is NOT stored: only the category and the index into
+    it, the flow itself is looked up again from the shared QUESTION_FLOWS.
+    Symptom names are interned, so thousands of sessions share one string.
+    """
+
+    __slots__ = ("session_id", "user_name", "category", "question_index", "symptoms",
+                 "history", "diagnosis_complete", "last_active")
+
+    def __init__(self, session_id: str, user_name: str = "there", category: str = None,
+                 question_index: int = 0, symptoms=(), history=(), diagnosis_complete: bool = False,
+                 last_active: float = 0.0):
+        self.session_id = session_id
+        self.user_name = user_name
+        self.category = category
+        self.question_index = question_index
+        self.symptoms = tuple(sys.intern(s) for s in symptoms)
+        self.history = tuple(history)[-HISTORY_TURNS:]
+        self.diagnosis_complete = diagnosis_complete
+        self.last_active = last_active
+
+    def to_dict(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "user_name": self.user_name,
+            "category": self.category,
+            "question_index": self.question_index,
+            "symptoms": list(self.symptoms),
+            "history": [list(turn) for turn in self.history],
+            "diagnosis_complete": self.diagnosis_complete,
+            "last_active": self.last_active,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data["session_id"], data.get("user_name", "there"), data.get("category"),
+                   data.get("question_index", 0), data.get("symptoms", ()),
+                   [tuple(turn) for turn in data.get("history", ())],
+                   data.get("diagnosis_complete", False), data.get("last_active", 0.0))
+
+    # ----------------------------------------
+    # Chatbot <-> state
+    # ----------------------------------------
+
+    @classmethod
+    def capture(cls, bot, session_id: str, last_active: float = 0.0):
+        """State of an AccurateChatbot / DiagnosticChatbot after a turn"""
+        history = [(turn["role"], turn["message"]) for turn in bot.conversation_history[-HISTORY_TURNS:]]
+        return cls(session_id, bot.user_name, bot.detected_category, bot.current_question_index,
+                   [symptom for symptom, present in bot.symptoms.items() if present],
+                   history, bot.diagnosis_complete, last_active)
+
+    def restore(self, bot, flows):
+        """
+        Load this state into a fresh chatbot
+
+        Args:
+            flows: {category: questions} (e.g. QUESTION_FLOWS) or a
+                   callable category -> questions
+        """
+        bot.user_name = self.user_name
+        bot.detected_category = self.category
+        if self.category is not None:
+            bot.questions_to_ask = flow_questions(flows, self.category)
+        bot.current_question_index = self.question_index
+        bot.symptoms = dict.fromkeys(self.symptoms, True)
+        bot.conversation_history = [{"role": role, "message": message} for role, message in self.history]
+        bot.diagnosis_complete = self.diagnosis_complete
+        return bot
+
+# ============================================
+# SNAPSHOT STORES
+# ============================================
+
+class SqliteSessionStore:
+    """Sessions as JSON rows in a local sqlite3 file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("CREATE TABLE IF NOT EXISTS sessions "
+                         "(session_id TEXT PRIMARY KEY, state TEXT NOT NULL, last_active REAL NOT NULL)")
+        self._db.commit()
+
+    def put_many(self, states):
+        self._db.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                             [(s.session_id, json.dumps(s.to_dict()), s.last_active) for s in states])
+        self._db.commit()
+
+    def get(self, session_id: str):
+        row = self._db.execute("SELECT state FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return SessionState.from_dict(json.loads(row[0])) if row else None
+
+    def delete_many(self, session_ids):
+        self._db.executemany("DELETE FROM sessions WHERE session_id = ?", [(i,) for i in session_ids])
+        self._db.commit()
+
+    def load_all(self, newer_than: float = 0.0) -> list:
+        rows = self._db.execute("SELECT state FROM sessions WHERE last_active > ?", (newer_than,))
+        return [SessionState.from_dict(json.loads(state)) for state, in rows]
+
+    def close(self):
+        self._db.close()
+
+class JsonSessionStore:
+    """Sessions in one JSON file (small deployments, easy to inspect)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._states = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._states = json.load(f)
+
+    def _flush(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._states, f)
+        os.replace(tmp, self.path)
+
+    def put_many(self, states):
+        for s in states:
+            self._states[s.session_id] = s.to_dict()
+        self._flush()
+
+    def get(self, session_id: str):
+        data = self._states.get(session_id)
+        return SessionState.from_dict(data) if data else None
+
+    def delete_many(self, session_ids):
+        for session_id in session_ids:
+            self._states.pop(session_id, None)
+        self._flush()
+
+    def load_all(self, newer_than: float = 0.0) -> list:
+        return [SessionState.from_dict(d) for d in self._states.values() if d["last_active"] > newer_than]
+
+    def close(self):
+        pass
+
+# ============================================
+# SESSION MANAGER
+# ============================================
+
+class SessionManager:
+    """
+    Sessions of many concurrent conversations, keyed by session ID
+
+    Least recently used sessions are evicted beyond max_sessions, and
+    sessions idle for idle_ttl seconds expire. With a store, evicted
+    sessions are written to it (and read back on their next message),
+    snapshot() saves everything, and restore() reloads after a restart.
+
+    Usage:
+        manager = SessionManager(QUESTION_FLOWS, store=SqliteSessionStore("sessions.db"))
+        result = manager.handle("user-42", "My car is overheating", AccurateChatbot)
+    """
+
+    def __init__(self, flows, max_sessions: int = MAX_SESSIONS, idle_ttl: float = IDLE_TTL_S,
+                 store=None, clock=time.time):
+        self.flows = flows
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.store = store
+        self.clock = clock
+        self._sessions = OrderedDict()      # session_id -> SessionState
+        self.stats = {"created": 0, "evicted": 0, "expired": 0, "loaded": 0}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _expired(self, state: SessionState, now: float) -> bool:
+        return now - state.last_active > self.idle_ttl
+
+    def get(self, session_id: str):
+        """Live session or None (expired sessions are dropped)"""
+        now = self.clock()
+        state = self._sessions.get(session_id)
+        if state is None and self.store is not None:
+            state = self.store.get(session_id)
+            if state is not None:
+                self.stats["loaded"] += 1
+                self._sessions[session_id] = state
+        if state is None:
+            return None
+        if self._expired(state, now):
+            self.delete(session_id)
+            self.stats["expired"] += 1
+            return None
+        self._sessions.move_to_end(session_id)
+        return state
+
+    def put(self, state: SessionState):
+        """Store a session after a turn (marks it active now)"""
+        state.last_active = self.clock()
+        self._sessions[state.session_id] = state
+        self._sessions.move_to_end(state.session_id)
+
+        evicted = []
+        while len(self._sessions) > self.max_sessions:
+            evicted.append(self._sessions.popitem(last=False)[1])
+        if evicted:
+            self.stats["evicted"] += len(evicted)
+            if self.store is not None:
+                self.store.put_many(evicted)
+
+    def delete(self, session_id: str):
+        self._sessions.pop(session_id, None)
+        if self.store is not None:
+            self.store.delete_many([session_id])
+
+    def expire_idle(self) -> int:
+        """Drop every idle session (run periodically); returns how many"""
+        now = self.clock()
+        expired = []
+        # Oldest activity first, so stop at the first live session
+        for session_id, state in self._sessions.items():
+            if not self._expired(state, now):
+                break
+            expired.append(session_id)
+        for session_id in expired:
+            del self._sessions[session_id]
+        if expired and self.store is not None:
+            self.store.delete_many(expired)
+        self.stats["expired"] += len(expired)
+        return len(expired)
+
+    # ----------------------------------------
+    # Conversations
+    # ----------------------------------------
+
+    def start(self, session_id: str, bot_factory, user_name: str = "there") -> str:
+        """Start (or restart) a conversation; returns the greeting"""
+        bot = bot_factory()
+        greeting = bot.start_conversation(user_name)
+        self.put(SessionState.capture(bot, session_id))
+        self.stats["created"] += 1
+        return greeting
+
+    def handle(self, session_id: str, message: str, bot_factory) -> dict:
+        """
+        One user turn: rebuild the chatbot from the session, process, save back
+
+        Unknown or expired sessions start a new conversation first.
+        """
+        state = self.get(session_id)
+        if state is None:
+            self.start(session_id, bot_factory)
+            state = self._sessions[session_id]
+        bot = state.restore(bot_factory(), self.flows)
+        result = bot.process_message(message)
+        self.put(SessionState.capture(bot, session_id))
+        return result
+
+    # ----------------------------------------
+    # Snapshots
+    # ----------------------------------------
+
+    def snapshot(self) -> int:
+        """Write every live session to the store"""
+        if self.store is None:
+            raise ValueError("SessionManager has no store")
+        self.store.put_many(self._sessions.values())
+        return len(self._sessions)
+
+    def restore(self) -> int:
+        """Reload non-expired sessions from the store (after a restart)"""
+        if self.store is None:
+            raise ValueError("SessionManager has no store")
+        states = self.store.load_all(newer_than=self.clock() - self.idle_ttl)
+        for state in sorted(states, key=lambda s: s.last_active):
+            self._sessions[state.session_id] = state
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return len(states)
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import tempfile
+    import tracemalloc
+
+    print("="*70)
+    print("🧪 TESTING SESSION MANAGER")
+    print("="*70)
+
+    flows = {"Engine": [{"id": "temp_warning", "text": "👉 Is the temperature warning light ON?",
+                         "symptom_map": {"yes": "temp_warning_on", "no": "temp_warning_off"}}]}
+
+    # 100k idle sessions mid-conversation
+    tracemalloc.start()
+    manager = SessionManager(flows)
+    for i in range(100_000):
+        manager.put(SessionState(f"session-{i:06d}", "Kavindu", "Engine", 2,
+                                 ["temp_warning_on", "engine_running"],
+                                 [("user", "My car is overheating"),
+                                  ("bot", "Got it 👍\n\n👉 Is the engine still running right now?")]))
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"\n  {len(manager):,} sessions: {used / 2**20:.1f} MB ({used / len(manager):.0f} bytes per session)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteSessionStore(os.path.join(tmp, "sessions.db"))
+        manager.store = store
+        start = time.perf_counter()
+        manager.snapshot()
+        print(f"  💾 Snapshot to sqlite: {time.perf_counter() - start:.2f}s")
+
+        restarted = SessionManager(flows, store=store)
+        start = time.perf_counter()
+        restored = restarted.restore()
+        print(f"  🔄 Restored {restored:,} sessions in {time.perf_counter() - start:.2f}s")
+
+        state = restarted.get("session-000042")
+        print(f"  session-000042: {state.category}, question {state.question_index}, {list(state.symptoms)}")
+        store.close()
+
+    clock = [0.0]
+    small = SessionManager(flows, max_sessions=2, idle_ttl=60, clock=lambda: clock[0])
+    for name in ("a", "b", "c"):
+        small.put(SessionState(name))
+    clock[0] = 120
+    print(f"  LRU: {list(small._sessions)} kept; after the idle TTL: {small.expire_idle()} expired")
@@ -4,7 +4,7 @@ import google.generativeai as genai
 from chatbot_core import DiagnosticChatbot
 from knowledge_base import WARNING_LIGHTS
 from PIL import Image
-import json
+from gemini_prompts import VISION_PROMPT, IMAGE_ERROR_MESSAGE, parse_vision_reply, warning_summary
 
 # ============================================
 # CONFIGURATION
@@ -50,42 +50,10 @@ class FinalChatbot(DiagnosticChatbot):
             # Load image
             img = Image.open(image_path)
             
-            # Create vision prompt
-            vision_prompt = """Analyze this Suzuki Alto dashboard image.
-
-IDENTIFY all warning lights that are ON (illuminated/lit).
-
-Common Suzuki Alto warning lights:
-- Temperature Warning (red thermometer symbol)
-- Check Engine Light (yellow/orange engine symbol)
-- Battery Warning (red battery symbol)
-- Brake Warning (red BRAKE text or circle with !)
-- Oil Pressure Warning (red oil can symbol)
-- ABS Warning (yellow ABS text)
-
-Respond in this JSON format:
-{
-  "warning_lights": [
-    {
-      "name": "Temperature Warning",
-      "color": "Red"
-    }
-  ]
-}
-
-Respond with ONLY JSON, nothing else."""
-
             # Send to Gemini Vision
-            response = self.vision_model.generate_content([vision_prompt, img])
-            result_text = response.text.strip()
-            
-            # Clean JSON
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0].strip()
+            response = self.vision_model.generate_content([VISION_PROMPT, img])
             
-            result = json.loads(result_text)
-            
-            self.warning_lights_detected = result.get('warning_lights', [])
+            self.warning_lights_detected = parse_vision_reply(response.text)
             self.dashboard_analyzed = True
             
             # Create summary
@@ -104,34 +72,12 @@ Respond with ONLY JSON, nothing else."""
             return {
                 "success": False,
                 "error": str(e),
-                "summary": "I had trouble reading the image. Could you describe which warning lights are ON?"
+                "summary": IMAGE_ERROR_MESSAGE
             }
     
     def _create_warning_summary(self) -> str:
         """Create human-readable summary of detected lights"""
-        if not self.warning_lights_detected:
-            return "✓ I can see your dashboard. No critical warning lights detected."
-        
-        summary = "📊 **Dashboard Analysis Complete**\n\n"
-        summary += "⚠️ **Warning Lights Detected:**\n\n"
-        
-        for light in self.warning_lights_detected:
-            name = light['name']
-            color = light.get('color', 'Unknown')
-            
-            # Get info from knowledge base
-            if name in WARNING_LIGHTS:
-                info = WARNING_LIGHTS[name]
-                icon = "🔴" if color == "Red" else "🟡"
-                summary += f"{icon} **{name}** ({color})\n"
-                summary += f"   Meaning: {info['meaning']}\n"
-                summary += f"   Severity: {info['severity']}\n\n"
-            else:
-                summary += f"• **{name}** ({color})\n\n"
-        
-        summary += "Thanks for the photo 👍 This helps me understand better.\n"
-        
-        return summary
+        return warning_summary(self.warning_lights_detected, WARNING_LIGHTS)
     
     def process_with_image(self, user_message: str, image_path: str) -> dict:
         """
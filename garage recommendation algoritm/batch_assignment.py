@@ -0,0 +1,419 @@
+# batch_assignment.py - Spread many drivers over garages without exceeding their capacity
+
+import time
+
+import numpy as np
+
+from distance_matrix import GarageDistances
+from scoring_engine import CITY_SPEED_KPH, CRITERIA, WEIGHTS, normalize_matrix
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+EPSILON = 1e-3                 # Final auction bid increment
+EPSILON_START = 0.01           # First epsilon-scaling phase
+EPSILON_FACTOR = 5.0
+MAX_AUCTION_ROUNDS = 2000
+AUCTION_CANDIDATES = 64        # Cheapest garages each driver bids on at first
+MAX_AUCTION_CELLS = 20_000_000 # Above drivers x garages, go straight to greedy
+AUCTION_TIME_BUDGET_S = 0.4    # "auto" falls back to greedy when the auction takes longer
+UNASSIGNED_COST = 10.0         # Cost of leaving a driver unassigned (scores are <= 1)
+
+# ============================================
+# COST MATRIX
+# ============================================
+
+def assignment_costs(driver_lats, driver_lons, store, weights=WEIGHTS, arrival=None) -> np.ndarray:
+    """
+    D x G matrix of garage scores (lower = better) for a batch of drivers
+
+    All drivers share the batch-wide column maxima, so a score means the
+    same thing in every row and costs can be added across drivers.
+
+    Args:
+        store: GarageStore with waiting/rating/mechanics filled in
+        arrival: optional D x G arrival minutes (e.g. from EtaEngine);
+                 estimated from distance at CITY_SPEED_KPH when None
+    """
+    distance = GarageDistances.from_store(store).matrix(driver_lats, driver_lons, dtype=np.float64)
+    if arrival is None:
+        arrival = distance / CITY_SPEED_KPH * 60
+    arrival = np.asarray(arrival, dtype=np.float64)
+
+    weights = np.asarray(weights, dtype=np.float64)
+    d_col, a_col = CRITERIA.index("distance"), CRITERIA.index("arrival")
+
+    # Driver-independent columns are normalised once per garage
+    features = store.features()
+    features[:, [d_col, a_col]] = 0.0
+    maxima = features.max(axis=0) if len(features) else np.zeros(len(CRITERIA))
+    maxima[d_col] = distance.max(initial=0.0)
+    maxima[a_col] = arrival.max(initial=0.0)
+
+    costs = normalize_matrix(features, maxima) @ weights
+    costs = np.broadcast_to(costs, distance.shape).copy()
+    if maxima[d_col] > 0:
+        costs += weights[d_col] * distance / maxima[d_col]
+    if maxima[a_col] > 0:
+        costs += weights[a_col] * arrival / maxima[a_col]
+    return costs
+
+# ============================================
+# SOLVERS
+# ============================================
+
+def _reverse_auction(benefit, slot_garage, prices, owner, assigned_slot, eps):
+    """
+    Lower the prices left on unused slots by earlier epsilon phases
+
+    With more slots than drivers, a forward auction alone is only
+    optimal if every unused slot is no more expensive than the cheapest
+    used one (lambda). Each overpriced unused slot either drops to lambda
+    or bids for the driver it suits best (reverse auction step).
+    """
+    n_drivers = len(assigned_slot)
+    drivers = np.arange(n_drivers)
+    profits = benefit[drivers, slot_garage[assigned_slot]] - prices[assigned_slot]
+    lam = prices[assigned_slot].min(initial=0.0)
+
+    queue = np.flatnonzero((owner < 0) & (prices > lam))
+
+    # Profits only grow during the reverse auction, so every slot that no
+    # driver wants at lambda now can be dropped to lambda up front
+    beta = (benefit[:, slot_garage[queue]] - profits[:, None]).max(axis=0, initial=-np.inf)
+    drop = lam >= beta - eps
+    prices[queue[drop]] = lam
+    queue = queue[~drop].tolist()
+
+    while queue:
+        slot = queue.pop()
+        if owner[slot] >= 0 or prices[slot] <= lam:
+            continue
+
+        values = benefit[:, slot_garage[slot]] - profits
+        driver = int(values.argmax())
+        beta = values[driver]
+        if lam >= beta - eps:
+            prices[slot] = lam
+            continue
+        values[driver] = -np.inf
+        omega = values.max() if n_drivers > 1 else -np.inf
+
+        old = assigned_slot[driver]
+        owner[old] = -1
+        owner[slot] = driver
+        assigned_slot[driver] = slot
+        prices[slot] = max(lam, omega - eps)
+        profits[driver] = benefit[driver, slot_garage[slot]] - prices[slot]
+        if prices[old] > lam:
+            queue.append(old)
+
+def _cheapest_slots(prices, slot_garage, slot_starts, capacity):
+    """Slots sorted by (garage, price), plus each garage's lowest and second-lowest price"""
+    slot_order = np.lexsort((prices, slot_garage))
+    lowest = prices[slot_order[slot_starts]]
+    second = np.full(len(capacity), np.inf)
+    has_two = capacity > 1
+    second[has_two] = prices[slot_order[slot_starts[has_two] + 1]]
+    return slot_order, lowest, second
+
+def _out_of_balance(benefit, slot_garage, prices, assigned_slot, lowest, eps):
+    """Drivers whose best garage is worth more than eps above their own slot"""
+    drivers = np.arange(len(assigned_slot))
+    profits = benefit[drivers, slot_garage[assigned_slot]] - prices[assigned_slot]
+    return (benefit - lowest).max(axis=1) > profits + eps
+
+def assign_auction(costs, capacity, eps: float = EPSILON, max_rounds: int = MAX_AUCTION_ROUNDS,
+                   candidates: int = AUCTION_CANDIDATES, time_budget: float = None):
+    """
+    Min-total-cost assignment with garage capacities (Jacobi auction)
+
+    Every garage is expanded into capacity slots that carry their own
+    price. Each round, all unassigned drivers bid at once for their best
+    garage; a garage hands its cheapest slots to its highest bidders.
+    Bid increments shrink from EPSILON_START down to eps (epsilon
+    scaling), which avoids long bidding wars between near-equal garages.
+    A virtual "unassigned" garage with UNASSIGNED_COST keeps the auction
+    finite; when there are fewer slots than drivers, the slots bid for
+    drivers instead (same optimum, no price war for the last slots).
+
+    Drivers only bid among their `candidates` cheapest garages; if the
+    result is not eps-optimal over all garages, the list is doubled and
+    the out-of-balance drivers bid again. The total cost ends up within
+    n_drivers * eps of the optimum.
+
+    Everyone wanting the same few garages (a storm) can take thousands
+    of rounds; time_budget (seconds) bounds the wall time.
+
+    Returns:
+        garage index per driver (-1 = unassigned), or None if the
+        auction did not finish within max_rounds / time_budget
+    """
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    costs = np.asarray(costs, dtype=np.float64)
+    n_drivers, n_garages = costs.shape
+    capacity = np.minimum(np.asarray(capacity, dtype=np.int64).clip(min=0), n_drivers)
+
+    n_slots = int(capacity.sum())
+    if n_slots < n_drivers:
+        # Over-subscribed: every slot will be filled (a slot costs less than
+        # UNASSIGNED_COST), so let the slots bid for drivers instead. Drivers
+        # competing for too few slots would otherwise raise prices eps by eps
+        # all the way up to UNASSIGNED_COST.
+        assignment = np.full(n_drivers, -1, dtype=np.int64)
+        if n_slots == 0:
+            return assignment
+        slot_garage = np.repeat(np.arange(n_garages), capacity)
+        chosen = assign_auction(costs.T[slot_garage], np.ones(n_drivers, dtype=np.int64),
+                                eps, max_rounds, candidates, time_budget)
+        if chosen is None:
+            return None
+        filled = chosen >= 0
+        assignment[chosen[filled]] = slot_garage[filled]
+        return assignment
+
+    # Column n_garages is the virtual garage (room for everyone)
+    capacity = np.append(capacity, n_drivers)
+    open_garages = np.flatnonzero(capacity > 0)
+    benefit = -np.column_stack([costs, np.full(n_drivers, UNASSIGNED_COST)])[:, open_garages]
+    capacity = capacity[open_garages]
+    n_open = len(open_garages)
+    virtual = n_open - 1
+
+    slot_garage = np.repeat(np.arange(n_open), capacity)
+    slot_starts = np.concatenate(([0], np.cumsum(capacity)[:-1]))
+    prices = np.zeros(len(slot_garage))
+    owner = np.full(len(slot_garage), -1, dtype=np.int64)
+    assigned_slot = np.full(n_drivers, -1, dtype=np.int64)
+
+    # Enough candidates that a crowd around one spot can still be spread
+    mean_capacity = max(capacity[:virtual].mean(), 1.0) if virtual else 1.0
+    n_candidates = min(max(candidates, int(2 * n_drivers / mean_capacity)), n_open)
+    phase_eps = max(EPSILON_START, eps)
+    rounds = 0
+
+    while True:
+        # Candidate garages per driver (always including the virtual one)
+        if n_candidates < n_open:
+            nearest = np.argpartition(-benefit[:, :virtual], n_candidates - 2, axis=1)[:, :n_candidates - 1]
+            cand = np.column_stack([nearest, np.full(n_drivers, virtual)])
+        else:
+            cand = np.broadcast_to(np.arange(n_open), (n_drivers, n_open))
+        cand_benefit = np.take_along_axis(benefit, cand, axis=1)
+
+        while True:
+            while True:
+                bidders = np.flatnonzero(assigned_slot < 0)
+                if len(bidders) == 0:
+                    break
+                rounds += 1
+                if rounds > max_rounds or deadline is not None and time.perf_counter() > deadline:
+                    return None
+
+                slot_order, lowest, second = _cheapest_slots(prices, slot_garage, slot_starts, capacity)
+                values = cand_benefit[bidders] - lowest[cand[bidders]]
+                rows = np.arange(len(bidders))
+                best_local = values.argmax(axis=1)
+                best = cand[bidders, best_local]
+                v1 = values[rows, best_local]
+
+                # Runner-up: best other garage, or the next slot of the same garage
+                values[rows, best_local] = -np.inf
+                v2 = np.maximum(benefit[bidders, best] - second[best], values.max(axis=1))
+                v2 = np.where(np.isfinite(v2), v2, v1)
+                bids = lowest[best] + (v1 - v2) + phase_eps
+
+                # Per garage: highest bid takes the cheapest slot, and so on
+                order = np.lexsort((-bids, best))
+                garages, bids, bidders = best[order], bids[order], bidders[order]
+                group_start = np.flatnonzero(np.r_[True, garages[1:] != garages[:-1]])
+                rank = np.arange(len(order)) - np.repeat(group_start, np.diff(np.r_[group_start, len(order)]))
+
+                fits = rank < capacity[garages]
+                garages, bids, bidders, rank = garages[fits], bids[fits], bidders[fits], rank[fits]
+                slots = slot_order[slot_starts[garages] + rank]
+                wins = bids > prices[slots]
+                slots, bids, winners = slots[wins], bids[wins], bidders[wins]
+
+                outbid = owner[slots]
+                assigned_slot[outbid[outbid >= 0]] = -1
+                owner[slots] = winners
+                assigned_slot[winners] = slots
+                prices[slots] = bids
+
+            if phase_eps <= eps:
+                break
+            # Next phase: only drivers that are not eps-happy bid again
+            phase_eps = max(phase_eps / EPSILON_FACTOR, eps)
+            lowest = _cheapest_slots(prices, slot_garage, slot_starts, capacity)[1]
+            unhappy = _out_of_balance(benefit, slot_garage, prices, assigned_slot, lowest, phase_eps)
+            owner[assigned_slot[unhappy]] = -1
+            assigned_slot[unhappy] = -1
+
+        _reverse_auction(benefit, slot_garage, prices, owner, assigned_slot, eps)
+
+        lowest = _cheapest_slots(prices, slot_garage, slot_starts, capacity)[1]
+        unhappy = _out_of_balance(benefit, slot_garage, prices, assigned_slot, lowest, eps)
+        if not unhappy.any():
+            break
+        n_candidates = min(2 * n_candidates, n_open)
+        owner[assigned_slot[unhappy]] = -1
+        assigned_slot[unhappy] = -1
+
+    garage = open_garages[slot_garage[assigned_slot]]
+    return np.where(garage == n_garages, -1, garage)
+
+def assign_greedy(costs, capacity):
+    """
+    Fast capacity-respecting assignment for very large batches
+
+    Drivers who would lose most by missing their best garage (largest
+    gap to their second best) pick first.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    n_drivers, n_garages = costs.shape
+    remaining = np.asarray(capacity, dtype=np.int64).clip(min=0).copy()
+    assignment = np.full(n_drivers, -1, dtype=np.int64)
+    if n_garages == 0:
+        return assignment
+
+    if n_garages > 1:
+        two_best = np.partition(costs, 1, axis=1)[:, :2]
+        regret = two_best[:, 1] - two_best[:, 0]
+    else:
+        regret = np.zeros(n_drivers)
+
+    full = remaining <= 0
+    for driver in np.argsort(-regret, kind="stable"):
+        row = np.where(full, np.inf, costs[driver])
+        garage = int(row.argmin())
+        if not np.isfinite(row[garage]):
+            break
+        assignment[driver] = garage
+        remaining[garage] -= 1
+        full[garage] = remaining[garage] <= 0
+    return assignment
+
+class AssignmentResult:
+    """
+    assignment: garage index per driver (-1 = no capacity left)
+    regret:     assigned score - driver's own best score (0 = got their best)
+    """
+
+    def __init__(self, assignment, costs, method: str):
+        self.assignment = assignment
+        self.method = method
+        served = assignment >= 0
+        rows = np.flatnonzero(served)
+        self.costs = np.full(len(assignment), np.nan)
+        self.costs[rows] = costs[rows, assignment[rows]]
+        self.regret = self.costs - costs.min(axis=1, initial=np.inf)
+        self.total_cost = float(self.costs[served].sum())
+        self.unassigned = int((~served).sum())
+
+    def load(self, n_garages: int) -> np.ndarray:
+        """Drivers sent to every garage"""
+        return np.bincount(self.assignment[self.assignment >= 0], minlength=n_garages)
+
+def assign_drivers(costs, capacity, method: str = "auto") -> AssignmentResult:
+    """
+    Assign every driver to one garage, at most capacity[g] drivers per garage
+
+    method: "auction", "greedy" or "auto" (auction unless the batch is
+    larger than MAX_AUCTION_CELLS or the auction does not converge
+    within AUCTION_TIME_BUDGET_S)
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    if method not in ("auto", "auction", "greedy"):
+        raise ValueError(f"Unknown assignment method: {method}")
+
+    if method != "greedy" and (method == "auction" or costs.size <= MAX_AUCTION_CELLS):
+        assignment = assign_auction(costs, capacity,
+                                    time_budget=None if method == "auction" else AUCTION_TIME_BUDGET_S)
+        if assignment is not None:
+            return AssignmentResult(assignment, costs, "auction")
+        if method == "auction":
+            raise RuntimeError("Auction did not converge")
+    return AssignmentResult(assign_greedy(costs, capacity), costs, "greedy")
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import time
+    from garage_store import GarageStore
+
+    print("="*70)
+    print("🧪 TESTING BATCH ASSIGNMENT")
+    print("="*70)
+
+    rng = np.random.default_rng(0)
+    n_garages, n_drivers = 2000, 1000
+    store = GarageStore([f"Garage {i:04d}" for i in range(n_garages)], {
+        'lat': rng.uniform(6.85, 6.98, n_garages),
+        'lon': rng.uniform(79.90, 80.05, n_garages),
+        'busy': rng.random(n_garages) < 0.5,
+        'distance': np.full(n_garages, np.nan),
+        'waiting': rng.choice([0, 15, 30], n_garages),
+        'arrival': np.full(n_garages, np.nan),
+        'rating': rng.uniform(3.0, 5.0, n_garages).round(1),
+        'mechanics': rng.integers(1, 6, n_garages),
+    })
+
+    # Incident: every driver within ~1 km of one junction
+    driver_lats = 6.914833 + rng.normal(0, 0.005, n_drivers)
+    driver_lons = 79.972861 + rng.normal(0, 0.005, n_drivers)
+
+    start = time.perf_counter()
+    costs = assignment_costs(driver_lats, driver_lons, store)
+    cost_ms = (time.perf_counter() - start) * 1000
+
+    for method in ("auction", "greedy"):
+        start = time.perf_counter()
+        result = assign_drivers(costs, store['mechanics'], method)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n  {method:<8} {elapsed:7.1f} ms   total score {result.total_cost:.3f}   "
+              f"mean regret {np.nanmean(result.regret):.4f}   unassigned {result.unassigned}")
+        assert (result.load(n_garages) <= store['mechanics']).all()
+
+    everyone_best = np.bincount(costs.argmin(axis=1), minlength=n_garages)
+    print(f"\n  Without assignment the busiest garage would get {everyone_best.max()} drivers "
+          f"(cost matrix {cost_ms:.0f} ms)")
+
+    # Storm: more drivers than mechanics in the nearest garages
+    small = store.subset(np.argsort(costs[0])[:40])
+    capacity = small['mechanics']
+    storm_costs = assignment_costs(driver_lats[:300], driver_lons[:300], small)
+    start = time.perf_counter()
+    result = assign_drivers(storm_costs, capacity, "auction")
+    elapsed = (time.perf_counter() - start) * 1000
+    greedy = assign_drivers(storm_costs, capacity, "greedy")
+    assert (result.load(len(small)) == capacity).all()
+    assert result.unassigned == 300 - capacity.sum()
+    assert result.total_cost <= greedy.total_cost + 1e-9
+    print(f"  Over-subscribed: 300 drivers, {capacity.sum()} mechanics -> auction {elapsed:.1f} ms, "
+          f"total score {result.total_cost:.3f} (greedy {greedy.total_cost:.3f})")
+
+    # Tiny over-subscribed batches against brute force
+    import itertools
+    for _ in range(100):
+        tiny = rng.random((int(rng.integers(2, 7)), int(rng.integers(1, 4))))
+        tiny_capacity = rng.integers(0, 3, tiny.shape[1])
+        got = assign_drivers(tiny, tiny_capacity, "auction").assignment
+        best = min(sum(tiny[d, g] if g >= 0 else UNASSIGNED_COST for d, g in enumerate(a))
+                   for a in itertools.product(range(-1, tiny.shape[1]), repeat=len(tiny))
+                   if (np.bincount([g for g in a if g >= 0], minlength=tiny.shape[1]) <= tiny_capacity).all())
+        cost = sum(tiny[d, g] if g >= 0 else UNASSIGNED_COST for d, g in enumerate(got))
+        assert cost <= best + len(tiny) * EPSILON
+    print("  ✅ 100 small over-subscribed batches: auction matches brute force")
+
+    # Storm: 1000 drivers all preferring the same garages (capacity 1) - "auto"
+    # must stay well under a second, falling back to greedy if needed
+    storm = rng.uniform(0, 1, 2000)[None, :] + rng.uniform(0, 0.05, (1000, 2000))
+    start = time.perf_counter()
+    result = assign_drivers(storm, np.ones(2000, dtype=np.int64))
+    elapsed = time.perf_counter() - start
+    assert elapsed < 1.0 and result.unassigned == 0 and (result.load(2000) <= 1).all()
+    print(f"  ⏱️  1000 x 2000 storm: {result.method} in {elapsed * 1000:.0f} ms, total score {result.total_cost:.3f}")
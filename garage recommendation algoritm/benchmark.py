@@ -0,0 +1,270 @@
+# benchmark.py - Latency / throughput / memory benchmark of the ranking pipeline
+
+import argparse
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+from garage_recommendation_algorithm import calculate_scores, display_ranking, normalize_values
+from garage_registry import GarageRegistry, DEFAULT_RADIUS_KM
+from garage_store import GarageStore
+from geo_utils import DRIVER_LOCATION
+from scoring_engine import CITY_SPEED_KPH
+from top_k import TOP_K
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+QUERIES = 200                    # Driver requests timed per size
+BUILD_STAGES = ("load", "index")           # Timed once per size
+STAGES = ("discovery", "normalize", "score", "rank")    # Timed per driver request
+REGRESSION_TOLERANCE = 0.20      # Flag p95 more than 20% above the baseline
+MIN_REGRESSION_MS = 0.05         # Ignore differences below timer noise
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Synthetic garages are spread over the Western Province around Malabe
+REGION_HALF_DEG = 0.3            # ~33 km each way
+
+# ============================================
+# SYNTHETIC GARAGES (modelled on garages.txt)
+# ============================================
+
+def synthetic_store(n: int, seed: int = 0) -> GarageStore:
+    """
+    n garages with the same value ranges as garages.txt
+
+    Busy/Available at random, waiting 0/15/30 min when busy, ratings
+    3.0-5.0, 1-5 mechanics with 2-14 years of experience each.
+    """
+    rng = np.random.default_rng(seed)
+    lat0, lon0 = DRIVER_LOCATION
+
+    busy = rng.random(n) < 0.5
+    mechanics = rng.integers(1, 6, n)
+    offsets = np.concatenate(([0], np.cumsum(mechanics)))
+
+    return GarageStore(
+        [f"Garage {i:07d}" for i in range(n)],
+        {
+            'lat': lat0 + rng.uniform(-REGION_HALF_DEG, REGION_HALF_DEG, n),
+            'lon': lon0 + rng.uniform(-REGION_HALF_DEG, REGION_HALF_DEG, n),
+            'busy': busy,
+            'distance': np.full(n, np.nan),
+            'waiting': np.where(busy, rng.choice([0, 15, 30], n), 0),
+            'arrival': np.full(n, np.nan),
+            'rating': rng.uniform(3.0, 5.0, n).round(1),
+            'mechanics': mechanics,
+        },
+        offsets,
+        rng.integers(2, 15, offsets[-1]),
+    )
+
+# ============================================
+# PIPELINE (one driver request, stage by stage)
+# ============================================
+
+def _peak_since(base: int) -> int:
+    """Traced peak memory (bytes) above base since the last reset, then reset it"""
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.reset_peak()
+    return peak
+
+def run_request(registry, store, lat, lon, timings=None, peaks=None):
+    """
+    discovery -> normalize (normalize_values) -> score (calculate_scores)
+    -> rank (display_ranking) for one driver
+
+    Appends the duration (s) of every stage to timings[stage]. With
+    tracemalloc running, peaks[stage] is set to the peak memory (bytes)
+    of every stage above the memory held when the request started.
+    """
+    base = tracemalloc.get_traced_memory()[0] if peaks is not None else 0
+    if peaks is not None:
+        tracemalloc.reset_peak()
+
+    t0 = time.perf_counter()
+    indices, distances, _ = registry.discover(lat, lon, k=TOP_K, radius_km=DEFAULT_RADIUS_KM)
+    # Candidates as the garage dicts the interactive algorithm takes
+    garages = store.to_garages(indices)
+    for garage, distance in zip(garages, distances.tolist()):
+        garage['distance'] = distance
+        garage['arrival'] = distance / CITY_SPEED_KPH * 60
+    t1 = time.perf_counter()
+    if peaks is not None:
+        peaks["discovery"] = _peak_since(base)
+
+    maxima = normalize_values(garages)
+    t2 = time.perf_counter()
+    if peaks is not None:
+        peaks["normalize"] = _peak_since(base)
+
+    results = calculate_scores(garages, *maxima)
+    t3 = time.perf_counter()
+    if peaks is not None:
+        peaks["score"] = _peak_since(base)
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        display_ranking(results, TOP_K)
+    t4 = time.perf_counter()
+    if peaks is not None:
+        peaks["rank"] = _peak_since(base)
+
+    if timings is not None:
+        for stage, duration in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+            timings[stage].append(duration)
+    return results, len(indices)
+
+def _percentiles(samples_s) -> dict:
+    ms = np.asarray(samples_s) * 1000
+    return {"p50": float(np.percentile(ms, 50)),
+            "p95": float(np.percentile(ms, 95)),
+            "p99": float(np.percentile(ms, 99))}
+
+def benchmark_size(n: int, queries: int = QUERIES, seed: int = 0) -> dict:
+    """All measurements for one garage count"""
+    rng = np.random.default_rng(seed + 1)
+    lat0, lon0 = DRIVER_LOCATION
+    drivers = np.column_stack([lat0 + rng.uniform(-0.2, 0.2, queries),
+                               lon0 + rng.uniform(-0.2, 0.2, queries)])
+
+    # Build (timed once) and the peak memory of each build stage
+    peaks = {}
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = synthetic_store(n, seed)
+    peaks["load"] = _peak_since(0)
+    base = tracemalloc.get_traced_memory()[0]
+    registry = GarageRegistry.from_store(store)
+    build_s = time.perf_counter() - start
+    peaks["index"] = _peak_since(base)
+
+    # Peak memory of each request stage (tracing slows it, so not timed)
+    run_request(registry, store, *drivers[0], peaks=peaks)
+    tracemalloc.stop()
+
+    run_request(registry, store, *drivers[0])       # warm-up
+    timings = {stage: [] for stage in STAGES}
+    candidates = []
+    start = time.perf_counter()
+    for lat, lon in drivers:
+        candidates.append(run_request(registry, store, lat, lon, timings)[1])
+    total_s = time.perf_counter() - start
+
+    totals = np.sum([timings[stage] for stage in STAGES], axis=0)
+    return {
+        "garages": n,
+        "mean_candidates": float(np.mean(candidates)),
+        "build_s": build_s,
+        "peak_mb": {stage: peaks[stage] / 2**20 for stage in BUILD_STAGES + STAGES},
+        "throughput_rps": queries / total_s,
+        "stages": {stage: _percentiles(timings[stage]) for stage in STAGES},
+        "total": _percentiles(totals),
+    }
+
+# ============================================
+# BASELINE & REGRESSIONS
+# ============================================
+
+def save_baseline(results: list, path: str = BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created": time.strftime("%Y-%m-%d %H:%M:%S"), "results": results}, f, indent=2)
+
+def load_baseline(path: str = BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def find_regressions(results: list, baseline: dict, tolerance: float = REGRESSION_TOLERANCE) -> list:
+    """
+    Stages whose p95 grew by more than tolerance against the baseline
+
+    Returns:
+        ["100000 garages / scoring p95: 0.41 ms -> 0.63 ms (+54%)", ...]
+    """
+    previous = {r["garages"]: r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get(result["garages"])
+        if old is None:
+            continue
+        # Stages the baseline did not measure yet are skipped
+        pairs = [(stage, result["stages"][stage], old["stages"][stage])
+                 for stage in STAGES if stage in old["stages"]]
+        pairs.append(("total", result["total"], old["total"]))
+        for stage, new_p, old_p in pairs:
+            new_ms, old_ms = new_p["p95"], old_p["p95"]
+            if new_ms > old_ms * (1 + tolerance) and new_ms - old_ms > MIN_REGRESSION_MS:
+                # A 0 ms baseline (below timer resolution) has no ratio
+                growth = f"+{(new_ms / old_ms - 1) * 100:.0f}%" if old_ms > 0 else "from 0"
+                regressions.append(f"{result['garages']} garages / {stage} p95: "
+                                   f"{old_ms:.3f} ms -> {new_ms:.3f} ms ({growth})")
+    return regressions
+
+# ============================================
+# REPORT
+# ============================================
+
+def print_report(results: list):
+    columns = STAGES + ("total",)
+    print(f"\n{'Garages':>10}{'Cand.':>9}" + "".join(f"{s + ' p50/p95/p99 ms':>27}" for s in columns)
+          + f"{'Req/s':>10}")
+    print("─" * 154)
+    for r in results:
+        percentiles = [r["total"] if s == "total" else r["stages"][s] for s in columns]
+        print(f"{r['garages']:>10,}{r['mean_candidates']:>9.0f}"
+              + "".join(f"{p['p50']:>11.3f}/{p['p95']:.3f}/{p['p99']:.3f}".rjust(27) for p in percentiles)
+              + f"{r['throughput_rps']:>10.0f}")
+    print("─" * 154)
+
+    print(f"\n{'Garages':>10}" + "".join(f"{s + ' peak MB':>18}" for s in BUILD_STAGES + STAGES))
+    print("─" * 118)
+    for r in results:
+        print(f"{r['garages']:>10,}" + "".join(f"{r['peak_mb'][s]:>18.3f}" for s in BUILD_STAGES + STAGES))
+    print("─" * 118)
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the garage ranking pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--queries", type=int, default=QUERIES)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    args = parser.parse_args()
+
+    print("="*70)
+    print("⏱️  GARAGE RANKING BENCHMARK")
+    print("="*70)
+
+    results = []
+    for n in args.sizes:
+        print(f"  • {n:,} garages ...", flush=True)
+        results.append(benchmark_size(n, args.queries))
+    print_report(results)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+    else:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print("\nℹ️  No baseline yet (run with --save-baseline)")
+        else:
+            regressions = find_regressions(results, baseline, args.tolerance)
+            if regressions:
+                print(f"\n⚠️  {len(regressions)} regression(s) against baseline of {baseline['created']}:")
+                for line in regressions:
+                    print(f"  - {line}")
+                raise SystemExit(1)
+            print(f"\n✅ No regressions against baseline of {baseline['created']}")
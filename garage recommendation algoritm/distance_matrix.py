@@ -0,0 +1,161 @@
+# distance_matrix.py - Vectorized driver -> garage great-circle distances
+
+from collections import OrderedDict
+
+import numpy as np
+
+from geo_utils import EARTH_RADIUS_KM, haversine_km, geohash_encode, geohash_decode
+from scoring_engine import CRITERIA
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+# Precision 8 cells are ~38 m x 19 m, so reusing the cell centre's
+# distances shifts any distance by at most ~21 m.
+DISTANCE_CELL_PRECISION = 8
+DISTANCE_CACHE_SIZE = 4096      # Origin cells kept in memory
+BLOCK_ROWS = 512                # Drivers per block in matrix()
+
+DISTANCE_COLUMN = CRITERIA.index("distance")
+
+# ============================================
+# HELPERS
+# ============================================
+
+def _unit_vectors(lats, lons) -> np.ndarray:
+    """Points on the unit sphere, shape (N, 3)"""
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+def set_distance_column(features: np.ndarray, distances) -> np.ndarray:
+    """Copy of an N x 5 feature matrix with the distance column filled in"""
+    features = np.array(features, dtype=np.float64)
+    features[:, DISTANCE_COLUMN] = distances
+    return features
+
+# ============================================
+# GARAGE DISTANCES
+# ============================================
+
+class GarageDistances:
+    """
+    Distances from drivers to a fixed set of garages
+
+    from_point() uses haversine and memoises the result per geohash cell
+    of the origin (requests cluster around places like SLIIT Malabe).
+    matrix() handles many drivers at once with a matrix product of unit
+    vectors (chord length -> arc length), in blocks to bound memory.
+    """
+
+    def __init__(self, lats, lons, cell_precision: int = DISTANCE_CELL_PRECISION,
+                 cache_size: int = DISTANCE_CACHE_SIZE):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.cell_precision = cell_precision
+        self.cache_size = cache_size
+
+        self._units = _unit_vectors(self.lats, self.lons)
+        self._cache = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        """Build from a GarageStore (uses its lat/lon columns)"""
+        return cls(store['lat'], store['lon'], **kwargs)
+
+    def __len__(self):
+        return len(self.lats)
+
+    # ----------------------------------------
+    # One driver
+    # ----------------------------------------
+
+    def from_point(self, lat: float, lon: float, exact: bool = False) -> np.ndarray:
+        """
+        Distance (km) from one driver to every garage
+
+        Cached per origin cell unless exact=True. The returned array is
+        shared with the cache - copy it before modifying.
+        """
+        if exact:
+            return haversine_km(lat, lon, self.lats, self.lons)
+
+        cell = geohash_encode(lat, lon, self.cell_precision)
+        distances = self._cache.get(cell)
+        if distances is not None:
+            self.stats["hits"] += 1
+            self._cache.move_to_end(cell)
+            return distances
+
+        self.stats["misses"] += 1
+        centre_lat, centre_lon = geohash_decode(cell)
+        distances = haversine_km(centre_lat, centre_lon, self.lats, self.lons)
+        distances.flags.writeable = False
+
+        self._cache[cell] = distances
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return distances
+
+    # ----------------------------------------
+    # Many drivers
+    # ----------------------------------------
+
+    def iter_blocks(self, driver_lats, driver_lons, block_rows: int = BLOCK_ROWS, dtype=np.float32):
+        """
+        Yield (start_row, block) with block = distances of block_rows drivers
+
+        Computed in float64 (small distances need it), returned as dtype.
+        """
+        drivers = _unit_vectors(driver_lats, driver_lons)
+        for start in range(0, len(drivers), block_rows):
+            dots = drivers[start:start + block_rows] @ self._units.T
+            # |p - q| = sqrt(2 - 2 p.q); arc = 2 R asin(|p - q| / 2)
+            np.clip((1.0 - dots) / 2.0, 0.0, 1.0, out=dots)
+            np.sqrt(dots, out=dots)
+            np.arcsin(dots, out=dots)
+            dots *= 2 * EARTH_RADIUS_KM
+            yield start, dots.astype(dtype, copy=False)
+
+    def matrix(self, driver_lats, driver_lons, block_rows: int = BLOCK_ROWS, dtype=np.float32) -> np.ndarray:
+        """D x N matrix of distances (km) from every driver to every garage"""
+        out = np.empty((len(np.atleast_1d(driver_lats)), len(self)), dtype=dtype)
+        for start, block in self.iter_blocks(driver_lats, driver_lons, block_rows, dtype):
+            out[start:start + len(block)] = block
+        return out
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import time
+    from geo_utils import DRIVER_LOCATION
+
+    print("="*70)
+    print("🧪 TESTING DISTANCE MATRIX")
+    print("="*70)
+
+    rng = np.random.default_rng(0)
+    n = 10_000
+    garages = GarageDistances(rng.uniform(5.9, 9.8, n), rng.uniform(79.6, 81.9, n))
+    driver_lats = rng.uniform(6.8, 7.0, n)
+    driver_lons = rng.uniform(79.8, 80.0, n)
+
+    start = time.perf_counter()
+    matrix = garages.matrix(driver_lats, driver_lons)
+    elapsed = time.perf_counter() - start
+
+    check = haversine_km(driver_lats[:50, None], driver_lons[:50, None], garages.lats, garages.lons)
+    print(f"\n  ⏱️  {n:,} drivers x {n:,} garages: {elapsed:.2f}s")
+    print(f"  Max difference vs haversine: {np.abs(matrix[:50] - check).max() * 1000:.2f} m")
+
+    lat, lon = DRIVER_LOCATION
+    garages.from_point(lat, lon)
+    garages.from_point(lat + 0.00005, lon)
+    exact = garages.from_point(lat, lon, exact=True)
+    cached = garages.from_point(lat, lon)
+    print(f"  Cell cache error: {np.abs(exact - cached).max() * 1000:.1f} m   📊 {garages.stats}")
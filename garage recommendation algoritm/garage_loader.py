@@ -0,0 +1,447 @@
+# garage_loader.py - Bulk, validated garage loading (CSV / JSON Lines / garages.txt)
+
+import csv
+import gc
+import json
+import os
+import re
+from contextlib import contextmanager
+from itertools import compress, islice
+
+import numpy as np
+
+from garage_store import GarageStore
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+CHUNK_ROWS = 65_536          # Rows parsed and validated together
+MAX_REPORTED_ERRORS = 100    # Bad rows kept in the report (all are counted)
+
+# CSV / JSONL field names
+#   name, lat, lon, status (Busy/Available), waiting, distance, arrival,
+#   rating, mechanics, experience ("7;9" in CSV, [7, 9] in JSONL)
+FIELDS = ("name", "lat", "lon", "status", "waiting", "distance",
+          "arrival", "rating", "mechanics", "experience")
+REQUIRED_FIELDS = ("lat", "lon", "waiting", "rating", "mechanics")
+OPTIONAL_FIELDS = ("distance", "arrival")     # NaN until computed for a driver
+
+# Stored as int16 by GarageStore, so both are bounded
+MAX_MECHANICS = 100
+MAX_EXPERIENCE_YEARS = 80
+
+# ============================================
+# RECORD READERS (chunks of raw columns)
+# ============================================
+
+@contextmanager
+def _gc_paused():
+    """
+    Pause the cyclic garbage collector while a chunk is built
+
+    Parsing allocates hundreds of thousands of short-lived lists/tuples,
+    which would otherwise trigger constant (and useless) GC passes.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def _records_to_columns(records) -> dict:
+    return {field: [r.get(field) for r in records] for field in FIELDS}
+
+def _read_csv(path, chunk_rows, report):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader)]
+        positions = {field: header.index(field) for field in FIELDS if field in header}
+        width = len(header)
+
+        while True:
+            first_line = reader.line_num + 1
+            with _gc_paused():
+                rows = list(islice(reader, chunk_rows))
+            if not rows:
+                return
+
+            # Line numbers assume one line per row (no quoted newlines)
+            line_nos = range(first_line, first_line + len(rows))
+            widths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+            if (widths != width).any():
+                for i in np.flatnonzero(widths != width):
+                    if widths[i]:
+                        report.reject(line_nos[i], f"expected {width} columns, got {widths[i]}")
+                line_nos = [line_nos[i] for i in np.flatnonzero(widths == width)]
+                rows = [row for row in rows if len(row) == width]
+                if not rows:
+                    continue
+
+            with _gc_paused():
+                columns = _csv_columns(rows, positions)
+            yield line_nos, columns
+
+def _csv_columns(rows, positions) -> dict:
+    """Transpose rows into columns (tuples of strings)"""
+    transposed = list(zip(*rows))
+    empty = ("",) * len(rows)
+    return {field: (transposed[positions[field]] if field in positions else empty)
+            for field in FIELDS}
+
+def _read_jsonl(path, chunk_rows, report):
+    with open(path, encoding="utf-8") as f:
+        line_nos, records = [], []
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                report.reject(line_no, f"invalid JSON: {e.msg}")
+                continue
+            if not isinstance(record, dict):
+                report.reject(line_no, "expected a JSON object")
+                continue
+            line_nos.append(line_no)
+            records.append(record)
+
+            if len(records) >= chunk_rows:
+                yield line_nos, _records_to_columns(records)
+                line_nos, records = [], []
+
+        if records:
+            yield line_nos, _records_to_columns(records)
+
+# garages.txt layout, e.g.
+#   Garage 01 : Location  6.917808, 79.972542 |  Busy (waiting time = 15min) | Distance : 500m
+#               | User ratings : 3.2/5 |2 Mechanics with 7yrs, 9yrs experience | Arrival Time : 2 min
+_TXT_GARAGE = re.compile(r"^\s*(Garage \d+)\s*:", re.IGNORECASE)
+_TXT_FIELDS = {
+    "location": re.compile(r"Location\s+(-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?)", re.IGNORECASE),
+    "status": re.compile(r"\b(Busy|Available)\b", re.IGNORECASE),
+    "waiting": re.compile(r"waiting time\s*=\s*(\d+(?:\.\d+)?)\s*min", re.IGNORECASE),
+    "distance": re.compile(r"Distance\s*:\s*(\d+(?:\.\d+)?)\s*(km|m)\b", re.IGNORECASE),
+    "rating": re.compile(r"ratings?\s*:\s*(\d+(?:\.\d+)?)\s*/\s*5", re.IGNORECASE),
+    "mechanics": re.compile(r"(\d+)\s*Mechanics?\s+with\s+(.*?)experience", re.IGNORECASE),
+    "arrival": re.compile(r"Arrival Time\s*:\s*(\d+(?:\.\d+)?)\s*min", re.IGNORECASE),
+}
+
+def _parse_txt_block(name: str, text: str) -> dict:
+    record = {"name": name}
+    fields = {key: pattern.search(text) for key, pattern in _TXT_FIELDS.items()}
+
+    if fields["location"]:
+        record["lat"], record["lon"] = fields["location"].groups()
+    if fields["status"]:
+        record["status"] = fields["status"].group(1)
+    if fields["waiting"]:
+        record["waiting"] = fields["waiting"].group(1)
+    if fields["distance"]:
+        value, unit = fields["distance"].groups()
+        record["distance"] = float(value) / 1000 if unit.lower() == "m" else float(value)
+    if fields["rating"]:
+        record["rating"] = fields["rating"].group(1)
+    if fields["mechanics"]:
+        record["mechanics"] = fields["mechanics"].group(1)
+        record["experience"] = re.findall(r"(\d+)\s*yrs?", fields["mechanics"].group(2), re.IGNORECASE)
+    if fields["arrival"]:
+        record["arrival"] = fields["arrival"].group(1)
+
+    return record
+
+def _read_txt(path, chunk_rows, report):
+    def blocks():
+        with open(path, encoding="utf-8") as f:
+            name, start_line, block = None, 0, []
+            for line_no, line in enumerate(f, 1):
+                match = _TXT_GARAGE.match(line)
+                if match:
+                    if name:
+                        yield start_line, _parse_txt_block(name, " ".join(block))
+                    name, start_line, block = match.group(1), line_no, []
+                if name:
+                    block.append(line.strip())
+            if name:
+                yield start_line, _parse_txt_block(name, " ".join(block))
+
+    line_nos, records = [], []
+    for line_no, record in blocks():
+        line_nos.append(line_no)
+        records.append(record)
+        if len(records) >= chunk_rows:
+            yield line_nos, _records_to_columns(records)
+            line_nos, records = [], []
+    if records:
+        yield line_nos, _records_to_columns(records)
+
+READERS = {
+    ".csv": _read_csv,
+    ".jsonl": _read_jsonl,
+    ".ndjson": _read_jsonl,
+    ".txt": _read_txt,
+}
+
+# ============================================
+# VALIDATION (one chunk at a time, vectorized)
+# ============================================
+
+def _safe_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _is_text(values) -> bool:
+    """CSV columns are tuples of strings; JSON/txt columns are lists of objects"""
+    return isinstance(values, tuple)
+
+def _as_text(values) -> list:
+    """Raw column -> stripped strings ("" for missing)"""
+    if _is_text(values):
+        return [v.strip() for v in values]
+    return ["" if v is None else str(v).strip() for v in values]
+
+def _float_column(values) -> tuple:
+    """(floats, missing_mask, unparsable_mask) for one raw column; inf/nan are unparsable"""
+    if _is_text(values):
+        if not any(values):
+            # Whole column empty (e.g. distance before it is computed)
+            return np.full(len(values), np.nan), np.ones(len(values), dtype=bool), np.zeros(len(values), dtype=bool)
+        try:
+            floats = np.fromiter(map(float, values), dtype=np.float64, count=len(values))
+            missing = np.zeros(len(values), dtype=bool)
+        except ValueError:
+            # Empty or malformed cells somewhere in the chunk
+            text = np.array(_as_text(values), dtype=np.str_)
+            missing = text == ""
+            try:
+                floats = np.where(missing, "nan", text).astype(np.float64)
+            except ValueError:
+                floats = np.array([_safe_float(v) for v in text.tolist()], dtype=np.float64)
+    else:
+        missing = np.fromiter((v is None or v == "" for v in values), dtype=bool, count=len(values))
+        try:
+            floats = np.array([np.nan if m else v for v, m in zip(values, missing)], dtype=np.float64)
+        except (TypeError, ValueError):
+            floats = np.array([np.nan if m else _safe_float(v) for v, m in zip(values, missing)],
+                              dtype=np.float64)
+    unparsable = ~np.isfinite(floats) & ~missing
+    return floats, missing, unparsable
+
+def _experience_column(values) -> tuple:
+    """
+    Mechanic experience in CSR form: (counts, years, invalid_mask)
+
+    CSV cells look like "7;9" (or "7,9"), JSON values like [7, 9]. Rows
+    with a year that is not a number in 0-MAX_EXPERIENCE_YEARS are invalid.
+    """
+    n = len(values)
+    if _is_text(values):
+        counts = np.fromiter((v.count(";") + v.count(",") + 1 if v else 0 for v in values),
+                             dtype=np.int64, count=n)
+        try:
+            tokens = ";".join(filter(None, values)).replace(",", ";").split(";") if counts.any() else []
+            years = np.fromiter(map(float, tokens), dtype=np.float64, count=len(tokens))
+            if ((years >= 0) & (years <= MAX_EXPERIENCE_YEARS)).all():     # False for nan
+                return counts, years.astype(np.int16), np.zeros(n, dtype=bool)
+        except ValueError:
+            pass
+        # Some cell is malformed or out of range - parse row by row
+
+    counts = np.zeros(n, dtype=np.int64)
+    invalid = np.zeros(n, dtype=bool)
+    years = []
+    for i, value in enumerate(values):
+        if value is None or value == "":
+            continue
+        try:
+            parts = value.replace(",", " ").replace(";", " ").split() if isinstance(value, str) else value
+            row_years = [int(float(part)) for part in parts]      # int() rejects inf/nan
+        except (TypeError, ValueError, OverflowError):
+            invalid[i] = True
+            continue
+        if not all(0 <= year <= MAX_EXPERIENCE_YEARS for year in row_years):
+            invalid[i] = True
+            continue
+        counts[i] = len(row_years)
+        years.extend(row_years)
+    return counts, np.array(years, dtype=np.int16), invalid
+
+def validate_columns(columns: dict) -> tuple:
+    """
+    Validate a chunk of raw columns
+
+    Returns:
+        (values_by_column, bad_mask, reasons)
+        reasons maps the position of every bad row to a short message
+    """
+    n = len(columns["name"])
+    bad = np.zeros(n, dtype=bool)
+    reasons = {}
+
+    def reject(mask, message):
+        new = np.flatnonzero(mask & ~bad)
+        bad[new] = True
+        for i in new:
+            reasons[i] = message(i) if callable(message) else message
+
+    names = _as_text(columns["name"])
+    reject(~np.fromiter(map(bool, names), dtype=bool, count=n), "missing name")
+
+    values = {}
+    for field in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+        floats, missing, unparsable = _float_column(columns[field])
+        if field in REQUIRED_FIELDS:
+            reject(missing, f"missing '{field}'")
+        reject(unparsable, lambda i, f=field: f"invalid {f} '{columns[f][i]}'")
+        values[field] = floats
+
+    lat, lon = values["lat"], values["lon"]
+    reject((np.abs(lat) > 90) | (np.abs(lon) > 180), lambda i: f"invalid location ({lat[i]}, {lon[i]})")
+    reject(values["waiting"] < 0, lambda i: f"negative waiting time {values['waiting'][i]}")
+    reject((values["rating"] < 0) | (values["rating"] > 5), lambda i: f"rating {values['rating'][i]} outside 0-5")
+
+    mechanics = values["mechanics"]
+    reject((mechanics < 0) | (mechanics > MAX_MECHANICS) | (mechanics != np.floor(mechanics)),
+           lambda i: f"invalid mechanics count {mechanics[i]}")
+
+    status = [v.lower() or "available" for v in _as_text(columns["status"])]
+    busy = np.fromiter((v == "busy" for v in status), dtype=bool, count=n)
+    available = np.fromiter((v == "available" for v in status), dtype=bool, count=n)
+    reject(~busy & ~available, lambda i: f"unknown status '{status[i]}'")
+    values["busy"] = busy
+
+    counts, years, bad_experience = _experience_column(columns["experience"])
+    reject(bad_experience, lambda i: f"invalid experience '{columns['experience'][i]}'")
+    reject((counts > 0) & (counts != np.nan_to_num(mechanics)),
+           lambda i: f"{counts[i]} experience values for {int(mechanics[i])} mechanics")
+
+    values["names"] = names
+    values["experience_counts"] = counts
+    values["experience_years"] = years
+    return values, bad, reasons
+
+def validate_record(record: dict) -> dict:
+    """
+    Validate one garage record
+
+    Returns:
+        {'name': ..., 'lat': ..., ..., 'experience': [...]}
+
+    Raises:
+        ValueError with a short reason when the record is invalid
+    """
+    values, bad, reasons = validate_columns(_records_to_columns([record]))
+    if bad[0]:
+        raise ValueError(reasons[0])
+    garage = {key: values[key][0].item() for key in REQUIRED_FIELDS + OPTIONAL_FIELDS + ("busy",)}
+    garage["name"] = values["names"][0]
+    garage["mechanics"] = int(garage["mechanics"])
+    garage["experience"] = values["experience_years"].tolist()
+    return garage
+
+def _chunk_to_store(values, keep) -> GarageStore:
+    columns = {key: values[key][keep] for key in
+               ("lat", "lon", "busy", "distance", "waiting", "arrival", "rating", "mechanics")}
+
+    counts = values["experience_counts"]
+    kept_counts = counts[keep]
+    offsets = np.concatenate(([0], np.cumsum(kept_counts)))
+    years = values["experience_years"][np.repeat(keep, counts)]
+
+    return GarageStore(list(compress(values["names"], keep)), columns, offsets, years)
+
+# ============================================
+# BULK LOADING
+# ============================================
+
+class LoadReport:
+    """Counts of loaded/rejected rows and the first few errors"""
+
+    def __init__(self):
+        self.loaded = 0
+        self.rejected = 0
+        self.errors = []
+
+    def reject(self, line_no: int, reason: str):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_no, "error": reason})
+
+    def summary(self) -> str:
+        return f"{self.loaded} garages loaded, {self.rejected} rows rejected"
+
+def iter_garage_chunks(path: str, report: LoadReport = None, chunk_rows: int = CHUNK_ROWS):
+    """
+    Stream a garage file as GarageStore chunks of at most chunk_rows rows
+
+    Only one chunk of raw rows is held at a time. Invalid rows are
+    recorded in report and skipped; the load continues.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Unsupported garage file type: {ext}")
+    if report is None:
+        report = LoadReport()
+
+    for line_nos, columns in READERS[ext](path, chunk_rows, report):
+        with _gc_paused():
+            values, bad, reasons = validate_columns(columns)
+            store = None if bad.all() else _chunk_to_store(values, ~bad)
+
+        for i in sorted(reasons):
+            report.reject(line_nos[i], reasons[i])
+        report.loaded += int(len(bad) - bad.sum())
+
+        if store is not None:
+            yield store
+
+def load_garages(path: str, report: LoadReport = None) -> GarageStore:
+    """Load a whole garage file into one GarageStore"""
+    return GarageStore.concatenate(iter_garage_chunks(path, report))
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    print("="*70)
+    print("🧪 TESTING BULK GARAGE LOADER")
+    print("="*70)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(here, "garages.txt")
+
+    report = LoadReport()
+    start = time.perf_counter()
+    store = load_garages(path, report)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n✓ {report.summary()} in {elapsed:.2f}s")
+    for error in report.errors[:10]:
+        print(f"  ❌ line {error['line']}: {error['error']}")
+
+    for garage in store.to_garages(range(min(5, len(store)))):
+        print(f"  {garage}")
+
+    # Non-finite numbers are rejected like any other invalid value
+    valid = {"name": "Garage X", "lat": 6.9, "lon": 79.9, "status": "Busy", "waiting": 15,
+             "distance": None, "arrival": None, "rating": 4.2, "mechanics": 2, "experience": [7, 9]}
+    for field, value in (("waiting", "inf"), ("distance", float("inf")), ("mechanics", "inf"),
+                         ("rating", float("nan")), ("experience", "7;inf"), ("experience", [7, float("nan")]),
+                         ("experience", "7;40000"), ("experience", [7, 40000]), ("experience", [7, -3]),
+                         ("mechanics", 40000)):
+        try:
+            validate_record(dict(valid, **{field: value}))
+        except ValueError as e:
+            print(f"  ❌ {field}={value!r}: {e}")
+        else:
+            raise AssertionError(f"{field}={value!r} was accepted")
+    print(f"  ✓ {validate_record(valid)}")
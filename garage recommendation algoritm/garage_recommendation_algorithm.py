@@ -1,14 +1,22 @@
+import ast
 import os
 
+from garage_loader import load_garages
+from garage_registry import GarageRegistry, DEFAULT_RADIUS_KM
+from geo_utils import DRIVER_LOCATION
+from ranking_api import rank_garages, explain, format_header
+from scoring_engine import garages_to_matrix, column_maxima
+from top_k import top_k_results, TOP_K
+
+GARAGES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "garages.txt")
+
 def clear_screen():
     """Clear the terminal screen"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
 def print_header(text):
     """Print styled header"""
-    print("\n" + "="*70)
-    print(f" {text}")
-    print("="*70)
+    print(format_header(text))
 
 def print_subheader(text):
     """Print styled subheader"""
@@ -27,8 +35,8 @@ def get_garage_details(garage_num):
     while True:
         try:
             user_input = input(f"\n  Enter data: ")
-            # Parse the input as a Python list
-            data = eval(user_input)
+            # Parse the input as a Python list (literals only - never eval)
+            data = ast.literal_eval(user_input)
             
             if not isinstance(data, list) or len(data) != 6:
                 print("  ❌ Error: Please enter exactly 6 values in the format shown above.")
@@ -63,99 +71,29 @@ def display_input_summary(garages):
     print("─" * 80)
 
 def normalize_values(garages):
-    """Normalize all values and calculate scores"""
-    print_header("📊 STEP 1: FIND MAXIMUM VALUES")
-    
-    max_distance = max(g['distance'] for g in garages)
-    max_waiting = max(g['waiting'] for g in garages)
-    max_arrival = max(g['arrival'] for g in garages)
-    max_mechanics = max(g['mechanics'] for g in garages)
-    
-    print(f"\n  Max Distance  = {max_distance:.2f} km")
-    print(f"  Max Waiting   = {max_waiting:.2f} min")
-    print(f"  Max Arrival   = {max_arrival:.2f} min")
-    print(f"  Max Mechanics = {max_mechanics}")
-    
-    return max_distance, max_waiting, max_arrival, max_mechanics
+    """Find the maximum values used for normalization"""
+    max_distance, max_waiting, max_arrival, _, max_mechanics = column_maxima(garages_to_matrix(garages))
+    return max_distance, max_waiting, max_arrival, int(max_mechanics)
 
-def calculate_scores(garages, max_distance, max_waiting, max_arrival, max_mechanics):
-    """Calculate normalized scores for all garages"""
-    
-    # Weights
-    W_DISTANCE = 0.25
-    W_WAITING = 0.30
-    W_ARRIVAL = 0.15
-    W_RATING = 0.20
-    W_MECHANICS = 0.10
-    
-    print_header("⚖️  STEP 2: WEIGHTS (FIXED)")
-    print(f"\n  Distance Weight  = {W_DISTANCE}")
-    print(f"  Waiting Weight   = {W_WAITING}")
-    print(f"  Arrival Weight   = {W_ARRIVAL}")
-    print(f"  Rating Weight    = {W_RATING}")
-    print(f"  Mechanics Weight = {W_MECHANICS}")
-    
-    print_header("🧮 STEP 3: NORMALIZATION FORMULAS")
-    print("\n  distanceNorm  = distance / maxDistance")
-    print("  waitingNorm   = waiting / maxWaiting")
-    print("  arrivalNorm   = arrival / maxArrival")
-    print("  ratingNorm    = (5 - rating) / 5")
-    print("  mechanicsNorm = (maxMechanics - mechanics) / maxMechanics")
-    
-    print_header("🧮 STEP 4: CALCULATE SCORES FOR EACH GARAGE")
-    
-    results = []
-    
-    for i, garage in enumerate(garages, 1):
-        print(f"\n{'─'*70}")
-        print(f"🏚️  {garage['name'].upper()}")
-        print(f"{'─'*70}")
-        
-        # Normalize values
-        dist_norm = garage['distance'] / max_distance if max_distance > 0 else 0
-        wait_norm = garage['waiting'] / max_waiting if max_waiting > 0 else 0
-        arrival_norm = garage['arrival'] / max_arrival if max_arrival > 0 else 0
-        rating_norm = (5 - garage['rating']) / 5
-        mechanic_norm = (max_mechanics - garage['mechanics']) / max_mechanics if max_mechanics > 0 else 0
-        
-        print(f"\n  Normalized Values:")
-        print(f"  ├─ Distance:  {garage['distance']:.2f} / {max_distance:.2f} = {dist_norm:.4f}")
-        print(f"  ├─ Waiting:   {garage['waiting']:.2f} / {max_waiting:.2f} = {wait_norm:.4f}")
-        print(f"  ├─ Arrival:   {garage['arrival']:.2f} / {max_arrival:.2f} = {arrival_norm:.4f}")
-        print(f"  ├─ Rating:    (5 - {garage['rating']:.1f}) / 5 = {rating_norm:.4f}")
-        print(f"  └─ Mechanics: ({max_mechanics} - {garage['mechanics']}) / {max_mechanics} = {mechanic_norm:.4f}")
-        
-        # Calculate final score
-        final_score = (
-            dist_norm * W_DISTANCE +
-            wait_norm * W_WAITING +
-            arrival_norm * W_ARRIVAL +
-            rating_norm * W_RATING +
-            mechanic_norm * W_MECHANICS
-        )
-        
-        print(f"\n  Final Score Calculation:")
-        print(f"  ({dist_norm:.4f} × {W_DISTANCE}) + ({wait_norm:.4f} × {W_WAITING}) + "
-              f"({arrival_norm:.4f} × {W_ARRIVAL}) + ({rating_norm:.4f} × {W_RATING}) + "
-              f"({mechanic_norm:.4f} × {W_MECHANICS})")
-        print(f"\n  = {dist_norm * W_DISTANCE:.4f} + {wait_norm * W_WAITING:.4f} + "
-              f"{arrival_norm * W_ARRIVAL:.4f} + {rating_norm * W_RATING:.4f} + "
-              f"{mechanic_norm * W_MECHANICS:.4f}")
-        print(f"\n  ✅ FINAL SCORE = {final_score:.4f}")
-        
-        results.append({
-            'garage': garage,
-            'score': final_score
-        })
-    
-    return results
+def calculate_scores(garages, max_distance, max_waiting, max_arrival, max_mechanics, max_repair=None):
+    """Calculate normalized scores for all garages (silent)"""
+    maxima = [max_distance, max_waiting, max_arrival, 0, max_mechanics]
+    # Garages with predicted repair hours are scored on a 6th criterion
+    if garages and all('repair' in g for g in garages):
+        if max_repair is None:
+            max_repair = max(g['repair'] for g in garages)
+        maxima.append(max_repair)
+    return rank_garages(garages, maxima=maxima)['results']
 
-def display_ranking(results):
-    """Display final ranking"""
+def display_ranking(results, k=None):
+    """Display final ranking (only the k best garages when k is given)"""
     print_header("🏆 FINAL RANKING (LOWEST SCORE = BEST)")
     
-    # Sort by score (lowest is best)
-    sorted_results = sorted(results, key=lambda x: x['score'])
+    # Sort by score (lowest is best) - top-k selection instead of a full sort
+    if k is None:
+        sorted_results = sorted(results, key=lambda x: x['score'])
+    else:
+        sorted_results = top_k_results(results, k)
     
     medals = ['🥇', '🥈', '🥉']
     
@@ -184,17 +122,29 @@ def main():
     print(" 📍 Driver Location: SLIIT, New Kandy Road, Malabe (6.914833, 79.972861)")
     print("="*70)
     
-    # Get number of garages
-    radius = 2.5
-    num_garages = int(input(f"\n❓ How many garages discovered within {radius}km radius? "))
-    
-    # Collect garage details
-    garages = []
-    print_subheader("📝 ENTER GARAGE DETAILS")
-    
-    for i in range(num_garages):
-        garage = get_garage_details(i + 1)
-        garages.append(garage)
+    # Discover garages around the driver
+    store = load_garages(GARAGES_FILE)
+    registry = GarageRegistry.from_store(store)
+    indices, distances, radius = registry.discover(*DRIVER_LOCATION, k=1,
+                                                   radius_km=DEFAULT_RADIUS_KM)
+    num_garages = len(indices)
+
+    print(f"\n📡 {num_garages} garages discovered within {radius}km radius:")
+    for i, d in zip(indices, distances):
+        print(f"  • {registry.names[i]:<12} {d:.2f} km (straight line)")
+    
+    # Collect garage details (from garages.txt or typed in)
+    use_file = input("\n❓ Use the garage details listed in garages.txt? (y/n): ").strip().lower() == 'y'
+    
+    if use_file:
+        garages = store.to_garages(indices)
+    else:
+        garages = []
+        print_subheader("📝 ENTER GARAGE DETAILS")
+        
+        for i in range(num_garages):
+            garage = get_garage_details(i + 1)
+            garages.append(garage)
     
     # Display summary of all inputs
     display_input_summary(garages)
@@ -202,14 +152,13 @@ def main():
     # Wait for user to review
     input("\n⏸️  Press ENTER to continue with calculations...")
     
-    # Normalize and calculate
-    max_distance, max_waiting, max_arrival, max_mechanics = normalize_values(garages)
-    
-    # Calculate scores
-    results = calculate_scores(garages, max_distance, max_waiting, max_arrival, max_mechanics)
+    # Rank, then show the step-by-step breakdown
+    request_id = "cli"
+    ranking = rank_garages(garages, request_id=request_id)
+    print(explain(request_id).render())
     
     # Display ranking
-    display_ranking(results)
+    display_ranking(ranking['results'], k=TOP_K)
     
     print("\n🎉 Analysis Complete!\n")
 
@@ -0,0 +1,190 @@
+# garage_registry.py - Spatial index for discovering garages around a driver
+
+import numpy as np
+
+from garage_loader import load_garages
+from geo_utils import haversine_km, km_to_deg_lat, km_to_deg_lon, KM_PER_DEG_LAT
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+DEFAULT_RADIUS_KM = 2.5
+MAX_RADIUS_KM = 200.0        # Covers the whole island from any point
+RADIUS_GROWTH = 2.0
+CELL_SIZE_DEG = 0.01         # ~1.1 km grid cells
+
+# ============================================
+# GARAGE REGISTRY
+# ============================================
+
+class GarageRegistry:
+    """
+    Grid-indexed registry of garage locations
+
+    Garages are bucketed into fixed lat/lon cells and stored sorted by
+    cell key, so every row of cells in a query box is one contiguous
+    slice found with a binary search. Candidate distances are then
+    computed with vectorized haversine.
+    """
+
+    def __init__(self, names, lats, lons, cell_size_deg: float = CELL_SIZE_DEG):
+        self.names = names if hasattr(names, "__getitem__") and hasattr(names, "__len__") else list(names)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.cell_size_deg = cell_size_deg
+
+        if not (len(self.names) == len(self.lats) == len(self.lons)):
+            raise ValueError("names, lats and lons must have the same length")
+
+        self._n_cols = int(np.ceil(360.0 / cell_size_deg)) + 1
+
+        # Sort garages by cell key (row-major), keep sorted copies of coordinates
+        keys = self._cell_keys(self.lats, self.lons)
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+        self._lats = self.lats[self._order]
+        self._lons = self.lons[self._order]
+
+    @classmethod
+    def from_records(cls, records, cell_size_deg: float = CELL_SIZE_DEG):
+        """Build from dicts with 'name', 'lat' and 'lon' keys"""
+        records = list(records)
+        return cls([r["name"] for r in records],
+                   [r["lat"] for r in records],
+                   [r["lon"] for r in records],
+                   cell_size_deg)
+
+    @classmethod
+    def from_store(cls, store, cell_size_deg: float = CELL_SIZE_DEG):
+        """Build from a GarageStore (uses its lat/lon columns)"""
+        return cls(store.names, store['lat'], store['lon'], cell_size_deg)
+
+    def __len__(self):
+        return len(self.names)
+
+    # ----------------------------------------
+    # Grid helpers
+    # ----------------------------------------
+
+    def _cell_rows_cols(self, lats, lons):
+        rows = np.floor((np.asarray(lats) + 90.0) / self.cell_size_deg).astype(np.int64)
+        cols = np.floor((np.asarray(lons) + 180.0) / self.cell_size_deg).astype(np.int64)
+        return rows, cols
+
+    def _cell_keys(self, lats, lons):
+        rows, cols = self._cell_rows_cols(lats, lons)
+        return rows * self._n_cols + cols
+
+    def _candidates_in_box(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Sorted-array positions of every garage in the cells covering the radius"""
+        d_lat = km_to_deg_lat(radius_km)
+        d_lon = km_to_deg_lon(radius_km, lat)
+        (row_lo, row_hi), (col_lo, col_hi) = self._cell_rows_cols(
+            [lat - d_lat, lat + d_lat], [lon - d_lon, lon + d_lon])
+
+        rows = np.arange(row_lo, row_hi + 1)
+        starts = np.searchsorted(self._keys, rows * self._n_cols + col_lo, side="left")
+        ends = np.searchsorted(self._keys, rows * self._n_cols + col_hi, side="right")
+
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # Concatenate the [start, end) ranges without a Python loop
+        run_offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return np.arange(total) + run_offsets
+
+    # ----------------------------------------
+    # Queries
+    # ----------------------------------------
+
+    def within_radius(self, lat: float, lon: float, radius_km: float):
+        """
+        All garages within radius_km of (lat, lon)
+
+        Returns:
+            (indices, distances_km) sorted by distance, indices into self.names
+        """
+        positions = self._candidates_in_box(lat, lon, radius_km)
+        distances = haversine_km(lat, lon, self._lats[positions], self._lons[positions])
+
+        inside = distances <= radius_km
+        positions, distances = positions[inside], distances[inside]
+
+        order = np.argsort(distances, kind="stable")
+        return self._order[positions[order]], distances[order]
+
+    def nearest(self, lat: float, lon: float, k: int, max_radius_km: float = MAX_RADIUS_KM):
+        """
+        The k garages closest to (lat, lon)
+
+        Returns:
+            (indices, distances_km) sorted by distance (fewer than k if the
+            registry has no more garages within max_radius_km)
+        """
+        radius = self.cell_size_deg * KM_PER_DEG_LAT
+        while True:
+            indices, distances = self.within_radius(lat, lon, radius)
+            if len(indices) >= k or radius >= max_radius_km:
+                return indices[:k], distances[:k]
+            radius = min(radius * RADIUS_GROWTH, max_radius_km)
+
+    def discover(self, lat: float, lon: float, k: int = 1,
+                 radius_km: float = DEFAULT_RADIUS_KM,
+                 max_radius_km: float = MAX_RADIUS_KM):
+        """
+        Garages within radius_km, growing the radius until at least k are found
+
+        Returns:
+            (indices, distances_km, radius_used_km)
+        """
+        radius = radius_km
+        while True:
+            indices, distances = self.within_radius(lat, lon, radius)
+            if len(indices) >= k or radius >= max_radius_km:
+                return indices, distances, radius
+            radius = min(radius * RADIUS_GROWTH, max_radius_km)
+
+# ============================================
+# GARAGES.TXT LOCATIONS
+# ============================================
+
+def load_registry_from_txt(path: str) -> GarageRegistry:
+    """Build a registry from the garage locations listed in garages.txt"""
+    return GarageRegistry.from_store(load_garages(path))
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import os
+    import time
+    from geo_utils import DRIVER_LOCATION
+
+    print("="*70)
+    print("🧪 TESTING GARAGE REGISTRY")
+    print("="*70)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    registry = load_registry_from_txt(os.path.join(here, "garages.txt"))
+
+    lat, lon = DRIVER_LOCATION
+    indices, distances, radius = registry.discover(lat, lon, k=3, radius_km=DEFAULT_RADIUS_KM)
+    print(f"\n📍 {len(indices)} garages within {radius} km of SLIIT Malabe")
+    for i, d in zip(indices, distances):
+        print(f"  {registry.names[i]:<12} {d:.3f} km")
+
+    # National-scale registry (synthetic)
+    rng = np.random.default_rng(0)
+    n = 50_000
+    big = GarageRegistry([f"G{i}" for i in range(n)],
+                         rng.uniform(5.9, 9.8, n), rng.uniform(79.6, 81.9, n))
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        big.discover(lat, lon, k=5)
+    elapsed = (time.perf_counter() - start) / 1000 * 1000
+    print(f"\n⏱️  discover() over {n:,} garages: {elapsed:.3f} ms per query")
@@ -0,0 +1,256 @@
+# garage_store.py - Compact columnar representation of many garages
+
+import os
+import sys
+
+import numpy as np
+
+from scoring_engine import CRITERIA
+
+# ============================================
+# COLUMNS
+# ============================================
+
+# Numeric columns and their dtypes
+COLUMNS = {
+    "lat": np.float64,
+    "lon": np.float64,
+    "busy": np.bool_,
+    "distance": np.float32,
+    "waiting": np.float32,
+    "arrival": np.float32,
+    "rating": np.float32,
+    "mechanics": np.int16,
+}
+
+# Files of a store saved with GarageStore.save(directory)
+NAMES_BLOB_FILE = "names.bin"
+NAMES_OFFSETS_FILE = "names_offsets.npy"
+EXPERIENCE_OFFSETS_FILE = "experience_offsets.npy"
+EXPERIENCE_YEARS_FILE = "experience_years.npy"
+
+# ============================================
+# NAME TABLE
+# ============================================
+
+class NameTable:
+    """
+    Garage names as one UTF-8 blob plus offsets, decoded on access
+
+    Keeps a million names in ~20 MB of flat bytes instead of a million
+    Python strings, and can be memory-mapped. Decoded names are interned,
+    so repeated lookups of a garage share one string object.
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def from_names(cls, names):
+        encoded = [str(name).encode("utf-8") for name in names]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i) -> str:
+        i = int(i)
+        if i < 0:
+            i += len(self)
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return sys.intern(bytes(self.blob[start:end]).decode("utf-8"))
+
+    def __iter__(self):
+        data = bytes(self.blob)
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            yield sys.intern(data[start:end].decode("utf-8"))
+
+    def tolist(self) -> list:
+        return list(self)
+
+# ============================================
+# GARAGE STORE
+# ============================================
+
+class GarageStore:
+    """
+    Garages as one NumPy array per field instead of a list of dicts
+
+    Mechanic experience is stored CSR-style: the years of garage i are
+    experience_years[experience_offsets[i]:experience_offsets[i + 1]].
+    Distance/arrival are NaN until they are computed for a driver.
+
+    save()/open() persist every column as its own .npy file, so an
+    opened store is memory-mapped: the registry and the scorer read the
+    columns straight from the page cache without loading the file.
+    """
+
+    def __init__(self, names, columns: dict, experience_offsets=None, experience_years=None):
+        self.names = names if isinstance(names, NameTable) else list(names)
+        self.columns = {key: np.asarray(columns[key], dtype=dtype) for key, dtype in COLUMNS.items()}
+
+        n = len(self.names)
+        for key, values in self.columns.items():
+            if len(values) != n:
+                raise ValueError(f"Column '{key}' has {len(values)} rows, expected {n}")
+
+        if experience_offsets is None:
+            experience_offsets = np.zeros(n + 1, dtype=np.int64)
+            experience_years = np.empty(0, dtype=np.int16)
+        self.experience_offsets = np.asarray(experience_offsets, dtype=np.int64)
+        self.experience_years = np.asarray(experience_years, dtype=np.int16)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.columns[key]
+
+    @classmethod
+    def concatenate(cls, stores):
+        """Join several stores (e.g. loaded chunks) into one"""
+        stores = list(stores)
+        if not stores:
+            return cls([], {key: [] for key in COLUMNS})
+
+        names = [name for store in stores for name in store.names]
+        columns = {key: np.concatenate([s.columns[key] for s in stores]) for key in COLUMNS}
+
+        offsets = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for store in stores:
+            offsets.append(store.experience_offsets[1:] + base)
+            base += store.experience_offsets[-1]
+        years = np.concatenate([s.experience_years for s in stores])
+
+        return cls(names, columns, np.concatenate(offsets), years)
+
+    def subset(self, rows):
+        """New store holding only the given rows (e.g. one region shard)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts, ends = self.experience_offsets[rows], self.experience_offsets[rows + 1]
+        years = [self.experience_years[start:end] for start, end in zip(starts, ends)]
+        return GarageStore(
+            [self.names[i] for i in rows],
+            {key: values[rows] for key, values in self.columns.items()},
+            np.concatenate(([0], np.cumsum(ends - starts))),
+            np.concatenate(years) if years else np.empty(0, dtype=np.int16),
+        )
+
+    # ----------------------------------------
+    # Persistence (memory-mapped)
+    # ----------------------------------------
+
+    def save(self, directory: str):
+        """Write the store as one .npy file per column plus the name table"""
+        os.makedirs(directory, exist_ok=True)
+        for key in COLUMNS:
+            np.save(os.path.join(directory, f"{key}.npy"), self.columns[key])
+
+        names = self.names if isinstance(self.names, NameTable) else NameTable.from_names(self.names)
+        with open(os.path.join(directory, NAMES_BLOB_FILE), "wb") as f:
+            f.write(bytes(names.blob))
+        np.save(os.path.join(directory, NAMES_OFFSETS_FILE), names.offsets)
+        np.save(os.path.join(directory, EXPERIENCE_OFFSETS_FILE), self.experience_offsets)
+        np.save(os.path.join(directory, EXPERIENCE_YEARS_FILE), self.experience_years)
+
+    @classmethod
+    def open(cls, directory: str, mmap: bool = True):
+        """
+        Open a store written by save()
+
+        With mmap=True (default) nothing is read up front; columns are
+        read-only memory maps.
+        """
+        mode = "r" if mmap else None
+
+        def load(name):
+            return np.load(os.path.join(directory, name), mmap_mode=mode)
+
+        columns = {key: load(f"{key}.npy") for key in COLUMNS}
+        blob_path = os.path.join(directory, NAMES_BLOB_FILE)
+        if os.path.getsize(blob_path) == 0:
+            blob = np.empty(0, dtype=np.uint8)
+        elif mmap:
+            blob = np.memmap(blob_path, dtype=np.uint8, mode="r")
+        else:
+            blob = np.fromfile(blob_path, dtype=np.uint8)
+        names = NameTable(blob, load(NAMES_OFFSETS_FILE))
+        return cls(names, columns, load(EXPERIENCE_OFFSETS_FILE), load(EXPERIENCE_YEARS_FILE))
+
+    # ----------------------------------------
+    # Views used by the scorer / CLI
+    # ----------------------------------------
+
+    def features(self, rows=None) -> np.ndarray:
+        """N x 5 feature matrix in scoring_engine.CRITERIA order"""
+        if rows is None:
+            rows = slice(None)
+        return np.column_stack([self.columns[key][rows].astype(np.float64) for key in CRITERIA])
+
+    def experience(self, row: int) -> list:
+        """Years of experience of every mechanic at one garage"""
+        start, end = self.experience_offsets[row], self.experience_offsets[row + 1]
+        return self.experience_years[start:end].tolist()
+
+    def to_garages(self, rows=None) -> list:
+        """Garage dicts in the format used by the interactive algorithm"""
+        if rows is None:
+            rows = range(len(self))
+        # float32 columns are rounded back to the precision they were entered with
+        return [
+            {
+                'name': self.names[i],
+                'distance': round(float(self.columns['distance'][i]), 4),
+                'waiting': round(float(self.columns['waiting'][i]), 4),
+                'arrival': round(float(self.columns['arrival'][i]), 4),
+                'rating': round(float(self.columns['rating'][i]), 4),
+                'mechanics': int(self.columns['mechanics'][i])
+            }
+            for i in rows
+        ]
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from benchmark import synthetic_store
+    from garage_registry import GarageRegistry
+    from geo_utils import DRIVER_LOCATION
+    from scoring_engine import score_matrix
+
+    print("="*70)
+    print("🧪 TESTING MEMORY-MAPPED GARAGE STORE")
+    print("="*70)
+
+    n = 1_000_000
+    store = synthetic_store(n)
+    with tempfile.TemporaryDirectory() as directory:
+        store.save(directory)
+        size_mb = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)) / 2**20
+
+        start = time.perf_counter()
+        opened = GarageStore.open(directory)
+        open_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        registry = GarageRegistry.from_store(opened)
+        indices, distances, _ = registry.discover(*DRIVER_LOCATION, k=5)
+        features = opened.features(indices)
+        features[:, 0] = distances
+        features[:, 2] = distances * 3
+        scores = score_matrix(features)
+        query_s = time.perf_counter() - start
+
+        best = indices[scores.argmin()]
+        print(f"\n  {n:,} garages: {size_mb:.1f} MB on disk, opened in {open_ms:.1f} ms")
+        print(f"  Index build + first query on the mapped columns: {query_s:.2f}s")
+        print(f"  🥇 {opened.names[best]} ({len(indices)} candidates)")
+        del opened, registry
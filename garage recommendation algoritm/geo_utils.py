@@ -0,0 +1,100 @@
+# geo_utils.py - Shared geographic helpers (haversine, geohash)
+
+import numpy as np
+
+# ============================================
+# CONSTANTS
+# ============================================
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = 111.32
+
+# SLIIT, New Kandy Road, Malabe
+DRIVER_LOCATION = (6.914833, 79.972861)
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# ============================================
+# DISTANCES
+# ============================================
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in km (vectorized, NumPy broadcasting rules)
+
+    Input:  haversine_km(6.914833, 79.972861, lats_array, lons_array)
+    Output: array of distances in km
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64))
+                              for v in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def km_to_deg_lat(km: float) -> float:
+    """Kilometres -> degrees of latitude"""
+    return km / KM_PER_DEG_LAT
+
+def km_to_deg_lon(km: float, lat: float) -> float:
+    """Kilometres -> degrees of longitude at the given latitude"""
+    return km / (KM_PER_DEG_LAT * max(np.cos(np.radians(lat)), 1e-6))
+
+# ============================================
+# GEOHASH
+# ============================================
+
+def geohash_encode(lat: float, lon: float, precision: int = 7) -> str:
+    """
+    Standard base32 geohash of a point
+
+    Precision 5 = ~4.9 km cell, 6 = ~1.2 km, 7 = ~150 m
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits = bits << 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+def geohash_bounds(geohash: str):
+    """(lat_min, lat_max, lon_min, lon_max) of a geohash cell"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = _GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+def geohash_decode(geohash: str):
+    """Centre (lat, lon) of a geohash cell"""
+    lat_min, lat_max, lon_min, lon_max = geohash_bounds(geohash)
+    return (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
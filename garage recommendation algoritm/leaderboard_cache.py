@@ -0,0 +1,181 @@
+# leaderboard_cache.py - Ranked garage lists cached per hotspot (origin cell)
+
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from geo_utils import geohash_encode
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+LEADERBOARD_CELL_PRECISION = 6   # ~1.2 km x 0.6 km: a campus or a junction
+LEADERBOARD_TTL_S = 60.0         # Waiting times drift even without events
+LEADERBOARD_CACHE_SIZE = 2048    # Leaderboards kept (least recently used evicted)
+
+# ============================================
+# LEADERBOARD CACHE
+# ============================================
+
+class LeaderboardCache:
+    """
+    Cache of ranked candidate lists keyed by (origin cell, fault category, weight profile)
+
+    A hit skips both candidate discovery and scoring. Entries expire
+    after ttl seconds, and are dropped at once when a garage they rank,
+    or any garage located inside their origin cell, changes status.
+
+    Usage:
+        ranking = cache.get_or_compute(lat, lon, "Engine", "Major", compute)
+        cache.garage_changed("Garage 03", lat, lon)     # on a status event
+    """
+
+    def __init__(self, ttl: float = LEADERBOARD_TTL_S, max_entries: int = LEADERBOARD_CACHE_SIZE,
+                 precision: int = LEADERBOARD_CELL_PRECISION, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.precision = precision
+        self.clock = clock
+
+        self._entries = OrderedDict()    # key -> (expires_at, ranking, garage_ids)
+        self._by_garage = {}             # garage_id -> keys that rank it
+        self._by_cell = {}               # cell -> keys with that origin cell
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, lat: float, lon: float, fault_category, weight_profile) -> tuple:
+        """Cache key; weight profiles may be names or weight vectors"""
+        if isinstance(weight_profile, (np.ndarray, list)):
+            weight_profile = tuple(np.round(np.asarray(weight_profile, dtype=np.float64), 6).tolist())
+        return geohash_encode(lat, lon, self.precision), fault_category, weight_profile
+
+    # ----------------------------------------
+    # Lookups
+    # ----------------------------------------
+
+    def get(self, lat: float, lon: float, fault_category, weight_profile):
+        """Cached ranking or None"""
+        key = self.key(lat, lon, fault_category, weight_profile)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            self._drop(key)
+            self.stats["expirations"] += 1
+            entry = None
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, lat: float, lon: float, fault_category, weight_profile, ranking, garage_ids):
+        """Store a ranking together with the ids of the garages it ranks"""
+        key = self.key(lat, lon, fault_category, weight_profile)
+        if key in self._entries:
+            self._drop(key)
+
+        garage_ids = tuple(garage_ids)
+        self._entries[key] = (self.clock() + self.ttl, ranking, garage_ids)
+        for garage_id in garage_ids:
+            self._by_garage.setdefault(garage_id, set()).add(key)
+        self._by_cell.setdefault(key[0], set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.stats["evictions"] += 1
+
+    def get_or_compute(self, lat: float, lon: float, fault_category, weight_profile, compute):
+        """
+        Cached ranking, or compute() -> (ranking, garage_ids) on a miss
+        """
+        ranking = self.get(lat, lon, fault_category, weight_profile)
+        if ranking is None:
+            ranking, garage_ids = compute()
+            self.put(lat, lon, fault_category, weight_profile, ranking, garage_ids)
+        return ranking
+
+    # ----------------------------------------
+    # Invalidation
+    # ----------------------------------------
+
+    def garage_changed(self, garage_id, lat: float = None, lon: float = None) -> int:
+        """
+        Drop every leaderboard affected by a garage status change
+
+        Returns:
+            number of leaderboards dropped
+        """
+        keys = set(self._by_garage.get(garage_id, ()))
+        if lat is not None and lon is not None:
+            keys |= self._by_cell.get(geohash_encode(lat, lon, self.precision), set())
+        for key in keys:
+            self._drop(key)
+        self.stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._by_garage.clear()
+        self._by_cell.clear()
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for garage_id in entry[2]:
+            keys = self._by_garage.get(garage_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_garage[garage_id]
+        keys = self._by_cell.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_cell[key[0]]
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import os
+    from garage_loader import load_garages
+    from garage_registry import GarageRegistry
+    from geo_utils import DRIVER_LOCATION
+    from ranking_api import rank_garages
+    from top_k import top_k_results, TOP_K
+
+    print("="*70)
+    print("🧪 TESTING LEADERBOARD CACHE")
+    print("="*70)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    store = load_garages(os.path.join(here, "garages.txt"))
+    registry = GarageRegistry.from_store(store)
+    cache = LeaderboardCache()
+
+    def compute():
+        indices, _, _ = registry.discover(*DRIVER_LOCATION)
+        garages = store.to_garages(indices)
+        ranking = top_k_results(rank_garages(garages)['results'], TOP_K)
+        return ranking, [g['name'] for g in garages]
+
+    lat, lon = DRIVER_LOCATION
+    n = 10_000
+    start = time.perf_counter()
+    for i in range(n):
+        ranking = cache.get_or_compute(lat + (i % 7) * 1e-4, lon, "Engine", "Moderate", compute)
+    elapsed = (time.perf_counter() - start) / n * 1e6
+
+    print(f"\n  🥇 {ranking[0]['garage']['name']}   {elapsed:.1f} µs per request")
+    dropped = cache.garage_changed("Garage 02", float(store['lat'][1]), float(store['lon'][1]))
+    print(f"  Garage 02 changed status -> {dropped} leaderboard(s) dropped")
+    cache.get_or_compute(lat, lon, "Engine", "Moderate", compute)
+    print(f"  📊 {cache.stats}")
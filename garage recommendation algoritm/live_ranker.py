@@ -0,0 +1,197 @@
+# live_ranker.py - Incremental re-ranking on live garage status updates
+
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+
+import numpy as np
+
+from scoring_engine import CRITERIA, WEIGHTS, NORMALIZATION, normalize_matrix
+
+# ============================================
+# RUNNING MAXIMUM (with deletions)
+# ============================================
+
+class RunningMax:
+    """
+    Maximum of a multiset that supports removing values
+
+    Max-heap with lazy deletion: removed values stay in the heap until
+    they reach the top, so add/remove are O(log n) amortised.
+    """
+
+    def __init__(self, values=()):
+        self._counts = Counter(values)
+        self._heap = [-v for v in self._counts]
+        heapq.heapify(self._heap)
+
+    def add(self, value: float):
+        if self._counts[value] == 0:
+            heapq.heappush(self._heap, -value)
+        self._counts[value] += 1
+
+    def remove(self, value: float):
+        self._counts[value] -= 1
+        if self._counts[value] == 0:
+            del self._counts[value]
+
+    def max(self) -> float:
+        while self._heap and -self._heap[0] not in self._counts:
+            heapq.heappop(self._heap)
+        return -self._heap[0] if self._heap else 0.0
+
+# ============================================
+# LIVE RANKER
+# ============================================
+
+class LiveRanker:
+    """
+    Keeps one candidate set ranked while garage statuses change
+
+    When an update does not move any column maximum, only that garage's
+    score is recomputed and its position is fixed with a binary search.
+    When a maximum moves, every garage's value in that column is
+    renormalised (one vectorized column pass) and the order is rebuilt.
+    """
+
+    def __init__(self, garage_ids, features, weights=WEIGHTS):
+        self.garage_ids = list(garage_ids)
+        self._row_of = {gid: row for row, gid in enumerate(self.garage_ids)}
+        self.features = np.array(features, dtype=np.float64).reshape(-1, len(CRITERIA))
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+        # Only columns normalised against a maximum need a running max
+        self._max_columns = [col for col, kind in enumerate(NORMALIZATION) if kind != "rating"]
+        self._trackers = {col: RunningMax(self.features[:, col].tolist()) for col in self._max_columns}
+
+        self.stats = {"updates": 0, "incremental": 0, "column_rescores": 0}
+        self._rescore_all()
+
+    @classmethod
+    def from_garages(cls, garages, weights=WEIGHTS):
+        """Build from garage dicts (keyed by garage name)"""
+        features = [[g[key] for key in CRITERIA] for g in garages]
+        return cls([g['name'] for g in garages], features, weights)
+
+    # ----------------------------------------
+    # Scoring
+    # ----------------------------------------
+
+    def _maxima(self) -> np.ndarray:
+        maxima = np.zeros(len(CRITERIA))
+        for col, tracker in self._trackers.items():
+            maxima[col] = tracker.max()
+        return maxima
+
+    def _rescore_all(self):
+        self._contrib = normalize_matrix(self.features, self._maxima()) * self.weights
+        self._rebuild_order()
+
+    def _rescore_columns(self, columns):
+        maxima = self._maxima()
+        for col in columns:
+            kinds = (NORMALIZATION[col],)
+            self._contrib[:, col] = normalize_matrix(
+                self.features[:, [col]], maxima[[col]], kinds)[:, 0] * self.weights[col]
+        self._rebuild_order()
+
+    def _rebuild_order(self):
+        self.scores = self._contrib.sum(axis=1)
+        self._order = sorted(zip(self.scores.tolist(), range(len(self.scores))))
+
+    def _refresh_row(self, row: int):
+        normalized = normalize_matrix(self.features[row:row + 1], self._maxima())[0]
+        self._contrib[row] = normalized * self.weights
+
+    def _rescore_row(self, row: int):
+        old = (float(self.scores[row]), row)
+        del self._order[bisect_left(self._order, old)]
+
+        self._refresh_row(row)
+        self.scores[row] = self._contrib[row].sum()
+        insort(self._order, (float(self.scores[row]), row))
+
+    # ----------------------------------------
+    # Updates
+    # ----------------------------------------
+
+    def update(self, garage_id, **changes):
+        """
+        Apply a live status change, e.g. update("Garage 01", waiting=0)
+
+        Any criterion in CRITERIA can be changed.
+        """
+        row = self._row_of[garage_id]
+        self.stats["updates"] += 1
+
+        old_maxima = self._maxima()
+        for key, value in changes.items():
+            col = CRITERIA.index(key)
+            old_value = self.features[row, col]
+            self.features[row, col] = value
+            if col in self._trackers:
+                self._trackers[col].remove(old_value)
+                self._trackers[col].add(float(value))
+
+        new_maxima = self._maxima()
+        moved = [col for col in self._max_columns if new_maxima[col] != old_maxima[col]]
+        if moved:
+            self.stats["column_rescores"] += 1
+            self._refresh_row(row)
+            self._rescore_columns(moved)
+        else:
+            self.stats["incremental"] += 1
+            self._rescore_row(row)
+
+    # ----------------------------------------
+    # Queries
+    # ----------------------------------------
+
+    def top(self, k: int = 5) -> list:
+        """[(garage_id, score), ...] for the k best garages"""
+        return [(self.garage_ids[row], score) for score, row in self._order[:k]]
+
+    def rank_of(self, garage_id) -> int:
+        """Current rank (1 = best)"""
+        row = self._row_of[garage_id]
+        return bisect_left(self._order, (float(self.scores[row]), row)) + 1
+
+    def score_of(self, garage_id) -> float:
+        return float(self.scores[self._row_of[garage_id]])
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import time
+    from scoring_engine import score_and_rank
+
+    print("="*70)
+    print("🧪 TESTING LIVE RANKER")
+    print("="*70)
+
+    rng = np.random.default_rng(0)
+    n = 5000
+    features = np.column_stack([
+        rng.uniform(0.2, 10, n),
+        rng.choice([0, 15, 30, 45, 60], n).astype(float),
+        rng.uniform(2, 30, n).round(),
+        rng.uniform(2.5, 5, n).round(1),
+        rng.integers(1, 8, n).astype(float),
+    ])
+    ranker = LiveRanker(range(n), features)
+
+    updates = 20_000
+    start = time.perf_counter()
+    for _ in range(updates):
+        gid = int(rng.integers(n))
+        ranker.update(gid, waiting=float(rng.choice([0, 15, 30, 45])),
+                      mechanics=float(rng.integers(1, 7)))
+    elapsed = time.perf_counter() - start
+
+    scores, ranks = score_and_rank(ranker.features)
+    print(f"\n  Matches full recompute: {np.allclose(scores, ranker.scores)}")
+    print(f"  ⏱️  {updates / elapsed:,.0f} updates/sec over {n:,} garages")
+    print(f"  📊 {ranker.stats}")
+    print(f"  🏆 Top 3: {ranker.top(3)}")
@@ -0,0 +1,207 @@
+# ranking_api.py - Silent garage ranking API with on-demand explanations
+
+from collections import OrderedDict
+
+import numpy as np
+
+from scoring_engine import (
+    CRITERIA,
+    REPAIR_CRITERIA,
+    criteria_for,
+    garages_to_matrix,
+    column_maxima,
+    normalize_matrix,
+    rank_scores
+)
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+EXPLANATION_CACHE_SIZE = 256
+
+# ============================================
+# RANKING API
+# ============================================
+
+def rank_garages(garages, weights=None, maxima=None, request_id=None) -> dict:
+    """
+    Score and rank garages without printing anything
+
+    Args:
+        garages: [{'name': ..., 'distance': ..., 'waiting': ..., 'arrival': ...,
+                   'rating': ..., 'mechanics': ...}, ...]
+                 When every garage also has 'repair' (predicted hours, see
+                 repair_time.add_repair_hours) it is scored as a 6th criterion.
+        weights: one weight per criterion (CRITERIA / REPAIR_CRITERIA order),
+                 the fixed weights when None
+        maxima: per-criterion maxima, taken from the garages when None
+        request_id: if given, an explanation is registered for explain()
+
+    Returns:
+        {
+            "maxima": {"distance": 1.7, "waiting": 15.0, ...},
+            "results": [
+                {
+                    "garage": {...},
+                    "score": 0.2029,
+                    "rank": 1,
+                    "components": {"distance": 0.3235, ...}
+                },
+                ...
+            ]   # same order as garages
+        }
+    """
+    with_repair = bool(garages) and all('repair' in g for g in garages)
+    criteria, default_weights, _ = criteria_for(len(REPAIR_CRITERIA if with_repair else CRITERIA))
+    if weights is None:
+        weights = default_weights
+
+    features = garages_to_matrix(garages, criteria)
+    if maxima is None:
+        maxima = column_maxima(features)
+    maxima = np.asarray(maxima, dtype=np.float64)
+    normalized = normalize_matrix(features, maxima)
+    weights = np.asarray(weights, dtype=np.float64)
+    fixed_weights = np.array_equal(weights, default_weights)
+    scores = normalized @ weights
+    ranks = rank_scores(scores)
+
+    results = [
+        {
+            "garage": garage,
+            "score": float(scores[i]),
+            "rank": int(ranks[i]),
+            "components": dict(zip(criteria, normalized[i].tolist()))
+        }
+        for i, garage in enumerate(garages)
+    ]
+
+    if request_id is not None:
+        _remember(request_id, RankingExplanation(garages, maxima, normalized, weights, scores,
+                                                     fixed_weights))
+
+    return {
+        "maxima": dict(zip(criteria, maxima.tolist())),
+        "results": results
+    }
+
+# ============================================
+# EXPLANATION
+# ============================================
+
+def format_header(text: str) -> str:
+    """Styled header (same layout as the CLI)"""
+    return "\n" + "="*70 + f"\n {text}\n" + "="*70
+
+class RankingExplanation:
+    """
+    Step-by-step formula breakdown of one ranking
+
+    Only the numbers are kept when the ranking is computed; the text is
+    built the first time render() is called and reused afterwards.
+    """
+
+    def __init__(self, garages, maxima, normalized, weights, scores, fixed_weights: bool = True):
+        self.garages = garages
+        self.maxima = maxima
+        self.normalized = normalized
+        self.weights = weights
+        self.scores = scores
+        self.fixed_weights = fixed_weights      # the default weights, not custom/profile ones
+        self._text = None
+
+    def render(self) -> str:
+        """Full explanation text (STEP 1 to STEP 4)"""
+        if self._text is None:
+            self._text = "\n".join(self._lines())
+        return self._text
+
+    def _lines(self):
+        max_distance, max_waiting, max_arrival, _, max_mechanics = self.maxima[:5]
+        max_mechanics = int(max_mechanics)
+        w_distance, w_waiting, w_arrival, w_rating, w_mechanics = self.weights[:5].tolist()
+        with_repair = len(self.weights) > 5
+        if with_repair:
+            max_repair, w_repair = self.maxima[5], float(self.weights[5])
+
+        lines = [format_header("📊 STEP 1: FIND MAXIMUM VALUES")]
+        lines.append(f"\n  Max Distance  = {max_distance:.2f} km")
+        lines.append(f"  Max Waiting   = {max_waiting:.2f} min")
+        lines.append(f"  Max Arrival   = {max_arrival:.2f} min")
+        lines.append(f"  Max Mechanics = {max_mechanics}")
+        if with_repair:
+            lines.append(f"  Max Repair    = {max_repair:.2f} h")
+
+        lines.append(format_header(f"⚖️  STEP 2: WEIGHTS ({'FIXED' if self.fixed_weights else 'CUSTOM'})"))
+        lines.append(f"\n  Distance Weight  = {w_distance}")
+        lines.append(f"  Waiting Weight   = {w_waiting}")
+        lines.append(f"  Arrival Weight   = {w_arrival}")
+        lines.append(f"  Rating Weight    = {w_rating}")
+        lines.append(f"  Mechanics Weight = {w_mechanics}")
+        if with_repair:
+            lines.append(f"  Repair Weight    = {w_repair}")
+
+        lines.append(format_header("🧮 STEP 3: NORMALIZATION FORMULAS"))
+        lines.append("\n  distanceNorm  = distance / maxDistance")
+        lines.append("  waitingNorm   = waiting / maxWaiting")
+        lines.append("  arrivalNorm   = arrival / maxArrival")
+        lines.append("  ratingNorm    = (5 - rating) / 5")
+        lines.append("  mechanicsNorm = (maxMechanics - mechanics) / maxMechanics")
+        if with_repair:
+            lines.append("  repairNorm    = repair / maxRepair")
+
+        lines.append(format_header("🧮 STEP 4: CALCULATE SCORES FOR EACH GARAGE"))
+
+        for garage, norm, score in zip(self.garages, self.normalized.tolist(), self.scores.tolist()):
+            dist_norm, wait_norm, arrival_norm, rating_norm, mechanic_norm = norm[:5]
+
+            lines.append(f"\n{'─'*70}")
+            lines.append(f"🏚️  {garage['name'].upper()}")
+            lines.append(f"{'─'*70}")
+
+            lines.append(f"\n  Normalized Values:")
+            lines.append(f"  ├─ Distance:  {garage['distance']:.2f} / {max_distance:.2f} = {dist_norm:.4f}")
+            lines.append(f"  ├─ Waiting:   {garage['waiting']:.2f} / {max_waiting:.2f} = {wait_norm:.4f}")
+            lines.append(f"  ├─ Arrival:   {garage['arrival']:.2f} / {max_arrival:.2f} = {arrival_norm:.4f}")
+            lines.append(f"  ├─ Rating:    (5 - {garage['rating']:.1f}) / 5 = {rating_norm:.4f}")
+            branch = "├─" if with_repair else "└─"
+            lines.append(f"  {branch} Mechanics: ({max_mechanics} - {garage['mechanics']}) / {max_mechanics} = {mechanic_norm:.4f}")
+
+            products = (f"({dist_norm:.4f} × {w_distance}) + ({wait_norm:.4f} × {w_waiting}) + "
+                        f"({arrival_norm:.4f} × {w_arrival}) + ({rating_norm:.4f} × {w_rating}) + "
+                        f"({mechanic_norm:.4f} × {w_mechanics})")
+            terms = (f"{dist_norm * w_distance:.4f} + {wait_norm * w_waiting:.4f} + "
+                     f"{arrival_norm * w_arrival:.4f} + {rating_norm * w_rating:.4f} + "
+                     f"{mechanic_norm * w_mechanics:.4f}")
+            if with_repair:
+                repair_norm = norm[5]
+                lines.append(f"  └─ Repair:    {garage['repair']:.2f} / {max_repair:.2f} = {repair_norm:.4f}")
+                products += f" + ({repair_norm:.4f} × {w_repair})"
+                terms += f" + {repair_norm * w_repair:.4f}"
+
+            lines.append(f"\n  Final Score Calculation:")
+            lines.append(f"  {products}")
+            lines.append(f"\n  = {terms}")
+            lines.append(f"\n  ✅ FINAL SCORE = {score:.4f}")
+
+        return lines
+
+# ============================================
+# EXPLANATION CACHE (per request ID)
+# ============================================
+
+_explanations = OrderedDict()
+
+def _remember(request_id, explanation: RankingExplanation):
+    _explanations[request_id] = explanation
+    _explanations.move_to_end(request_id)
+    while len(_explanations) > EXPLANATION_CACHE_SIZE:
+        _explanations.popitem(last=False)
+
+def explain(request_id):
+    """Explanation registered by rank_garages(..., request_id=...) or None"""
+    explanation = _explanations.get(request_id)
+    if explanation is not None:
+        _explanations.move_to_end(request_id)
+    return explanation
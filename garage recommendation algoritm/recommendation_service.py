@@ -0,0 +1,422 @@
+# recommendation_service.py - Asyncio HTTP recommendation service with micro-batching
+
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from garage_registry import GarageRegistry, DEFAULT_RADIUS_KM
+from scoring_engine import driver_features, score_batch
+from top_k import TOP_K
+from weight_profiles import SEVERITY_PROFILES
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+
+BATCH_WINDOW_S = 0.002        # Requests collected into one batch
+MAX_BATCH = 256               # Requests scored in one vectorized pass
+MAX_PENDING = 2048            # Queued requests before answering 503
+MAX_K = 50
+DEFAULT_SEVERITY = "Moderate"
+KEEPALIVE_TIMEOUT_S = 15.0    # Idle keep-alive connections are closed
+MAX_BODY_BYTES = 16 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+# ============================================
+# REQUESTS
+# ============================================
+
+class ServiceOverloaded(Exception):
+    """Raised when the batch queue is full"""
+
+def parse_request(payload: dict) -> tuple:
+    """
+    Validate a recommendation request
+
+    Input:  {"lat": 6.91, "lon": 79.97, "fault": {"category": "Engine", "severity": "Major"}, "k": 5}
+
+    Returns:
+        (lat, lon, severity, k)
+
+    Raises:
+        ValueError: missing or invalid fields
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    try:
+        lat, lon = float(payload["lat"]), float(payload["lon"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("'lat' and 'lon' are required numbers")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("'lat'/'lon' out of range")
+
+    fault = payload.get("fault") or {}
+    if not isinstance(fault, dict):
+        raise ValueError("'fault' must be an object")
+    severity = fault.get("severity", DEFAULT_SEVERITY)
+    if not isinstance(severity, str) or severity not in SEVERITY_PROFILES:
+        raise ValueError(f"Unknown severity {severity!r} (expected one of {', '.join(SEVERITY_PROFILES)})")
+
+    k = payload.get("k", TOP_K)
+    if not isinstance(k, int) or isinstance(k, bool) or not 1 <= k <= MAX_K:
+        raise ValueError(f"'k' must be an integer between 1 and {MAX_K}")
+    return lat, lon, severity, k
+
+# ============================================
+# BATCH RANKING (vectorized)
+# ============================================
+
+def rank_requests(store, registry, requests, radius_km: float = DEFAULT_RADIUS_KM) -> list:
+    """
+    Rank many driver requests in one scoring pass
+
+    Candidate discovery runs per driver; the features of all candidates
+    are then gathered, normalised (per-driver maxima) and scored together
+    by score_batch, each driver with the weights of their fault severity.
+
+    Args:
+        requests: [(lat, lon, severity, k), ...]
+
+    Returns:
+        one response dict per request: {"results": [...], "radius_km": ...}
+    """
+    found = [registry.discover(lat, lon, k=k, radius_km=radius_km) for lat, lon, _, k in requests]
+    lengths = [len(indices) for indices, _, _ in found]
+    if not found:
+        return []
+
+    rows = np.concatenate([indices for indices, _, _ in found]).astype(np.int64)
+    distances = np.concatenate([d for _, d, _ in found]) if rows.size else np.empty(0)
+    features = driver_features(store, rows, distances)
+
+    weights = np.array([SEVERITY_PROFILES[severity] for _, _, severity, _ in requests])
+    sets = np.split(features, np.cumsum(lengths)[:-1])
+
+    responses = []
+    start = 0
+    for (scores, ranks), (_, _, _, k), n, (_, _, radius) in zip(score_batch(sets, weights), requests, lengths, found):
+        best = np.flatnonzero(ranks <= k)
+        best = best[np.argsort(ranks[best])]
+        responses.append({
+            "results": [{"rank": int(ranks[i]),
+                         "garage": store.names[int(rows[start + i])],
+                         "distance_km": round(float(distances[start + i]), 3),
+                         "score": round(float(scores[i]), 4)} for i in best],
+            "radius_km": radius,
+        })
+        start += n
+    return responses
+
+# ============================================
+# SERVICE
+# ============================================
+
+class RecommendationService:
+    """
+    Long-running HTTP/1.1 service: POST /recommend, GET /health
+
+    Requests arriving within batch_window seconds of each other are
+    scored together (up to max_batch at a time). Connections are kept
+    alive between requests. When max_pending requests are already
+    waiting for a batch, new ones are answered 503 at once instead of
+    queueing without bound.
+
+    Usage:
+        async with RecommendationService(store) as service:
+            ...  # http://127.0.0.1:<service.port>/recommend
+    """
+
+    def __init__(self, store, registry: GarageRegistry = None, batch_window: float = BATCH_WINDOW_S,
+                 max_batch: int = MAX_BATCH, max_pending: int = MAX_PENDING,
+                 host: str = SERVICE_HOST, port: int = SERVICE_PORT):
+        self.store = store
+        self.registry = registry if registry is not None else GarageRegistry.from_store(store)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.host = host
+        self.port = port
+        self.stats = {"requests": 0, "batches": 0, "rejected": 0, "errors": 0}
+
+        self._queue = None
+        self._batcher = None
+        self._server = None
+
+    # ----------------------------------------
+    # Micro-batching
+    # ----------------------------------------
+
+    async def recommend(self, request: tuple) -> dict:
+        """
+        Queue one parsed request and wait for its batch
+
+        Raises:
+            ServiceOverloaded: the queue is full
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((request, future))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise ServiceOverloaded()
+        return await future
+
+    def _drain(self, batch: list):
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+    async def _run_batches(self):
+        while True:
+            batch = [await self._queue.get()]
+            self._drain(batch)
+            if len(batch) < self.max_batch and self.batch_window > 0:
+                await asyncio.sleep(self.batch_window)
+                self._drain(batch)
+
+            batch = [(request, future) for request, future in batch if not future.cancelled()]
+            if not batch:
+                continue
+            self.stats["batches"] += 1
+            self.stats["requests"] += len(batch)
+            try:
+                responses = rank_requests(self.store, self.registry, [request for request, _ in batch])
+            except Exception:
+                # Rank one by one so a bad request only fails its own future
+                self._run_singly(batch)
+                continue
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+
+    def _run_singly(self, batch: list):
+        for request, future in batch:
+            try:
+                response = rank_requests(self.store, self.registry, [request])[0]
+            except Exception as e:
+                self.stats["errors"] += 1
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(response)
+
+    # ----------------------------------------
+    # HTTP
+    # ----------------------------------------
+
+    async def _respond(self, request_line: bytes, body: bytes) -> tuple:
+        """(status code, payload, extra headers) of one HTTP request"""
+        fields = request_line.split()
+        method, path = (fields[0], fields[1]) if len(fields) >= 2 else (b"", b"")
+
+        if path == b"/health":
+            return 200, {"status": "ok", "pending": self._queue.qsize(), **self.stats}, ""
+        if path != b"/recommend":
+            return 404, {"error": "not found"}, ""
+        if method != b"POST":
+            return 405, {"error": "use POST"}, "Allow: POST\r\n"
+
+        try:
+            request = parse_request(json.loads(body))
+        except (ValueError, TypeError) as e:      # includes JSONDecodeError
+            return 400, {"error": str(e)}, ""
+        try:
+            return 200, await self.recommend(request), ""
+        except ServiceOverloaded:
+            return 503, {"error": "overloaded, retry later"}, "Retry-After: 1\r\n"
+        except Exception as e:
+            return 500, {"error": f"ranking failed: {type(e).__name__}"}, ""
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT_S)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+
+                keep_alive = not request_line.rstrip().endswith(b"HTTP/1.0")
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    key, value = key.strip().lower(), value.strip().lower()
+                    if key == "content-length":
+                        length = int(value) if value.isdigit() else -1
+                    elif key == "connection":
+                        keep_alive = value == "keep-alive"
+
+                if length < 0:
+                    code, payload, headers = 400, {"error": "invalid Content-Length"}, ""
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    code, payload, headers = 413, {"error": "body too large"}, ""
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    code, payload, headers = await self._respond(request_line, body)
+
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {code} {_REASONS[code]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n{headers}"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError, TypeError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._queue = asyncio.Queue(self.max_pending)
+        self._batcher = asyncio.create_task(self._run_batches())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            self._batcher = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+# ============================================
+# LOAD TEST (keep-alive client)
+# ============================================
+
+async def load_test(host: str, port: int, connections: int = 64, duration: float = 5.0,
+                    payloads=None) -> dict:
+    """
+    Hammer POST /recommend over keep-alive connections for duration seconds
+
+    Returns:
+        {"requests", "rejected", "rps", "p50_ms", "p99_ms"}
+    """
+    if payloads is None:
+        payloads = [{"lat": 6.914833, "lon": 79.972861, "fault": {"severity": "Moderate"}}]
+    encoded = []
+    for payload in payloads:
+        body = json.dumps(payload).encode()
+        encoded.append(f"POST /recommend HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+
+    latencies, rejected = [], 0
+    stop_at = time.perf_counter() + duration
+
+    async def client(offset: int):
+        nonlocal rejected
+        reader, writer = await asyncio.open_connection(host, port)
+        i = offset
+        try:
+            while time.perf_counter() < stop_at:
+                start = time.perf_counter()
+                writer.write(encoded[i % len(encoded)])
+                i += 1
+                status = await reader.readline()
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                await reader.readexactly(length)
+                if status.split()[1] == b"503":
+                    rejected += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(connections)))
+    elapsed = time.perf_counter() - start
+    ms = np.asarray(latencies) * 1000 if latencies else np.zeros(1)
+    return {"requests": len(latencies), "rejected": rejected, "rps": len(latencies) / elapsed,
+            "p50_ms": float(np.percentile(ms, 50)), "p99_ms": float(np.percentile(ms, 99))}
+
+def _run_load_test(host, port, connections, duration, payloads, results):
+    results.put(asyncio.run(load_test(host, port, connections, duration, payloads)))
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    import argparse
+    import multiprocessing
+    import os
+    from benchmark import synthetic_store
+    from garage_loader import load_garages
+    from geo_utils import DRIVER_LOCATION
+
+    parser = argparse.ArgumentParser(description="Serve garage recommendations over HTTP")
+    parser.add_argument("--garages", type=int, default=100_000, help="synthetic garages (0 = garages.txt)")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--window-ms", type=float, default=BATCH_WINDOW_S * 1000)
+    parser.add_argument("--bench", action="store_true", help="run a load test instead of serving")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if args.garages:
+        store = synthetic_store(args.garages)
+    else:
+        store = load_garages(os.path.join(os.path.dirname(os.path.abspath(__file__)), "garages.txt"))
+
+    async def serve():
+        service = RecommendationService(store, batch_window=args.window_ms / 1000,
+                                        port=0 if args.bench else args.port)
+        await service.start()
+        if not args.bench:
+            print(f"🚗 Serving {len(store):,} garages at http://{service.host}:{service.port}/recommend")
+            await asyncio.Event().wait()
+
+        print("="*70)
+        print("⏱️  RECOMMENDATION SERVICE LOAD TEST")
+        print("="*70)
+        rng = np.random.default_rng(0)
+        lat0, lon0 = DRIVER_LOCATION
+        payloads = [{"lat": lat0 + rng.uniform(-0.2, 0.2), "lon": lon0 + rng.uniform(-0.2, 0.2),
+                     "fault": {"severity": rng.choice(list(SEVERITY_PROFILES))}} for _ in range(1000)]
+
+        # The client runs in its own process so it does not share the service's event loop
+        results = multiprocessing.Queue()
+        client = multiprocessing.Process(target=_run_load_test, args=(
+            service.host, service.port, args.connections, args.duration, payloads, results))
+        client.start()
+        report = await asyncio.get_running_loop().run_in_executor(None, results.get)
+        client.join()
+        await service.stop()
+
+        batches = max(service.stats["batches"], 1)
+        print(f"\n  {len(store):,} garages, {args.connections} keep-alive connections, {args.duration:.0f}s")
+        print(f"  {report['requests']:,} answered ({report['rps']:,.0f} req/s), {report['rejected']} rejected (503)")
+        print(f"  latency p50 {report['p50_ms']:.1f} ms, p99 {report['p99_ms']:.1f} ms")
+        print(f"  {service.stats['batches']:,} batches, {service.stats['requests'] / batches:.1f} requests per batch")
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
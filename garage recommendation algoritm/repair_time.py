@@ -0,0 +1,253 @@
+# repair_time.py - Predicted repair hours per garage from a precomputed model table
+
+import csv
+import os
+import pickle
+from collections import Counter
+
+import numpy as np
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+ML_DIR = os.path.join(_HERE, "..", "ml_repairtime")
+MODEL_PATH = os.path.join(ML_DIR, "repair_time_pipeline.pkl")
+MODEL_COLUMNS_PATH = os.path.join(ML_DIR, "model_columns.pkl")
+DATASET_PATH = os.path.join(ML_DIR, "suzukialto_repairtime_dataset.csv")
+TABLE_PATH = os.path.join(ML_DIR, "repair_time_table.csv")
+
+# Mechanic expertise (years) buckets: [0, 5) -> 0, [5, 10) -> 1, ... 20+ -> 4
+EXPERTISE_BUCKET_YEARS = 5
+EXPERTISE_BUCKETS = 5
+
+SEVERITIES = ("Minor", "Moderate", "Major")
+GARAGE_TYPES = ("Local", "Authorized")
+DEFAULT_GARAGE_TYPE = "Local"      # garages.txt does not list the garage type
+DEFAULT_EXPERTISE_YEARS = 10       # Used when a garage lists no mechanics
+
+TABLE_FIELDS = ("Fault_Type", "Severity", "Garage_Type", "Expertise_Bucket", "Repair_Hours")
+
+# ============================================
+# EXPERTISE BUCKETS
+# ============================================
+
+def expertise_bucket(years) -> int:
+    """Bucket index of a mechanic expertise in years"""
+    return int(min(max(years, 0) // EXPERTISE_BUCKET_YEARS, EXPERTISE_BUCKETS - 1))
+
+def bucket_years(bucket: int) -> int:
+    """Representative years of a bucket (its middle) used for predictions"""
+    return bucket * EXPERTISE_BUCKET_YEARS + EXPERTISE_BUCKET_YEARS // 2
+
+def garage_expertise(experience) -> float:
+    """Expertise of a garage = mean years of its mechanics"""
+    return float(np.mean(experience)) if len(experience) else DEFAULT_EXPERTISE_YEARS
+
+# ============================================
+# MODEL INPUT
+# ============================================
+
+def _dataset_defaults(path: str = DATASET_PATH) -> tuple:
+    """
+    Values for the model inputs the table is not keyed on
+
+    Returns:
+        (defaults, fault_details) - medians/modes of the training data,
+        and {fault_type: (Fault_Category, Parts_Required)}
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    defaults = {}
+    for key in ("Record_ID", "Model_Year", "Mileage_KM"):
+        defaults[key] = float(np.median([float(r[key]) for r in rows]))
+    for key in ("Parts_Availability", "Location", "Day_of_Week", "Time_of_Day"):
+        defaults[key] = Counter(r[key] for r in rows).most_common(1)[0][0]
+
+    details = Counter((r["Fault_Type"], r["Fault_Category"], r["Parts_Required"]) for r in rows)
+    fault_details = {}
+    for (fault_type, category, parts), _ in details.most_common():
+        fault_details.setdefault(fault_type, (category, parts))
+    return defaults, fault_details
+
+class RepairTimeModel:
+    """
+    The trained RandomForest pipeline plus everything needed to encode
+    (Fault_Type, Severity, Garage_Type, expertise) into its one-hot input
+
+    Loaded lazily: nothing is unpickled until the first prediction.
+    """
+
+    def __init__(self, model_path: str = MODEL_PATH, columns_path: str = MODEL_COLUMNS_PATH,
+                 dataset_path: str = DATASET_PATH):
+        self.model_path = model_path
+        self.columns_path = columns_path
+        self.dataset_path = dataset_path
+        self._model = None
+
+    def _load(self):
+        with open(self.model_path, "rb") as f:
+            self._model = pickle.load(f)
+        with open(self.columns_path, "rb") as f:
+            self.columns = pickle.load(f)
+        self._column_index = {name: i for i, name in enumerate(self.columns)}
+        self.defaults, self.fault_details = _dataset_defaults(self.dataset_path)
+
+    @property
+    def fault_types(self) -> list:
+        if self._model is None:
+            self._load()
+        return sorted(self.fault_details)
+
+    def encode(self, keys) -> np.ndarray:
+        """One-hot rows (model_columns.pkl order) for (fault, severity, garage_type, bucket) keys"""
+        if self._model is None:
+            self._load()
+        rows = np.zeros((len(keys), len(self.columns)))
+        index = self._column_index
+        for i, (fault_type, severity, garage_type, bucket) in enumerate(keys):
+            category, parts = self.fault_details.get(fault_type, (None, None))
+            numeric = dict(self.defaults, Mechanic_Expertise=bucket_years(bucket))
+            for key in ("Record_ID", "Model_Year", "Mileage_KM", "Mechanic_Expertise"):
+                rows[i, index[key]] = numeric[key]
+            # Reference levels of drop_first encoding have no column
+            for name in (f"Fault_Category_{category}", f"Fault_Type_{fault_type}",
+                         f"Severity_{severity}", f"Parts_Required_{parts}",
+                         f"Parts_Availability_{self.defaults['Parts_Availability']}",
+                         f"Garage_Type_{garage_type}", f"Location_{self.defaults['Location']}",
+                         f"Day_of_Week_{self.defaults['Day_of_Week']}",
+                         f"Time_of_Day_{self.defaults['Time_of_Day']}"):
+                if name in index:
+                    rows[i, index[name]] = 1.0
+        return rows
+
+    def predict(self, keys) -> np.ndarray:
+        """Predicted repair hours for every key, in one model call"""
+        rows = self.encode(keys)
+        try:
+            import pandas as pd
+            rows = pd.DataFrame(rows, columns=self.columns)
+        except ImportError:
+            pass
+        return np.asarray(self._model.predict(rows), dtype=np.float64)
+
+# ============================================
+# PREDICTION TABLE
+# ============================================
+
+class RepairTimeTable:
+    """
+    Predicted repair hours keyed by (Fault_Type, Severity, Garage_Type, expertise bucket)
+
+    The table is built offline by predicting every combination in one
+    batch (build()/save()); at request time a lookup is a dict access.
+    The model is only called on a miss, and the answer is kept.
+    """
+
+    def __init__(self, entries=None, model: RepairTimeModel = None):
+        self.entries = dict(entries or {})
+        self.model = model if model is not None else RepairTimeModel()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def build(cls, model: RepairTimeModel = None):
+        """Predict every (fault, severity, garage type, bucket) combination"""
+        model = model if model is not None else RepairTimeModel()
+        keys = [(fault_type, severity, garage_type, bucket)
+                for fault_type in model.fault_types
+                for severity in SEVERITIES
+                for garage_type in GARAGE_TYPES
+                for bucket in range(EXPERTISE_BUCKETS)]
+        hours = model.predict(keys)
+        return cls(zip(keys, hours.tolist()), model)
+
+    @classmethod
+    def load(cls, path: str = TABLE_PATH, model: RepairTimeModel = None):
+        """Read a table written by save() (empty table if the file is missing)"""
+        entries = {}
+        if os.path.exists(path):
+            with open(path, newline="", encoding="utf-8") as f:
+                for r in csv.DictReader(f):
+                    key = (r["Fault_Type"], r["Severity"], r["Garage_Type"], int(r["Expertise_Bucket"]))
+                    entries[key] = float(r["Repair_Hours"])
+        return cls(entries, model)
+
+    def save(self, path: str = TABLE_PATH):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(TABLE_FIELDS)
+            for key, hours in sorted(self.entries.items()):
+                writer.writerow([*key, f"{hours:.4f}"])
+
+    def hours(self, fault_type: str, severity: str, garage_types, expertise_years) -> np.ndarray:
+        """
+        Predicted repair hours of many garages for one fault
+
+        Args:
+            garage_types: one garage type per garage
+            expertise_years: one expertise (years) per garage
+
+        Returns:
+            array of hours, one per garage
+        """
+        keys = [(fault_type, severity, garage_type, expertise_bucket(years))
+                for garage_type, years in zip(garage_types, expertise_years)]
+        entries = self.entries
+
+        missing = {key for key in keys if key not in entries}
+        self.stats["misses"] += len(missing)
+        self.stats["hits"] += len(keys) - sum(1 for key in keys if key in missing)
+        if missing:
+            missing = list(missing)
+            entries.update(zip(missing, self.model.predict(missing).tolist()))
+
+        return np.array([entries[key] for key in keys], dtype=np.float64)
+
+def add_repair_hours(garages, table: RepairTimeTable, fault_type: str, severity: str):
+    """
+    Set garage['repair'] (predicted hours) on every garage dict
+
+    Uses garage['garage_type'] and garage['experience'] (years of every
+    mechanic) when present, else DEFAULT_GARAGE_TYPE / DEFAULT_EXPERTISE_YEARS.
+    """
+    hours = table.hours(fault_type, severity,
+                        [g.get('garage_type', DEFAULT_GARAGE_TYPE) for g in garages],
+                        [garage_expertise(g.get('experience', [])) for g in garages])
+    for garage, h in zip(garages, hours.tolist()):
+        garage['repair'] = h
+    return garages
+
+def store_repair_hours(store, table: RepairTimeTable, fault_type: str, severity: str,
+                       rows=None, garage_types=None) -> np.ndarray:
+    """Predicted repair hours of GarageStore rows (all rows when None)"""
+    rows = range(len(store)) if rows is None else rows
+    expertise = [garage_expertise(store.experience(row)) for row in rows]
+    if garage_types is None:
+        garage_types = [DEFAULT_GARAGE_TYPE] * len(expertise)
+    return table.hours(fault_type, severity, garage_types, expertise)
+
+# ============================================
+# MAIN (offline table build)
+# ============================================
+
+if __name__ == "__main__":
+    import time
+
+    print("="*70)
+    print("🔧 BUILDING REPAIR TIME TABLE")
+    print("="*70)
+
+    start = time.perf_counter()
+    table = RepairTimeTable.build()
+    table.save()
+    print(f"\n  {len(table):,} predictions in {time.perf_counter() - start:.2f}s -> {TABLE_PATH}")
+
+    table = RepairTimeTable.load()
+    hours = table.hours("Clutch Slipping", "Moderate", ["Local", "Authorized"], [4, 14])
+    print(f"  Clutch Slipping (Moderate): Local/4yrs = {hours[0]:.2f} h, Authorized/14yrs = {hours[1]:.2f} h")
+    print(f"  📊 {table.stats}")
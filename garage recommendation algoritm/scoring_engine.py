@@ -0,0 +1,235 @@
+# scoring_engine.py - Vectorized garage scoring (NumPy)
+
+import numpy as np
+
+# ============================================
+# CRITERIA & WEIGHTS
+# ============================================
+
+# Column order of every feature matrix used by the engine
+CRITERIA = ("distance", "waiting", "arrival", "rating", "mechanics")
+
+# Weights (FIXED) - same values as the interactive algorithm
+W_DISTANCE = 0.25
+W_WAITING = 0.30
+W_ARRIVAL = 0.15
+W_RATING = 0.20
+W_MECHANICS = 0.10
+
+WEIGHTS = np.array([W_DISTANCE, W_WAITING, W_ARRIVAL, W_RATING, W_MECHANICS])
+
+MAX_RATING = 5.0
+
+CITY_SPEED_KPH = 20.0          # Arrival estimate from distance when no ETA is given
+
+# How each column is normalised (lower normalised value = better)
+#   "ratio"   -> value / maxValue
+#   "rating"  -> (5 - value) / 5
+#   "deficit" -> (maxValue - value) / maxValue
+NORMALIZATION = ("ratio", "ratio", "ratio", "rating", "deficit")
+
+# Optional 6th criterion: predicted repair hours (see repair_time.py).
+# The five original weights are scaled down so the total stays 1.
+W_REPAIR = 0.15
+
+REPAIR_CRITERIA = CRITERIA + ("repair",)
+REPAIR_WEIGHTS = np.append(np.round(WEIGHTS * (1 - W_REPAIR), 4), W_REPAIR)
+REPAIR_NORMALIZATION = NORMALIZATION + ("ratio",)
+
+def criteria_for(n_columns: int) -> tuple:
+    """(criteria, weights, normalization) of a 5- or 6-column feature matrix"""
+    if n_columns == len(CRITERIA):
+        return CRITERIA, WEIGHTS, NORMALIZATION
+    if n_columns == len(REPAIR_CRITERIA):
+        return REPAIR_CRITERIA, REPAIR_WEIGHTS, REPAIR_NORMALIZATION
+    raise ValueError(f"Expected {len(CRITERIA)} or {len(REPAIR_CRITERIA)} columns, got {n_columns}")
+
+# ============================================
+# FEATURE MATRIX
+# ============================================
+
+def garages_to_matrix(garages, criteria=CRITERIA) -> np.ndarray:
+    """
+    Convert garage dicts into an N x C feature matrix
+
+    Input:  [{'name': 'Garage 01', 'distance': 0.5, 'waiting': 15, ...}, ...]
+    Output: array([[0.5, 15.0, 2.0, 3.2, 2.0], ...])
+    """
+    features = np.empty((len(garages), len(criteria)), dtype=np.float64)
+    for col, key in enumerate(criteria):
+        features[:, col] = [g[key] for g in garages]
+    return features
+
+def driver_features(store, rows, distances) -> np.ndarray:
+    """Feature matrix of GarageStore rows with distance/arrival for one driver"""
+    distances = np.asarray(distances, dtype=np.float64)
+    features = store.features(rows)
+    features[:, CRITERIA.index("distance")] = distances
+    features[:, CRITERIA.index("arrival")] = distances / CITY_SPEED_KPH * 60
+    return features
+
+def column_maxima(features: np.ndarray) -> np.ndarray:
+    """Maximum of every column (STEP 1 of the algorithm)"""
+    features = np.asarray(features, dtype=np.float64)
+    if features.shape[0] == 0:
+        return np.zeros(features.shape[1])
+    return features.max(axis=0)
+
+# ============================================
+# NORMALIZATION & SCORING
+# ============================================
+
+def normalize_matrix(features, maxima=None, kinds=None) -> np.ndarray:
+    """
+    Normalise a feature matrix exactly like normalize_values/calculate_scores
+
+    Args:
+        features: N x C matrix in CRITERIA order
+        maxima: per-column maxima, shape (C,) or (N, C). Computed from
+                features when None. A max of 0 gives a normalised value of 0.
+        kinds: normalisation kind of every column (see NORMALIZATION);
+               picked from the number of columns when None
+
+    Returns:
+        N x C matrix of normalised components
+    """
+    features = np.asarray(features, dtype=np.float64)
+    if kinds is None:
+        kinds = criteria_for(features.shape[1])[2]
+    if maxima is None:
+        maxima = column_maxima(features)
+    maxima = np.broadcast_to(np.asarray(maxima, dtype=np.float64), features.shape)
+
+    normalized = np.zeros_like(features)
+    for col, kind in enumerate(kinds):
+        values = features[:, col]
+        col_max = maxima[:, col]
+
+        if kind == "ratio":
+            np.divide(values, col_max, out=normalized[:, col], where=col_max > 0)
+        elif kind == "deficit":
+            np.divide(col_max - values, col_max, out=normalized[:, col], where=col_max > 0)
+        elif kind == "rating":
+            normalized[:, col] = (MAX_RATING - values) / MAX_RATING
+        else:
+            raise ValueError(f"Unknown normalisation kind: {kind}")
+
+    return normalized
+
+def rank_scores(scores: np.ndarray) -> np.ndarray:
+    """Rank scores (1 = lowest score = best). Ties keep input order."""
+    order = np.argsort(scores, kind="stable")
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[order] = np.arange(1, len(scores) + 1)
+    return ranks
+
+def score_matrix(features, weights=None, maxima=None) -> np.ndarray:
+    """Weighted score of every garage (lower = better)"""
+    normalized = normalize_matrix(features, maxima)
+    if weights is None:
+        weights = criteria_for(normalized.shape[1])[1]
+    return normalized @ np.asarray(weights, dtype=np.float64)
+
+def score_and_rank(features, weights=None, maxima=None):
+    """
+    Score and rank one candidate set in a single vectorized pass
+
+    Returns:
+        (scores, ranks) - both shape (N,)
+    """
+    scores = score_matrix(features, weights, maxima)
+    return scores, rank_scores(scores)
+
+# ============================================
+# BATCH OF DRIVERS
+# ============================================
+
+def score_batch(candidate_sets, weights=None):
+    """
+    Score many drivers at once, each with their own candidate set
+
+    Every driver's garages are normalised against the maxima of that
+    driver's own candidates, so the result is identical to calling
+    score_and_rank once per driver.
+
+    Args:
+        candidate_sets: list of N_i x C feature matrices (one per driver),
+                        C = 5 (CRITERIA) or 6 (REPAIR_CRITERIA) for all
+        weights: one weight vector (C,) for everyone, or one per driver (D x C);
+                 WEIGHTS / REPAIR_WEIGHTS by column count when None
+
+    Returns:
+        [(scores, ranks), ...] in the same order as candidate_sets
+    """
+    arrays = [np.asarray(m, dtype=np.float64) for m in candidate_sets]
+    widths = {a.shape[1] for a in arrays if a.ndim == 2}
+    if len(widths) > 1:
+        raise ValueError(f"Candidate sets have different column counts: {sorted(widths)}")
+    n_columns = widths.pop() if widths else len(CRITERIA)
+    default_weights = criteria_for(n_columns)[1]
+    if weights is None:
+        weights = default_weights
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape[-1] != n_columns:
+        raise ValueError(f"Expected {n_columns} weights per driver, got {weights.shape[-1]}")
+    matrices = [a.reshape(-1, n_columns) for a in arrays]
+    lengths = np.array([len(m) for m in matrices], dtype=np.int64)
+    if lengths.sum() == 0:
+        return [(np.empty(0), np.empty(0, dtype=np.int64)) for _ in matrices]
+
+    features = np.concatenate(matrices)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    # Per-driver maxima, broadcast back to every row of that driver
+    non_empty = lengths > 0
+    seg_maxima = np.zeros((len(matrices), features.shape[1]))
+    seg_maxima[non_empty] = np.maximum.reduceat(features, offsets[non_empty], axis=0)
+    row_maxima = np.repeat(seg_maxima, lengths, axis=0)
+
+    normalized = normalize_matrix(features, row_maxima)
+    if weights.ndim == 2:
+        scores = np.einsum("ij,ij->i", normalized, np.repeat(weights, lengths, axis=0))
+    else:
+        scores = normalized @ weights
+
+    # Rank inside each driver's segment: sort by (segment, score)
+    segment_ids = np.repeat(np.arange(len(matrices)), lengths)
+    order = np.lexsort((np.arange(len(scores)), scores, segment_ids))
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[order] = np.arange(len(scores)) - offsets[segment_ids[order]] + 1
+
+    return [(scores[start:start + n], ranks[start:start + n])
+            for start, n in zip(offsets, lengths)]
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    print("="*70)
+    print("🧪 TESTING VECTORIZED SCORING ENGINE")
+    print("="*70)
+
+    # Garages from garages.txt (SLIIT Malabe demo)
+    demo = np.array([
+        [0.50, 15, 2, 3.2, 2],
+        [0.55, 0, 2, 4.2, 3],
+        [0.60, 15, 3, 4.4, 5],
+        [0.60, 0, 3, 4.0, 3],
+        [1.70, 15, 6, 3.5, 4],
+    ])
+
+    scores, ranks = score_and_rank(demo)
+    for i, (score, rank) in enumerate(zip(scores, ranks), 1):
+        print(f"  Garage {i:02d}: score = {score:.4f}  rank = {rank}")
+
+    print("\n📦 Batch of 3 drivers")
+    for scores, ranks in score_batch([demo, demo[:3], demo[2:]]):
+        print(f"  ranks = {ranks.tolist()}")
+
+    # With predicted repair hours as a 6th column
+    repair_demo = np.column_stack([demo, [3.0, 5.5, 2.0, 4.0, 1.5]])
+    batch = score_batch([repair_demo, repair_demo[:3]])
+    assert np.allclose(batch[0][0], score_matrix(repair_demo))
+    assert np.allclose(batch[1][0], score_matrix(repair_demo[:3]))
+    print(f"  6 columns: ranks = {batch[0][1].tolist()}")
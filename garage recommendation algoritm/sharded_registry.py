@@ -0,0 +1,241 @@
+# sharded_registry.py - Region shards (geohash prefix) with one worker process each, scatter-gather top-k
+
+import multiprocessing
+
+import numpy as np
+
+from garage_registry import GarageRegistry, DEFAULT_RADIUS_KM, MAX_RADIUS_KM, RADIUS_GROWTH
+from geo_utils import geohash_bounds, geohash_encode, km_to_deg_lat, km_to_deg_lon
+from scoring_engine import WEIGHTS, column_maxima, driver_features, score_matrix
+from top_k import top_k_indices, TOP_K
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+SHARD_PRECISION = 4      # Geohash prefix length: ~39 km x 20 km regions
+
+# ============================================
+# SHARD KEYS
+# ============================================
+
+def shard_keys(lats, lons, precision: int = SHARD_PRECISION) -> np.ndarray:
+    """
+    Geohash prefix of every garage
+
+    Points are binned on the geohash grid with NumPy; only one
+    geohash_encode call is made per distinct cell.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    lat_bins = np.clip(((lats + 90) / 180 * 2**lat_bits).astype(np.int64), 0, 2**lat_bits - 1)
+    lon_bins = np.clip(((lons + 180) / 360 * 2**lon_bits).astype(np.int64), 0, 2**lon_bits - 1)
+
+    cells, inverse = np.unique(lat_bins * 2**lon_bits + lon_bins, return_inverse=True)
+    keys = [geohash_encode((cell // 2**lon_bits + 0.5) / 2**lat_bits * 180 - 90,
+                           (cell % 2**lon_bits + 0.5) / 2**lon_bits * 360 - 180, precision)
+            for cell in cells.tolist()]
+    return np.array(keys, dtype=object)[inverse.reshape(-1)]
+
+def _overlaps(bounds, lat: float, lon: float, radius_km: float) -> bool:
+    """Does the search circle's bounding box touch a shard's cell?"""
+    lat_min, lat_max, lon_min, lon_max = bounds
+    dlat, dlon = km_to_deg_lat(radius_km), km_to_deg_lon(radius_km, lat)
+    return (lat - dlat <= lat_max and lat + dlat >= lat_min
+            and lon - dlon <= lon_max and lon + dlon >= lon_min)
+
+# ============================================
+# SHARD WORKER (one process per region)
+# ============================================
+
+def _shard_worker(conn, store):
+    """
+    Serve one shard until "stop"
+
+    Messages:
+        ("candidates", lat, lon, radius)          -> (count, maxima)
+        ("top_k", lat, lon, radius, k, weights, maxima) -> [(score, distance, name), ...]
+        ("rebuild", store)                        -> garage count
+    """
+    registry = GarageRegistry.from_store(store)
+    last = None          # (lat, lon, radius) -> (rows, distances, features) of the last query
+    while True:
+        message = conn.recv()
+        op = message[0]
+        if op == "stop":
+            break
+        if op == "rebuild":
+            store = message[1]
+            registry = GarageRegistry.from_store(store)
+            last = None
+            conn.send(len(store))
+            continue
+
+        query = message[1:4]
+        if last is None or last[0] != query:
+            rows, distances = registry.within_radius(*query)
+            last = (query, rows, distances, driver_features(store, rows, distances))
+        _, rows, distances, features = last
+
+        if op == "candidates":
+            conn.send((len(rows), column_maxima(features) if len(rows) else None))
+        elif op == "top_k":
+            k, weights, maxima = message[4:]
+            scores = score_matrix(features, weights, maxima)
+            best = top_k_indices(scores, k)
+            conn.send([(float(scores[i]), float(distances[i]), store.names[int(rows[i])]) for i in best])
+    conn.close()
+
+class _Shard:
+    def __init__(self, prefix: str, store):
+        self.prefix = prefix
+        self.bounds = geohash_bounds(prefix)
+        self.size = len(store)
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_shard_worker, args=(child, store), daemon=True)
+        self.process.start()
+        child.close()
+
+# ============================================
+# COORDINATOR
+# ============================================
+
+class ShardedRegistry:
+    """
+    Garages split by geohash prefix, each region served by its own process
+
+    A query is scattered to the shards whose region overlaps the search
+    radius, in two phases so the ranking equals a single-process run:
+      1. every shard reports its candidate count and column maxima;
+         the radius grows (like GarageRegistry.discover) until at least
+         k garages are found in total
+      2. every shard scores its candidates with the GLOBAL maxima and
+         returns its own top k; the coordinator merges them
+
+    Usage:
+        with ShardedRegistry(store) as sharded:
+            results, radius = sharded.query(lat, lon, k=5)
+            sharded.rebuild_shard("tc3v", new_store)   # other shards keep serving
+    """
+
+    def __init__(self, store, precision: int = SHARD_PRECISION):
+        self.precision = precision
+        keys = shard_keys(store['lat'], store['lon'], precision)
+        self.shards = {}
+        for prefix in sorted(set(keys.tolist())):
+            self.shards[prefix] = _Shard(prefix, store.subset(np.flatnonzero(keys == prefix)))
+
+    def __len__(self):
+        return sum(shard.size for shard in self.shards.values())
+
+    def _scatter(self, shards, message) -> list:
+        for shard in shards:
+            shard.conn.send(message)
+        return [shard.conn.recv() for shard in shards]
+
+    def query(self, lat: float, lon: float, k: int = TOP_K, weights=WEIGHTS,
+              radius_km: float = DEFAULT_RADIUS_KM, max_radius_km: float = MAX_RADIUS_KM):
+        """
+        Best k garages around (lat, lon)
+
+        Returns:
+            ([{'garage', 'score', 'distance_km'}, ...] best first, radius_used_km)
+        """
+        radius = radius_km
+        while True:
+            shards = [s for s in self.shards.values() if _overlaps(s.bounds, lat, lon, radius)]
+            replies = self._scatter(shards, ("candidates", lat, lon, radius))
+            found = sum(count for count, _ in replies)
+            if found >= k or radius >= max_radius_km:
+                break
+            radius = min(radius * RADIUS_GROWTH, max_radius_km)
+
+        shards = [s for s, (count, _) in zip(shards, replies) if count]
+        if not shards:
+            return [], radius
+        maxima = np.max([m for _, m in replies if m is not None], axis=0)
+
+        partial = self._scatter(shards, ("top_k", lat, lon, radius, k, np.asarray(weights), maxima))
+        # Ties on score go to the nearer garage, as in the single-process
+        # ranking (its candidates are in distance order)
+        merged = sorted((item for items in partial for item in items), key=lambda item: item[:2])[:k]
+        return [{'garage': name, 'score': score, 'distance_km': distance}
+                for score, distance, name in merged], radius
+
+    def rebuild_shard(self, prefix: str, store):
+        """
+        Replace one region's garages; only that worker reloads
+
+        Garages moving to another region need both shards rebuilt.
+        """
+        keys = shard_keys(store['lat'], store['lon'], self.precision)
+        if len(store) and (keys != prefix).any():
+            raise ValueError(f"Store has garages outside shard {prefix!r}")
+        shard = self.shards[prefix]
+        shard.conn.send(("rebuild", store))
+        shard.size = shard.conn.recv()
+
+    def close(self):
+        for shard in self.shards.values():
+            try:
+                shard.conn.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+            shard.process.join(timeout=5)
+        self.shards = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import time
+    from benchmark import synthetic_store
+    from geo_utils import DRIVER_LOCATION
+
+    print("="*70)
+    print("🧪 TESTING SHARDED REGISTRY")
+    print("="*70)
+
+    store = synthetic_store(200_000)
+    registry = GarageRegistry.from_store(store)
+
+    def single_process(lat, lon, k):
+        rows, distances, radius = registry.discover(lat, lon, k=k)
+        scores = score_matrix(driver_features(store, rows, distances))
+        return [(store.names[int(rows[i])], round(float(scores[i]), 10)) for i in top_k_indices(scores, k)], radius
+
+    with ShardedRegistry(store) as sharded:
+        print(f"\n  {len(sharded):,} garages in {len(sharded.shards)} shards: "
+              + ", ".join(f"{p}({s.size:,})" for p, s in sharded.shards.items()))
+
+        # Drivers right next to shard borders (and a few random ones)
+        rng = np.random.default_rng(1)
+        lat_min, lat_max, lon_min, lon_max = geohash_bounds(geohash_encode(*DRIVER_LOCATION, SHARD_PRECISION))
+        drivers = [(lat_max + d, DRIVER_LOCATION[1]) for d in (-1e-4, 1e-4, 0.01)]
+        drivers += [(DRIVER_LOCATION[0], lon_min + d) for d in (-1e-4, 1e-4, -0.02)]
+        drivers += [(lat_max, lon_min), *(DRIVER_LOCATION + rng.uniform(-0.25, 0.25, (20, 2)))]
+
+        start = time.perf_counter()
+        for lat, lon in drivers:
+            for k in (1, 5, 20):
+                results, radius = sharded.query(lat, lon, k=k)
+                expected = single_process(lat, lon, k)
+                assert [(r['garage'], round(r['score'], 10)) for r in results] == expected[0]
+                assert radius == expected[1]
+        elapsed = (time.perf_counter() - start) / (len(drivers) * 3) * 1000
+        print(f"  ✅ {len(drivers) * 3} queries (incl. shard borders) match the single-process ranking "
+              f"({elapsed:.1f} ms each)")
+
+        prefix = next(iter(sharded.shards))
+        rows = np.flatnonzero(shard_keys(store['lat'], store['lon']) == prefix)
+        sharded.rebuild_shard(prefix, store.subset(rows[: len(rows) // 2]))
+        print(f"  🔄 Rebuilt shard {prefix}: {sharded.shards[prefix].size:,} garages")
@@ -0,0 +1,131 @@
+# skyline.py - Pareto (k-skyband) pre-filter: drop garages that can never reach the top k
+
+import numpy as np
+
+from scoring_engine import column_maxima, normalize_matrix, score_matrix
+from top_k import top_k_indices, TOP_K
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+SKYBAND_BLOCK = 256      # Candidates compared together in one vectorized step
+
+# ============================================
+# K-SKYBAND
+# ============================================
+
+def skyband(normalized, k: int = TOP_K) -> np.ndarray:
+    """
+    Rows of a normalised matrix (lower = better) beaten by fewer than k others
+
+    Row q beats row p when q is no worse in every criterion and comes
+    first in input order (the ranking tie-break), or is strictly better
+    in every criterion. Then q ranks above p for ANY non-negative
+    weights (not all zero), so a row beaten k times can never be in the
+    top k and the top k of the survivors equals the top k of all rows.
+
+    Sort-filter-skyline: rows are visited by (sum, position), so every
+    row's beaters are visited before it; blocks of rows are compared
+    against the survivors so far and against each other in one step.
+
+    Returns:
+        surviving row indices in input order
+    """
+    normalized = np.asarray(normalized, dtype=np.float64)
+    n = len(normalized)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    order = np.lexsort((np.arange(n), normalized.sum(axis=1)))
+    band = np.empty(0, dtype=np.int64)
+
+    for start in range(0, n, SKYBAND_BLOCK):
+        block = order[start:start + SKYBAND_BLOCK]
+        earlier = np.concatenate([band, block])
+        rows, others = normalized[block], normalized[earlier]
+
+        no_worse = np.ones((len(block), len(earlier)), dtype=bool)
+        strictly = np.ones((len(block), len(earlier)), dtype=bool)
+        for col in range(normalized.shape[1]):
+            no_worse &= others[:, col] <= rows[:, col, None]
+            strictly &= others[:, col] < rows[:, col, None]
+        first = earlier[None, :] < block[:, None]
+        beaten = (no_worse & first) | strictly
+
+        # Only earlier rows of the block can beat (later ones sort after)
+        beaten[:, len(band):] &= np.tri(len(block), k=-1, dtype=bool)
+        band = np.concatenate([band, block[beaten.sum(axis=1) < k]])
+
+    return np.sort(band)
+
+# ============================================
+# PRE-FILTERED TOP-K
+# ============================================
+
+def prefilter(features, k: int = TOP_K, maxima=None):
+    """
+    Skyband pre-filter of a candidate feature matrix
+
+    Maxima are taken from ALL candidates before pruning, and must be
+    passed on to the scorer, so the survivors' scores are the same
+    numbers the full ranking would have produced.
+
+    Returns:
+        (survivors, maxima, pruned) - survivor row indices, the maxima
+        to score with, and how many rows were dropped
+    """
+    features = np.asarray(features, dtype=np.float64)
+    if maxima is None:
+        maxima = column_maxima(features)
+    survivors = skyband(normalize_matrix(features, maxima), k)
+    return survivors, maxima, len(features) - len(survivors)
+
+def skyline_top_k(features, weights=None, k: int = TOP_K):
+    """
+    top_k_indices(score_matrix(features, weights), k), scoring only the skyband
+
+    Returns:
+        (indices, scores, pruned) - best k row indices (best first),
+        their scores and the number of rows never scored
+    """
+    survivors, maxima, pruned = prefilter(features, k)
+    features = np.asarray(features, dtype=np.float64)
+    scores = score_matrix(features[survivors], weights, maxima)
+    best = top_k_indices(scores, k)
+    return survivors[best], scores[best], pruned
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import time
+    from benchmark import synthetic_store
+    from garage_registry import GarageRegistry
+    from geo_utils import DRIVER_LOCATION
+
+    print("="*70)
+    print("🧪 TESTING SKYLINE PRE-FILTER")
+    print("="*70)
+
+    store = synthetic_store(1_000_000)
+    registry = GarageRegistry.from_store(store)
+    indices, distances, _ = registry.discover(*DRIVER_LOCATION, k=5)
+    features = store.features(indices)
+    features[:, 0] = distances
+    features[:, 2] = distances * 3
+
+    start = time.perf_counter()
+    survivors, maxima, pruned = prefilter(features, TOP_K)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n  {len(features):,} candidates -> {len(survivors)} in the {TOP_K}-skyband "
+          f"({pruned:,} pruned) in {elapsed:.1f} ms")
+
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        weights = rng.random(5) * (rng.random(5) < 0.8)
+        full = top_k_indices(score_matrix(features, weights), TOP_K)
+        best, _, _ = skyline_top_k(features, weights, TOP_K)
+        assert np.array_equal(full, best)
+    print("  ✅ Same top-5 as the full ranking for 200 random weight vectors")
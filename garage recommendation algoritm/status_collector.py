@@ -0,0 +1,252 @@
+# status_collector.py - Concurrent polling of live garage status endpoints
+
+import asyncio
+import json
+import math
+import time
+from urllib.parse import urlsplit
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+CALL_TIMEOUT_S = 0.5          # Per garage endpoint
+TOTAL_DEADLINE_S = 1.0        # Whole fan-out
+MAX_CONCURRENCY = 256         # Open connections at once
+
+# Fields a garage reports (as in garages.txt)
+STATUS_FIELDS = ("busy", "waiting", "mechanics")
+
+# ============================================
+# HTTP
+# ============================================
+
+async def fetch_json(url: str) -> dict:
+    """
+    GET url and decode the JSON body (plain HTTP/1.1, stdlib only)
+
+    Raises:
+        ValueError: non-200 response or bad body
+        OSError: connection problems
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+
+        status_line = await reader.readline()
+        fields = status_line.split(maxsplit=2)
+        if len(fields) < 2 or fields[1] != b"200":
+            raise ValueError(f"HTTP {status_line.decode(errors='replace').strip()!r}")
+
+        length = None
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            if key.strip().lower() == "content-length":
+                length = int(value)
+
+        body = await (reader.readexactly(length) if length is not None else reader.read())
+        return json.loads(body)
+    finally:
+        writer.close()
+
+BUSY_VALUES = {True: True, False: False, "true": True, "false": False}
+
+def parse_status(payload: dict) -> dict:
+    """
+    Validate a status payload into {'busy', 'waiting', 'mechanics'}
+
+    busy must be a JSON bool or "true"/"false", waiting a finite number
+    >= 0 and mechanics a whole number >= 0; anything else is a failed
+    call (the garage falls back to its cached status).
+
+    Raises:
+        ValueError: missing or invalid fields
+    """
+    try:
+        busy, waiting, mechanics = payload['busy'], payload['waiting'], payload['mechanics']
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"bad status payload: missing {exc}") from None
+
+    if isinstance(busy, str):
+        busy = busy.strip().lower()
+    if not isinstance(busy, (bool, str)) or busy not in BUSY_VALUES:
+        raise ValueError(f"bad status payload: busy {payload['busy']!r}")
+    if (isinstance(waiting, bool) or not isinstance(waiting, (int, float))
+            or not math.isfinite(waiting) or waiting < 0):
+        raise ValueError(f"bad status payload: waiting {waiting!r}")
+    if (isinstance(mechanics, bool) or not isinstance(mechanics, (int, float))
+            or not math.isfinite(mechanics) or mechanics < 0 or mechanics != int(mechanics)):
+        raise ValueError(f"bad status payload: mechanics {mechanics!r}")
+    return {'busy': BUSY_VALUES[busy], 'waiting': float(waiting), 'mechanics': int(mechanics)}
+
+# ============================================
+# STATUS COLLECTOR
+# ============================================
+
+class StatusReport:
+    """
+    Result of one fan-out
+
+    statuses:  {garage_id: status dict} - fresh or last-known values
+    stale:     {garage_id: age in seconds} for garages served from cache
+    missing:   garages with neither a fresh nor a cached value
+    errors:    {garage_id: reason} for every failed or late call
+    """
+
+    def __init__(self):
+        self.statuses = {}
+        self.stale = {}
+        self.missing = []
+        self.errors = {}
+        self.elapsed = 0.0
+
+    def summary(self) -> str:
+        fresh = len(self.statuses) - len(self.stale)
+        return (f"{fresh} fresh, {len(self.stale)} stale, {len(self.missing)} missing "
+                f"in {self.elapsed * 1000:.0f} ms")
+
+class StatusCollector:
+    """
+    Fans out to every candidate garage's status endpoint at once
+
+    Each call has its own timeout and the whole fan-out a deadline;
+    calls still running at the deadline are cancelled and those garages
+    fall back to their last-known cached status, reported as stale.
+    """
+
+    def __init__(self, call_timeout: float = CALL_TIMEOUT_S, deadline: float = TOTAL_DEADLINE_S,
+                 max_concurrency: int = MAX_CONCURRENCY, fetch=fetch_json):
+        self.call_timeout = call_timeout
+        self.deadline = deadline
+        self.max_concurrency = max_concurrency
+        self.fetch = fetch
+        self._cache = {}            # garage_id -> (status, fetched_at)
+
+    def last_known(self, garage_id):
+        """(status, fetched_at) or None"""
+        return self._cache.get(garage_id)
+
+    async def _poll(self, garage_id, url, semaphore):
+        async with semaphore:
+            payload = await asyncio.wait_for(self.fetch(url), self.call_timeout)
+        return garage_id, parse_status(payload)
+
+    async def collect(self, endpoints: dict) -> StatusReport:
+        """
+        Poll {garage_id: url} concurrently
+
+        Returns:
+            StatusReport (never raises for individual garage failures)
+        """
+        report = StatusReport()
+        start = time.monotonic()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        tasks = {asyncio.ensure_future(self._poll(garage_id, url, semaphore)): garage_id
+                 for garage_id, url in endpoints.items()}
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline) if tasks else (set(), set())
+
+        for task in pending:
+            task.cancel()
+            report.errors[tasks[task]] = "deadline exceeded"
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        now = time.monotonic()
+        for task in done:
+            garage_id = tasks[task]
+            exc = task.exception()
+            if exc is None:
+                _, status = task.result()
+                self._cache[garage_id] = (status, now)
+                report.statuses[garage_id] = status
+            elif isinstance(exc, asyncio.TimeoutError):
+                report.errors[garage_id] = "timeout"
+            else:
+                report.errors[garage_id] = f"{type(exc).__name__}: {exc}"
+
+        for garage_id in endpoints:
+            if garage_id in report.statuses:
+                continue
+            cached = self._cache.get(garage_id)
+            if cached is None:
+                report.missing.append(garage_id)
+            else:
+                report.statuses[garage_id] = cached[0]
+                report.stale[garage_id] = now - cached[1]
+
+        report.elapsed = now - start
+        return report
+
+    def collect_sync(self, endpoints: dict) -> StatusReport:
+        """collect() for callers outside an event loop (e.g. the CLI)"""
+        return asyncio.run(self.collect(endpoints))
+
+def apply_statuses(store, statuses: dict):
+    """Write {garage name: status} into a GarageStore's busy/waiting/mechanics columns"""
+    rows = {name: i for i, name in enumerate(store.names)}
+    for name, status in statuses.items():
+        row = rows.get(name)
+        if row is not None:
+            for key in STATUS_FIELDS:
+                store[key][row] = status[key]
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    from status_stub_server import StubStatusServer
+
+    print("="*70)
+    print("🧪 TESTING STATUS COLLECTOR")
+    print("="*70)
+
+    async def demo():
+        n = 500
+        async with StubStatusServer(n, mean_latency=0.05, slow_fraction=0.02, seed=0) as server:
+            endpoints = {f"Garage {i:04d}": server.url(i) for i in range(n)}
+            collector = StatusCollector(call_timeout=0.3, deadline=0.6)
+
+            first = await collector.collect(endpoints)
+            print(f"\n  Round 1: {first.summary()}")
+
+            server.slow_fraction = 0.2
+            second = await collector.collect(endpoints)
+            print(f"  Round 2: {second.summary()}")
+            if second.stale:
+                oldest = max(second.stale.values())
+                print(f"  Stale values reused for {len(second.stale)} garages (oldest {oldest:.2f}s)")
+
+            # A garage reporting garbage keeps its last good status
+            async def garbage(url):
+                return {"busy": "false", "waiting": float("nan"), "mechanics": 3}
+            known = next(g for g in endpoints if collector.last_known(g) is not None)
+            collector.fetch = garbage
+            third = await collector.collect({known: endpoints[known]})
+            assert known in third.stale and third.statuses[known] == collector.last_known(known)[0]
+            print(f"  Invalid payload: {third.errors[known]} -> stale value kept")
+
+    assert parse_status({"busy": "false", "waiting": 15, "mechanics": 2})["busy"] is False
+    for bad in ({"busy": "no", "waiting": 0, "mechanics": 1}, {"busy": 1, "waiting": 0, "mechanics": 1},
+                {"busy": True, "waiting": float("inf"), "mechanics": 1},
+                {"busy": True, "waiting": -5, "mechanics": 1}, {"busy": True, "waiting": "15", "mechanics": 1},
+                {"busy": True, "waiting": 0, "mechanics": 2.5}, {"busy": True, "waiting": 0},
+                {"busy": [True], "waiting": 0, "mechanics": 1}, None):
+        try:
+            parse_status(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad}")
+
+    asyncio.run(demo())
@@ -0,0 +1,136 @@
+# status_stub_server.py - Local fake garage status endpoints for offline load tests
+
+import asyncio
+import json
+import random
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+STUB_HOST = "127.0.0.1"
+STUB_PORT = 0                 # 0 = pick a free port
+
+# ============================================
+# STUB SERVER
+# ============================================
+
+class StubStatusServer:
+    """
+    One HTTP server standing in for many garages: GET /garages/<i>/status
+
+    Every response is delayed by a random latency; slow_fraction of the
+    requests hang for slow_latency seconds to exercise timeouts, and
+    error_fraction answer HTTP 500. Statuses follow garages.txt ranges.
+
+    Usage:
+        async with StubStatusServer(1000) as server:
+            url = server.url(17)
+    """
+
+    def __init__(self, n_garages: int, mean_latency: float = 0.05, slow_fraction: float = 0.0,
+                 slow_latency: float = 5.0, error_fraction: float = 0.0,
+                 host: str = STUB_HOST, port: int = STUB_PORT, seed=None):
+        self.n_garages = n_garages
+        self.mean_latency = mean_latency
+        self.slow_fraction = slow_fraction
+        self.slow_latency = slow_latency
+        self.error_fraction = error_fraction
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._server = None
+
+    def url(self, garage: int) -> str:
+        return f"http://{self.host}:{self.port}/garages/{garage}/status"
+
+    def _status(self, garage: int) -> dict:
+        busy = self._random.random() < 0.5
+        return {
+            'garage': garage,
+            'busy': busy,
+            'waiting': self._random.choice([0, 15, 30]) if busy else 0,
+            'mechanics': self._random.randint(1, 5),
+        }
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            self.requests += 1
+
+            path = request_line.split()[1].decode() if request_line.count(b" ") >= 2 else ""
+            parts = path.strip("/").split("/")
+            ok_path = len(parts) == 3 and parts[0] == "garages" and parts[2] == "status" \
+                and parts[1].isdigit() and int(parts[1]) < self.n_garages
+
+            roll = self._random.random()
+            if roll < self.slow_fraction:
+                await asyncio.sleep(self.slow_latency)
+            else:
+                await asyncio.sleep(self._random.expovariate(1 / self.mean_latency)
+                                    if self.mean_latency > 0 else 0)
+
+            if not ok_path:
+                code, body = "404 Not Found", b'{"error": "unknown garage"}'
+            elif roll > 1 - self.error_fraction:
+                code, body = "500 Internal Server Error", b'{"error": "unavailable"}'
+            else:
+                code, body = "200 OK", json.dumps(self._status(int(parts[1]))).encode()
+
+            writer.write(f"HTTP/1.1 {code}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve fake garage status endpoints")
+    parser.add_argument("--garages", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.05, help="mean latency in seconds")
+    parser.add_argument("--slow", type=float, default=0.01, help="fraction of hanging requests")
+    parser.add_argument("--errors", type=float, default=0.01, help="fraction of HTTP 500s")
+    args = parser.parse_args()
+
+    async def serve():
+        server = StubStatusServer(args.garages, args.latency, args.slow,
+                                  error_fraction=args.errors, port=args.port)
+        await server.start()
+        print(f"🔧 Serving {args.garages} garages at {server.url(0).replace('/0/', '/<i>/')}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,93 @@
+# top_k.py - Top-k garage selection and merging of partial rankings
+
+import heapq
+from itertools import islice
+
+import numpy as np
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+TOP_K = 5        # Garages shown by the product
+
+# ============================================
+# SCORE ARRAYS (NumPy)
+# ============================================
+
+def top_k_indices(scores, k: int = TOP_K) -> np.ndarray:
+    """
+    Indices of the k lowest scores, best first
+
+    Uses argpartition (O(n)) and only sorts the selected k. Ties are
+    broken by position, so the result equals the first k of a full
+    stable sort.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(scores, kind="stable")
+
+    threshold = scores[np.argpartition(scores, k - 1)[k - 1]]
+    candidates = np.flatnonzero(scores <= threshold)
+    order = np.lexsort((candidates, scores[candidates]))
+    return candidates[order[:k]]
+
+# ============================================
+# RESULT DICTS (streaming, heap based)
+# ============================================
+
+def top_k_results(results, k: int = TOP_K) -> list:
+    """
+    The k best results ({'garage': ..., 'score': ...}), best first
+
+    Accepts any iterable (e.g. a generator over a whole district) and
+    keeps at most k items in memory: O(n log k).
+    """
+    best = heapq.nsmallest(k, enumerate(results), key=lambda item: (item[1]['score'], item[0]))
+    return [result for _, result in best]
+
+def merge_top_k(partial_lists, k: int = TOP_K) -> list:
+    """
+    Merge top-k lists from different shards or regions into one top-k
+
+    Each partial list must already be sorted best first, and all scores
+    must come from the same normalisation (same maxima), otherwise they
+    are not comparable.
+    """
+    merged = heapq.merge(*partial_lists, key=lambda result: result['score'])
+    return list(islice(merged, k))
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import time
+
+    print("="*70)
+    print("🧪 TESTING TOP-K SELECTION")
+    print("="*70)
+
+    rng = np.random.default_rng(0)
+    scores = rng.random(1_000_000)
+
+    start = time.perf_counter()
+    best = top_k_indices(scores, TOP_K)
+    partial_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    full = np.argsort(scores, kind="stable")[:TOP_K]
+    full_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n  Same result as full sort: {np.array_equal(best, full)}")
+    print(f"  ⏱️  top-{TOP_K}: {partial_ms:.1f} ms   full sort: {full_ms:.1f} ms")
+
+    # Two shards merged
+    results = [{"garage": {"name": f"G{i}"}, "score": float(s)} for i, s in enumerate(scores[:1000])]
+    shard_a = top_k_results(results[:500])
+    shard_b = top_k_results(results[500:])
+    merged = merge_top_k([shard_a, shard_b])
+    print(f"  Shard merge equals single top-k: {merged == top_k_results(results)}")
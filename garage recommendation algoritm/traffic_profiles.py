@@ -0,0 +1,237 @@
+# traffic_profiles.py - Time-of-day traffic slots and precomputed arrival tables (cell -> garages)
+
+import multiprocessing
+from datetime import datetime
+
+import numpy as np
+
+from garage_registry import GarageRegistry
+from geo_utils import geohash_bounds, geohash_decode, geohash_encode
+from scoring_engine import CITY_SPEED_KPH
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+# Same labels as Day_of_Week / Time_of_Day in the repair dataset
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+TIMES_OF_DAY = ("Morning", "Afternoon", "Evening")
+MORNING_ENDS_HOUR = 12
+AFTERNOON_ENDS_HOUR = 17      # Evening (and night) from 17:00
+
+# Travel time relative to the CITY_SPEED_KPH estimate, per time of day
+WEEKDAY_MULTIPLIERS = (1.35, 1.00, 1.45)     # Office rush into / out of Colombo
+SATURDAY_MULTIPLIERS = (1.10, 1.05, 1.20)
+SUNDAY_MULTIPLIERS = (0.85, 0.85, 0.95)
+
+TABLE_CELL_PRECISION = 6      # Origin cells (~1.2 km x 0.6 km)
+TABLE_RADIUS_KM = 5.0         # Garages kept per origin cell
+BUILD_CHUNK_CELLS = 64        # Cells per worker task
+
+# ============================================
+# SLOTS
+# ============================================
+
+N_SLOTS = len(DAYS) * len(TIMES_OF_DAY)
+
+def slot_index(day: str, time_of_day: str) -> int:
+    """Slot of a (Day_of_Week, Time_of_Day) pair"""
+    return DAYS.index(day) * len(TIMES_OF_DAY) + TIMES_OF_DAY.index(time_of_day)
+
+def slot_of(when: datetime = None) -> int:
+    """Slot of a moment (now when None)"""
+    when = when or datetime.now()
+    if when.hour < MORNING_ENDS_HOUR:
+        time_of_day = 0
+    elif when.hour < AFTERNOON_ENDS_HOUR:
+        time_of_day = 1
+    else:
+        time_of_day = 2
+    return when.weekday() * len(TIMES_OF_DAY) + time_of_day
+
+def slot_name(slot: int) -> str:
+    day, time_of_day = divmod(slot, len(TIMES_OF_DAY))
+    return f"{DAYS[day]} {TIMES_OF_DAY[time_of_day]}"
+
+def default_multipliers() -> np.ndarray:
+    """Travel-time multiplier of every slot (N_SLOTS,)"""
+    days = [WEEKDAY_MULTIPLIERS] * 5 + [SATURDAY_MULTIPLIERS, SUNDAY_MULTIPLIERS]
+    return np.array(days, dtype=np.float64).reshape(-1)
+
+# ============================================
+# OFFLINE BUILD (parallel)
+# ============================================
+
+def region_cells(lat_min: float, lat_max: float, lon_min: float, lon_max: float,
+                 precision: int = TABLE_CELL_PRECISION) -> list:
+    """Every geohash cell covering a lat/lon box"""
+    cell_lat_min, cell_lat_max, cell_lon_min, cell_lon_max = geohash_bounds(geohash_encode(lat_min, lon_min, precision))
+    dlat, dlon = cell_lat_max - cell_lat_min, cell_lon_max - cell_lon_min
+    lats = np.arange(cell_lat_min + dlat / 2, lat_max + dlat / 2, dlat)
+    lons = np.arange(cell_lon_min + dlon / 2, lon_max + dlon / 2, dlon)
+    return [geohash_encode(lat, lon, precision) for lat in lats for lon in lons]
+
+_worker = {}
+
+def _init_worker(lats, lons, radius_km, eta_engine):
+    _worker["registry"] = GarageRegistry(range(len(lats)), lats, lons)
+    _worker["lats"], _worker["lons"] = lats, lons
+    _worker["radius_km"] = radius_km
+    _worker["eta_engine"] = eta_engine
+
+def _build_cells(cells) -> list:
+    """[(rows, base minutes), ...] for a chunk of origin cells"""
+    registry, engine = _worker["registry"], _worker["eta_engine"]
+    out = []
+    for cell in cells:
+        lat, lon = geohash_decode(cell)
+        rows, distances = registry.within_radius(lat, lon, _worker["radius_km"])
+        order = np.argsort(rows, kind="stable")
+        rows, distances = rows[order], distances[order]
+        if engine is not None:
+            minutes = engine.eta_minutes(lat, lon, _worker["lats"][rows], _worker["lons"][rows])
+        else:
+            minutes = distances / CITY_SPEED_KPH * 60
+        out.append((rows.astype(np.int64), minutes.astype(np.float32)))
+    return out
+
+# ============================================
+# ARRIVAL TABLE
+# ============================================
+
+class ArrivalTable:
+    """
+    Arrival minutes from every origin cell to its nearby garages, per slot
+
+    Base minutes (the CITY_SPEED_KPH estimate, or road ETAs from an
+    EtaEngine) are stored once per (cell, garage) in CSR form; a slot
+    only scales them by its multiplier. A request does one dict lookup
+    and one multiply - no route is ever computed on the request path.
+
+    Usage:
+        table = ArrivalTable.build(store, cells, processes=4)
+        table.save("arrival_table.npz")
+        minutes = ArrivalTable.load("arrival_table.npz").arrival(lat, lon, rows, distances)
+    """
+
+    def __init__(self, cells, offsets, rows, minutes, multipliers=None,
+                 precision: int = TABLE_CELL_PRECISION):
+        self.cells = list(cells)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.minutes = np.asarray(minutes, dtype=np.float32)
+        self.multipliers = default_multipliers() if multipliers is None else np.asarray(multipliers, dtype=np.float64)
+        self.precision = precision
+        self._cell_index = {cell: i for i, cell in enumerate(self.cells)}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def __len__(self):
+        return len(self.cells)
+
+    @classmethod
+    def build(cls, store, cells, radius_km: float = TABLE_RADIUS_KM, eta_engine=None,
+              processes: int = None, multipliers=None, precision: int = TABLE_CELL_PRECISION):
+        """Compute every cell's garages and base minutes, cells split across processes"""
+        lats = np.asarray(store['lat'], dtype=np.float64)
+        lons = np.asarray(store['lon'], dtype=np.float64)
+        chunks = [cells[i:i + BUILD_CHUNK_CELLS] for i in range(0, len(cells), BUILD_CHUNK_CELLS)]
+        with multiprocessing.Pool(processes, _init_worker, (lats, lons, radius_km, eta_engine)) as pool:
+            built = [entry for chunk in pool.map(_build_cells, chunks) for entry in chunk]
+
+        lengths = [len(rows) for rows, _ in built]
+        offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        rows = np.concatenate([r for r, _ in built]) if built else np.empty(0, dtype=np.int64)
+        minutes = np.concatenate([m for _, m in built]) if built else np.empty(0, dtype=np.float32)
+        return cls(cells, offsets, rows, minutes, multipliers, precision)
+
+    def save(self, path: str):
+        np.savez(path, cells=np.array(self.cells), offsets=self.offsets, rows=self.rows,
+                 minutes=self.minutes, multipliers=self.multipliers, precision=self.precision)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            return cls(data["cells"].tolist(), data["offsets"], data["rows"], data["minutes"],
+                       data["multipliers"], int(data["precision"]))
+
+    # ----------------------------------------
+    # Request path (O(1) per cell)
+    # ----------------------------------------
+
+    def cell_minutes(self, lat: float, lon: float, slot: int = None):
+        """
+        (garage rows, minutes in this slot) for the driver's cell, or None
+        """
+        i = self._cell_index.get(geohash_encode(lat, lon, self.precision))
+        if i is None:
+            return None
+        slot = slot_of() if slot is None else slot
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.rows[start:end], self.minutes[start:end] * self.multipliers[slot]
+
+    def arrival(self, lat: float, lon: float, rows, distances, slot: int = None) -> np.ndarray:
+        """
+        Arrival minutes of discovered candidates in a slot
+
+        Garages outside the driver's table cell fall back to the
+        CITY_SPEED_KPH estimate from distances, scaled by the slot.
+        """
+        slot = slot_of() if slot is None else slot
+        rows = np.asarray(rows, dtype=np.int64)
+        minutes = np.asarray(distances, dtype=np.float64) / CITY_SPEED_KPH * 60 * self.multipliers[slot]
+
+        found = self.cell_minutes(lat, lon, slot)
+        if found is None:
+            self.stats["misses"] += len(rows)
+            return minutes
+        cell_rows, cell_minutes = found
+        positions = np.minimum(np.searchsorted(cell_rows, rows), max(len(cell_rows) - 1, 0))
+        known = (cell_rows[positions] == rows) if len(cell_rows) else np.zeros(len(rows), dtype=bool)
+        minutes[known] = cell_minutes[positions[known]]
+        self.stats["hits"] += int(known.sum())
+        self.stats["misses"] += int((~known).sum())
+        return minutes
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+    from benchmark import synthetic_store
+    from geo_utils import DRIVER_LOCATION
+
+    print("="*70)
+    print("🧪 TESTING TRAFFIC PROFILES")
+    print("="*70)
+
+    store = synthetic_store(100_000)
+    lat0, lon0 = DRIVER_LOCATION
+    cells = region_cells(lat0 - 0.05, lat0 + 0.05, lon0 - 0.05, lon0 + 0.05)
+
+    start = time.perf_counter()
+    table = ArrivalTable.build(store, cells)
+    build_s = time.perf_counter() - start
+    print(f"\n  Built {len(table)} cells / {len(table.rows):,} (cell, garage) pairs "
+          f"on {os.cpu_count()} core(s) in {build_s:.2f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "arrival_table.npz")
+        table.save(path)
+        table = ArrivalTable.load(path)
+
+    registry = GarageRegistry.from_store(store)
+    rows, distances, _ = registry.discover(lat0, lon0, k=5)
+    for slot in (slot_index("Monday", "Morning"), slot_index("Wednesday", "Afternoon"),
+                 slot_index("Friday", "Evening"), slot_index("Sunday", "Morning")):
+        minutes = table.arrival(lat0, lon0, rows, distances, slot)
+        print(f"  {slot_name(slot):<20} median arrival {np.median(minutes):5.1f} min")
+
+    n = 10_000
+    start = time.perf_counter()
+    for _ in range(n):
+        table.arrival(lat0, lon0, rows, distances, 0)
+    print(f"  ⏱️  {(time.perf_counter() - start) / n * 1e6:.0f} µs per lookup ({len(rows)} candidates)")
+    print(f"  Now: {slot_name(slot_of())}")
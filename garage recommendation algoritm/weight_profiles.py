@@ -0,0 +1,164 @@
+# weight_profiles.py - Many weight profiles scored in one matrix multiply
+
+import numpy as np
+
+from scoring_engine import CRITERIA, WEIGHTS, column_maxima, normalize_matrix
+from skyline import prefilter
+from top_k import TOP_K
+
+# ============================================
+# SEVERITY PROFILES
+# ============================================
+
+# Weights per fault severity (CRITERIA order: distance, waiting, arrival,
+# rating, mechanics). A Major fault usually means a car that cannot be
+# driven, so the mechanic's arrival dominates; for a Minor fault the
+# driver can go to the garage and quality (rating) matters more.
+SEVERITY_PROFILES = {
+    "Minor":    np.array([0.20, 0.25, 0.10, 0.30, 0.15]),
+    "Moderate": WEIGHTS,
+    "Major":    np.array([0.15, 0.20, 0.45, 0.10, 0.10]),
+}
+
+def profile_matrix(profiles) -> tuple:
+    """
+    (names, P x C weight matrix) from {name: weights} or a list of weight vectors
+    """
+    if isinstance(profiles, dict):
+        names = list(profiles)
+        weights = [profiles[name] for name in names]
+    else:
+        weights = list(profiles)
+        names = list(range(len(weights)))
+    matrix = np.asarray(weights, dtype=np.float64).reshape(len(weights), -1)
+    if (matrix < 0).any():
+        raise ValueError("Weights must be non-negative")
+    return names, matrix
+
+# ============================================
+# SCORING MANY PROFILES
+# ============================================
+
+def score_profiles(features, profiles, maxima=None) -> np.ndarray:
+    """
+    Scores of every garage under every profile: P x N, one matmul
+
+    Args:
+        features: N x C feature matrix
+        profiles: P x C weight matrix
+    """
+    normalized = normalize_matrix(features, maxima)
+    return np.asarray(profiles, dtype=np.float64) @ normalized.T
+
+def rank_profiles(scores) -> np.ndarray:
+    """P x N ranks (1 = best) per profile, ties keep input order"""
+    scores = np.asarray(scores, dtype=np.float64)
+    order = np.argsort(scores, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, scores.shape[1] + 1)[None, :], axis=1)
+    return ranks
+
+def top_k_profiles(features, profiles, k: int = TOP_K, maxima=None) -> np.ndarray:
+    """
+    P x k garage indices, best first, for every profile
+
+    Candidates outside the k-skyband can't be in any profile's top k,
+    so only the skyband is scored (see skyline.py).
+    """
+    features = np.asarray(features, dtype=np.float64)
+    if maxima is None:
+        maxima = column_maxima(features)
+    survivors, maxima, _ = prefilter(features, k, maxima)
+    scores = score_profiles(features[survivors], profiles, maxima)
+    order = np.argsort(scores, axis=1, kind="stable")[:, :k]
+    return survivors[order]
+
+def severity_rankings(features, k: int = TOP_K, maxima=None) -> dict:
+    """{"Minor": [best indices], "Moderate": [...], "Major": [...]}"""
+    names, matrix = profile_matrix(SEVERITY_PROFILES)
+    best = top_k_profiles(features, matrix, k, maxima)
+    return {name: best[i].tolist() for i, name in enumerate(names)}
+
+# ============================================
+# SENSITIVITY SWEEPS
+# ============================================
+
+def sweep_profiles(base=WEIGHTS, criterion: str = "arrival", steps: int = 101) -> tuple:
+    """
+    Vary one criterion's weight from 0 to 1, the others keep their
+    relative proportions and everything sums to 1
+
+    Returns:
+        (values, P x C profile matrix)
+    """
+    base = np.asarray(base, dtype=np.float64)
+    col = CRITERIA.index(criterion)
+    values = np.linspace(0.0, 1.0, steps)
+
+    others = base.copy()
+    others[col] = 0.0
+    others /= others.sum()
+    profiles = (1 - values)[:, None] * others[None, :]
+    profiles[:, col] = values
+    return values, profiles
+
+def random_profiles(n: int, seed: int = 0) -> np.ndarray:
+    """n random weight vectors (uniform over the simplex)"""
+    return np.random.default_rng(seed).dirichlet(np.ones(len(CRITERIA)), n)
+
+def winner_changes(values, best) -> list:
+    """
+    Where the best garage changes along a sweep
+
+    Returns:
+        [(weight value, previous winner, new winner), ...]
+    """
+    winners = np.asarray(best)[:, 0]
+    changes = np.flatnonzero(winners[1:] != winners[:-1]) + 1
+    return [(float(values[i]), int(winners[i - 1]), int(winners[i])) for i in changes]
+
+# ============================================
+# TEST
+# ============================================
+
+if __name__ == "__main__":
+    import os
+    import time
+    from benchmark import synthetic_store
+    from garage_loader import load_garages
+    from garage_registry import GarageRegistry
+    from geo_utils import DRIVER_LOCATION
+    from scoring_engine import garages_to_matrix
+
+    print("="*70)
+    print("🧪 TESTING WEIGHT PROFILES")
+    print("="*70)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    garages = load_garages(os.path.join(here, "garages.txt")).to_garages()
+    demo = garages_to_matrix(garages)
+
+    print("\n🏆 Best garage per severity (garages.txt)")
+    for severity, best in severity_rankings(demo, k=3).items():
+        print(f"  {severity:<9} " + ", ".join(garages[i]['name'] for i in best))
+
+    values, profiles = sweep_profiles(criterion="arrival", steps=101)
+    best = top_k_profiles(demo, profiles, k=1)
+    print("\n📈 Arrival weight sweep 0 -> 1:")
+    for value, old, new in winner_changes(values, best):
+        print(f"  at {value:.2f}: {garages[old]['name']} -> {garages[new]['name']}")
+
+    store = synthetic_store(1_000_000)
+    indices, distances, _ = GarageRegistry.from_store(store).discover(*DRIVER_LOCATION, k=5)
+    features = store.features(indices)
+    features[:, 0] = distances
+    features[:, 2] = distances * 3
+
+    profiles = random_profiles(10_000)
+    start = time.perf_counter()
+    best = top_k_profiles(features, profiles, k=5)
+    elapsed = time.perf_counter() - start
+    print(f"\n⏱️  {len(profiles):,} profiles x {len(features):,} candidates, top-5 each: {elapsed * 1000:.0f} ms")
+
+    full = np.argsort(score_profiles(features, profiles[:50]), axis=1, kind="stable")[:, :5]
+    assert np.array_equal(full, best[:50])